@@ -0,0 +1,68 @@
+# Acumuladores combinables contra recalcular desde las filas:
+#   - agregar un lote pequeño de filas nuevas (delta) vs. recalcular el cubo
+#   - totales por Semestre/Carrera con resumir() vs. un groupby sobre las filas
+#
+#   python benchmarks/acumuladores.py --filas 100000 --delta 500
+import argparse
+import os
+import sys
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(AQUI))
+
+import pandas as pd
+
+from calificaciones import carga
+from calificaciones.acumuladores import Acumuladores
+from calificaciones.esquema import normalizar_esquema
+from calificaciones.estadisticas import calcular_cubo
+from etapas import libro_sintetico
+
+
+def medir(funcion, repeticiones=3):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Acumuladores combinables vs. recalcular")
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--delta", type=int, default=500, help="Filas nuevas que se agregan")
+    args = parser.parse_args()
+
+    df = carga.cargar_calificaciones(libro_sintetico(args.filas))
+    base, delta = df.iloc[:-args.delta], df.iloc[-args.delta:]
+    acumuladores = Acumuladores.desde_filas(base)
+    acumuladores.cubo()  # el cubo de la base ya calculado, como en la página
+
+    # Recalcular: el cubo de todas las filas otra vez
+    t_recalcular, esperado = medir(lambda: calcular_cubo(normalizar_esquema(pd.concat([base, delta]))))
+
+    # Agregar: sólo el delta (sobre una copia para que cada repetición parta igual)
+    t_agregar, actualizado = medir(lambda: acumuladores.copiar().agregar(delta))
+    # El cubo combina el delta y recalcula sólo los grupos que trae (sobre
+    # otra copia en cada repetición)
+    t_cubo, cubo = medir(lambda: acumuladores.copiar().agregar(delta).cubo())
+    t_cubo -= t_agregar
+    diferencias = [(esperado - cubo).abs().max().max()]
+    print(f"{args.filas} filas, delta {args.delta}: recalcular {t_recalcular * 1000:.0f} ms; "
+          f"agregar {t_agregar * 1000:.1f} ms + cubo {t_cubo * 1000:.0f} ms (diferencia {diferencias[0]:.1e})")
+
+    niveles = ["Semestre", "Carrera"]
+    t_filas, directo = medir(lambda: calcular_cubo(df, niveles=niveles))
+    t_resumir, resumido = medir(lambda: actualizado.resumir(niveles).cubo())
+    diferencias.append((directo - resumido).abs().max().max())
+    print(f"Totales por {' / '.join(niveles)}: desde filas {t_filas * 1000:.0f} ms, "
+          f"resumir {t_resumir * 1000:.0f} ms (diferencia {diferencias[1]:.1e})")
+
+    if max(diferencias) > 1e-9:
+        sys.exit("❌ Los cubos no coinciden")
+
+
+if __name__ == "__main__":
+    main()
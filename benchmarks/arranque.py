@@ -0,0 +1,125 @@
+# Benchmark de arranque en frío: cuánto tardan las importaciones de la página
+# (python -X importtime) y cuánto tarda, en un proceso nuevo, el primer pintado
+# (primer st.markdown) y la primera ejecución completa de prueba2.py.
+#
+#   python benchmarks/arranque.py --repeticiones 3 --salida arranque.json
+#   python benchmarks/arranque.py --max-primer-pintado 1.5   # falla si se pasa
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(AQUI)
+PAGINA = os.path.join(RAIZ, "prueba2.py")
+
+# Lo que prueba2.py importa antes de pintar el encabezado
+IMPORTS_PAGINA = [
+    "pandas",
+    "streamlit",
+    "calificaciones",
+    "calificaciones.edubot",
+    "calificaciones.graficas",
+    "calificaciones.perf",
+    "calificaciones.precarga",
+    "calificaciones.rangos",
+]
+
+# Se ejecuta en un proceso nuevo: envuelve st.markdown para anotar cuándo se
+# pinta el primer elemento y corre la página con AppTest (sin navegador)
+PROGRAMA_PINTADO = """
+import json, sys, time
+inicio = time.perf_counter()
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+marcas = {}
+markdown_original = st.markdown
+
+def markdown_medido(*args, **kwargs):
+    marcas.setdefault("primer_pintado_s", time.perf_counter() - inicio)
+    return markdown_original(*args, **kwargs)
+
+st.markdown = markdown_medido
+at = AppTest.from_file(sys.argv[1], default_timeout=600).run()
+marcas["primera_ejecucion_s"] = time.perf_counter() - inicio
+marcas["excepcion"] = [str(e.value) for e in at.exception]
+print(json.dumps(marcas))
+"""
+
+
+def tiempos_importacion(modulos, top=15):
+    # -X importtime escribe en stderr: "import time: self [us] | cumulative | paquete"
+    codigo = "; ".join(f"import {m}" for m in modulos)
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                             cwd=RAIZ, capture_output=True, text=True, check=True)
+    filas = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        propio, acumulado, nombre = linea.split(":", 1)[1].split("|")
+        filas.append({
+            "modulo": nombre.strip(),
+            "nivel": (len(nombre) - len(nombre.lstrip())) // 2,
+            "propio_ms": int(propio) / 1000,
+            "acumulado_ms": int(acumulado) / 1000,
+        })
+    # Los de nivel 0 son importaciones directas: su acumulado suma el total
+    total = sum(f["acumulado_ms"] for f in filas if f["nivel"] == 0)
+    mas_lentos = sorted(filas, key=lambda f: f["acumulado_ms"], reverse=True)[:top]
+    return {"total_ms": total, "mas_lentos": mas_lentos}
+
+
+def primer_pintado():
+    proceso = subprocess.run([sys.executable, "-c", PROGRAMA_PINTADO, PAGINA],
+                             cwd=RAIZ, capture_output=True, text=True, check=True)
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arranque en frío de la página de calificaciones")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--salida", default="resultados_arranque.json")
+    parser.add_argument("--max-primer-pintado", type=float,
+                        help="segundos; falla si la mediana del primer pintado lo supera")
+    args = parser.parse_args()
+
+    importaciones = tiempos_importacion(IMPORTS_PAGINA, args.top)
+    print(f"Importaciones de la página: {importaciones['total_ms']:.0f} ms")
+    for fila in importaciones["mas_lentos"]:
+        print(f"  {fila['acumulado_ms']:>9.1f} ms  {'  ' * fila['nivel']}{fila['modulo']}")
+
+    corridas = []
+    for i in range(args.repeticiones):
+        marcas = primer_pintado()
+        if marcas["excepcion"]:
+            sys.exit(f"❌ La página falló: {marcas['excepcion']}")
+        corridas.append(marcas)
+        print(f"corrida {i + 1}: primer pintado {marcas['primer_pintado_s']:.2f} s, "
+              f"primera ejecución {marcas['primera_ejecucion_s']:.2f} s")
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "importaciones": importaciones,
+        "corridas": corridas,
+        "primer_pintado_mediana_s": statistics.median(c["primer_pintado_s"] for c in corridas),
+        "primera_ejecucion_mediana_s": statistics.median(c["primera_ejecucion_s"] for c in corridas),
+    }
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, ensure_ascii=False, indent=2)
+    print(f"Resultados en {args.salida}", file=sys.stderr)
+
+    if args.max_primer_pintado and informe["primer_pintado_mediana_s"] > args.max_primer_pintado:
+        sys.exit(f"❌ Primer pintado {informe['primer_pintado_mediana_s']:.2f} s "
+                 f"> {args.max_primer_pintado:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
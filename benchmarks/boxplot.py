@@ -0,0 +1,64 @@
+# Boxplot de grupos cada vez más grandes (un grupo, un semestre, una carrera):
+# seaborn con todas las filas vs. los cinco números y los puntos muestreados
+# de cajas.py. Con el resumen el tiempo y el JSON de Vega-Lite quedan acotados
+#
+#   python benchmarks/boxplot.py --tamanos 40 2000 50000 200000
+import argparse
+import json
+import os
+import sys
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(AQUI))
+
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from calificaciones.cajas import cajas_de_calificaciones
+from calificaciones.graficas import TEMAS, _nueva_figura, colores_parciales, figura_a_png, figura_boxplot
+from calificaciones.vega import spec_boxplot
+
+
+def medir(funcion, repeticiones=3):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+
+def figura_seaborn(grupo_df):
+    # La versión anterior: seaborn recibe todas las filas
+    fig = _nueva_figura(figsize=(7.5, 5.5), facecolor=TEMAS["oscuro"]["fondo"])
+    ax = fig.subplots()
+    sns.boxplot(data=grupo_df, palette=colores_parciales(grupo_df.shape[1]), width=0.4, linewidth=2.2,
+                fliersize=0, ax=ax)
+    sns.stripplot(data=grupo_df, jitter=0.25, dodge=True, size=6, color='white', alpha=0.5, ax=ax)
+    return fig
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Boxplot resumido vs. seaborn con todas las filas")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[40, 2_000, 50_000, 200_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    generador = np.random.default_rng(23)
+    for alumnos in args.tamanos:
+        grupo_df = pd.DataFrame(np.round(np.clip(generador.normal([7.5, 8.0], 1.3, size=(alumnos, 2)), 5, 10), 1),
+                                columns=["P1", "P2"])
+        calificaciones_dict = {parcial: grupo_df[parcial] for parcial in grupo_df}
+        t_seaborn, _ = medir(lambda: figura_a_png(figura_seaborn(grupo_df)), args.repeticiones)
+        t_cajas, cajas = medir(lambda: cajas_de_calificaciones(calificaciones_dict), args.repeticiones)
+        t_figura, _ = medir(lambda: figura_a_png(figura_boxplot(cajas=cajas)), args.repeticiones)
+        json_vega = json.dumps(spec_boxplot(cajas))
+        print(f"{alumnos:>8} alumnos: seaborn {t_seaborn * 1000:7.0f} ms | resumen {t_cajas * 1000:5.1f} ms "
+              f"+ figura {t_figura * 1000:4.0f} ms | puntos {sum(len(c['y']) for c in cajas.values())}, "
+              f"JSON Vega-Lite {len(json_vega) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# Benchmark por etapas: carga del Excel, filtros en cascada, estadísticas,
+# gráficas y PDF, sobre libros sintéticos con el mismo esquema que el real.
+#
+#   python benchmarks/etapas.py --filas 10000 100000 1000000 --salida resultados.json
+#   python benchmarks/etapas.py --filas 10000 --comparar resultados.json   # falla si hay regresión
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(AQUI))
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.interpolate import make_interp_spline
+
+from calificaciones import carga, ingesta
+from calificaciones.acumuladores import Acumuladores
+from calificaciones.cajas import cajas_de_calificaciones
+from calificaciones.estadisticas import PARCIALES, calcular_cubo, calcular_ranking, estadisticas_por_grupo
+from calificaciones.filtros import IndiceFiltros
+from calificaciones.graficas import (RegistroFiguras, figura_a_png, figura_boxplot,
+                                    figura_histograma, figura_pastel)
+from calificaciones.rangos import EJE_TENDENCIA, curvas_tendencia, distribucion_rangos
+from calificaciones.reporte import generar_pdf
+from calificaciones.vega import spec_boxplot, spec_histograma, spec_pastel
+
+CARPETA_DATOS = os.path.join(AQUI, "datos_sinteticos")
+
+CARRERAS = ["Programación", "Diseño Gráfico Digital", "Contabilidad", "Mecatrónica"]
+GRUPOS = list("ABCDEF")
+ASIGNATURAS = ["Inglés", "Matemáticas", "Ciencias Sociales", "Cultura Digital", "Química", "Módulo Profesional"]
+
+
+def libro_sintetico(filas, semilla=603):
+    # Grupos de ~35 alumnos por asignatura; 2% de calificaciones vacías
+    ruta = os.path.join(CARPETA_DATOS, f"calificaciones_{filas}.xlsx")
+    if os.path.exists(ruta):
+        return ruta
+
+    generador = np.random.default_rng(semilla)
+    semestre = generador.choice([2, 4, 6], size=filas)
+    carrera = generador.choice(CARRERAS, size=filas)
+    grupo = generador.choice(GRUPOS, size=filas)
+    asignatura = [f"{a} {s // 2}" for a, s in zip(generador.choice(ASIGNATURAS, size=filas), semestre)]
+    calificaciones = np.round(np.clip(generador.normal(7.8, 1.5, size=(filas, 2)), 5, 10), 1)
+    calificaciones[generador.random(size=calificaciones.shape) < 0.02] = np.nan
+
+    df = pd.DataFrame({
+        "Semestre": semestre,
+        "Clave Carrera": [f"A30215000{CARRERAS.index(c)}-17" for c in carrera],
+        "Carrera": carrera,
+        "Grupo": grupo,
+        "Asignatura": asignatura,
+        "Número de control": generador.integers(22415080000000, 24415089999999, size=filas),
+        "P1": calificaciones[:, 0],
+        "P2": calificaciones[:, 1],
+    })
+    os.makedirs(CARPETA_DATOS, exist_ok=True)
+    print(f"Generando {ruta} ...", file=sys.stderr)
+    df.to_excel(ruta, index=False)
+    return ruta
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return {"min_s": min(tiempos), "mediana_s": statistics.median(tiempos), "repeticiones": repeticiones}
+
+
+def filtros_en_cascada(df, clave):
+    # Lo que hacía la página antes del índice: una máscara por cada selectbox
+    semestre, carrera, grupo, asignatura = clave
+    sorted(df["Semestre"].dropna().unique())
+    sorted(df[df["Semestre"] == semestre]["Carrera"].dropna().unique())
+    sorted(df[(df["Semestre"] == semestre) & (df["Carrera"] == carrera)]["Grupo"].dropna().unique())
+    df_filtrado = df[(df["Semestre"] == semestre) & (df["Carrera"] == carrera) & (df["Grupo"] == grupo)]
+    sorted(df_filtrado["Asignatura"].dropna().unique())
+    return df_filtrado[df_filtrado["Asignatura"] == asignatura]
+
+
+def estadisticas_un_grupo(grupo_df):
+    # El bloque por parcial de la página original (una pasada por medida)
+    for parcial in PARCIALES:
+        calificaciones = grupo_df[parcial].dropna()
+        calificaciones.mean(), calificaciones.median(), calificaciones.var()
+        stats.mode(calificaciones, nan_policy='omit', keepdims=True)
+        calificaciones.quantile(0.25), calificaciones.quantile(0.50), calificaciones.quantile(0.75)
+        calificaciones.max(), calificaciones.min(), calificaciones.count()
+
+
+def medir_tamano(filas, repeticiones):
+    ruta = libro_sintetico(filas)
+    resultados = {}
+
+    # --- Carga ---
+    resultados["carga_read_excel"] = medir(lambda: pd.read_excel(ruta), 1)
+
+    def carga_desde_parquet():
+        ingesta._memoria.clear()
+        carga.cargar_calificaciones(ruta)
+
+    carga_desde_parquet()  # deja escrita la copia en Parquet
+    resultados["carga_parquet"] = medir(carga_desde_parquet, repeticiones)
+    resultados["carga_memoria"] = medir(lambda: carga.cargar_calificaciones(ruta), repeticiones)
+    df = carga.cargar_calificaciones(ruta)
+
+    # --- Filtros ---
+    indice = IndiceFiltros(df)
+    clave = max(indice.combinaciones(), key=lambda c: len(indice.posiciones(*c)))
+    resultados["filtros_cascada"] = medir(lambda: filtros_en_cascada(df, clave), repeticiones)
+    resultados["filtros_indice_construccion"] = medir(lambda: IndiceFiltros(df), 1)
+    resultados["filtros_indice_consulta"] = medir(
+        lambda: [indice.opciones(*clave[:i]) for i in range(4)] and indice.filas(*clave), repeticiones)
+
+    # --- Estadísticas ---
+    grupo_df = indice.filas(*clave)
+    resultados["estadisticas_un_grupo"] = medir(lambda: estadisticas_un_grupo(grupo_df), repeticiones)
+    resultados["estadisticas_cubo_todos"] = medir(lambda: estadisticas_por_grupo(calcular_cubo(df)), 1)
+    estadisticas_dict = estadisticas_por_grupo(calcular_cubo(df))[clave]
+    # Ranking de todos los (grupo, asignatura): cambios entre parciales y % de aprobados
+    acumuladores = Acumuladores.desde_filas(df)
+    resultados["ranking_todos"] = medir(
+        lambda: calcular_ranking(acumuladores.cubo(), acumuladores.aprobados()), repeticiones)
+
+    # --- Gráficas ---
+    calificaciones_dict = {parcial: grupo_df[parcial].dropna() for parcial in PARCIALES}
+    resultados["rangos"] = medir(lambda: distribucion_rangos(calificaciones_dict), repeticiones)
+    rangos = distribucion_rangos(calificaciones_dict)
+    # Curva de tendencia: una spline por parcial vs. base precalculada @ conteos
+    conteos = np.array([r["conteo"] for r in rangos.values()])
+    x_vals = np.arange(conteos.shape[1])
+    resultados["tendencia_spline"] = medir(
+        lambda: [make_interp_spline(x_vals, conteo, k=3)(EJE_TENDENCIA) for conteo in conteos], repeticiones)
+    resultados["tendencia_base"] = medir(lambda: curvas_tendencia(conteos), repeticiones)
+    resultados["grafica_histograma"] = medir(
+        lambda: figura_a_png(figura_histograma(calificaciones_dict, rangos=rangos)), repeticiones)
+    resultados["grafica_pasteles"] = medir(
+        lambda: [figura_a_png(figura_pastel(r["conteo"], p)) for p, r in rangos.items()], repeticiones)
+    resultados["cajas"] = medir(lambda: cajas_de_calificaciones(calificaciones_dict), repeticiones)
+    cajas = cajas_de_calificaciones(calificaciones_dict)
+    resultados["grafica_boxplot"] = medir(lambda: figura_a_png(figura_boxplot(cajas=cajas)), repeticiones)
+
+    # Las mismas gráficas como especificación Vega-Lite (las dibuja el navegador)
+    resultados["vega_histograma"] = medir(lambda: json.dumps(spec_histograma(rangos)), repeticiones)
+    resultados["vega_pasteles"] = medir(
+        lambda: [json.dumps(spec_pastel(r, p)) for p, r in rangos.items()], repeticiones)
+    resultados["vega_boxplot"] = medir(lambda: json.dumps(spec_boxplot(cajas)), repeticiones)
+
+    # --- PDF ---
+    registro = RegistroFiguras()
+    registro.registrar_figura("histograma", figura_histograma(calificaciones_dict, rangos=rangos))
+    for parcial, rango in rangos.items():
+        registro.registrar_figura(f"pastel_{parcial}", figura_pastel(rango["conteo"], parcial))
+    registro.registrar_figura("boxplot", figura_boxplot(cajas=cajas))
+    resultados["pdf"] = medir(lambda: generar_pdf(
+        estadisticas_dict, clave[1], clave[2], clave[3], clave[0], registro,
+        colores_pies=[r["colores"] for r in rangos.values()],
+        etiquetas_pies=[r["etiquetas"] for r in rangos.values()],
+        porcentajes_pies=[r["porcentajes_pastel"] for r in rangos.values()]), repeticiones)
+
+    return {"filas": filas, "alumnos_grupo": len(grupo_df),
+            "memoria": carga.memoria_calificaciones(ruta), "etapas": resultados}
+
+
+def comparar(actual, anterior, tolerancia):
+    # Regresión = la mediana de una etapa empeoró más que `tolerancia` (fracción)
+    regresiones = []
+    previos = {r["filas"]: r["etapas"] for r in anterior["resultados"]}
+    for resultado in actual["resultados"]:
+        for etapa, medicion in resultado["etapas"].items():
+            antes = previos.get(resultado["filas"], {}).get(etapa)
+            if antes and medicion["mediana_s"] > antes["mediana_s"] * (1 + tolerancia):
+                regresiones.append(f"{resultado['filas']} filas / {etapa}: "
+                                   f"{antes['mediana_s']:.4f}s -> {medicion['mediana_s']:.4f}s")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de cada etapa de la página de calificaciones")
+    parser.add_argument("--filas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", default="resultados_etapas.json")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    args = parser.parse_args()
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "pandas": pd.__version__,
+        "resultados": [],
+    }
+    for filas in args.filas:
+        resultado = medir_tamano(filas, args.repeticiones)
+        informe["resultados"].append(resultado)
+        memoria = resultado["memoria"]
+        print(f"{filas:>9} filas  memoria {memoria['antes'] / 2**20:.1f} MB -> {memoria['despues'] / 2**20:.1f} MB")
+        for etapa, medicion in resultado["etapas"].items():
+            print(f"{filas:>9} filas  {etapa:<30} {medicion['mediana_s'] * 1000:>10.2f} ms")
+
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, ensure_ascii=False, indent=2)
+    print(f"Resultados en {args.salida}", file=sys.stderr)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            regresiones = comparar(informe, json.load(f), args.tolerancia)
+        if regresiones:
+            sys.exit("❌ Regresiones:\n" + "\n".join(regresiones))
+        print("✅ Sin regresiones", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
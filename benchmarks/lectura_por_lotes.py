@@ -0,0 +1,94 @@
+# Memoria pico y tiempo de leer un libro grande y calcular el cubo de
+# estadísticas: pd.read_excel (todo en memoria) contra la lectura por lotes de
+# openpyxl con Acumuladores. Cada modo corre en su propio proceso para que el
+# pico de uno no contamine al otro.
+#
+#   python benchmarks/lectura_por_lotes.py --filas 100000 300000
+#   python benchmarks/lectura_por_lotes.py --excel libro.xlsx --filas-por-lote 20000
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(AQUI)
+sys.path.insert(0, RAIZ)
+
+# Se ejecuta en un proceso nuevo: argv = modo, ruta, filas_por_lote, salida.
+# ru_maxrss es el pico del proceso; "sobre_base" descuenta el pico que ya
+# dejaron las importaciones (0 = nunca pasó de ahí)
+PROGRAMA = """
+import json, resource, sys, time
+modo, ruta, filas_por_lote, salida = sys.argv[1], sys.argv[2], int(sys.argv[3]), sys.argv[4]
+import pandas as pd
+from calificaciones.esquema import normalizar_esquema
+from calificaciones.acumuladores import Acumuladores
+from calificaciones.estadisticas import calcular_cubo
+from calificaciones.lectura import leer_por_lotes
+
+base_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+inicio = time.perf_counter()
+if modo == "read_excel":
+    cubo = calcular_cubo(normalizar_esquema(pd.read_excel(ruta)))
+else:
+    acumuladores = Acumuladores()
+    for lote in leer_por_lotes(ruta, filas_por_lote):
+        acumuladores.agregar(lote)
+    cubo = acumuladores.cubo()
+segundos = time.perf_counter() - inicio
+pico_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+cubo.to_pickle(salida)
+print(json.dumps({"segundos": segundos, "pico_mb": pico_kb / 1024, "sobre_base_mb": (pico_kb - base_kb) / 1024}))
+"""
+
+
+def medir(modo, ruta, filas_por_lote, salida):
+    proceso = subprocess.run([sys.executable, "-c", PROGRAMA, modo, ruta, str(filas_por_lote), salida],
+                             cwd=RAIZ, capture_output=True, text=True, check=True)
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def main():
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="read_excel contra lectura por lotes")
+    parser.add_argument("--excel", nargs="*", default=[], help="Libros a medir (además de los sintéticos)")
+    parser.add_argument("--filas", type=int, nargs="*", default=[10_000, 100_000],
+                        help="Tamaños de libros sintéticos (ver benchmarks/etapas.py)")
+    parser.add_argument("--filas-por-lote", type=int, default=50_000)
+    parser.add_argument("--salida", default=None, help="JSON con los resultados")
+    args = parser.parse_args()
+
+    from etapas import libro_sintetico
+
+    rutas = list(args.excel) + [libro_sintetico(filas) for filas in args.filas]
+    resultados = []
+    with tempfile.TemporaryDirectory() as temporal:
+        for ruta in rutas:
+            fila = {"excel": os.path.basename(ruta), "mb": os.path.getsize(ruta) / 2**20}
+            cubos = {}
+            for modo in ("read_excel", "lotes"):
+                cubos[modo] = os.path.join(temporal, f"{modo}.pkl")
+                fila[modo] = medir(modo, ruta, args.filas_por_lote, cubos[modo])
+            # Los dos caminos deben dar el mismo cubo (salvo redondeo de la media/varianza)
+            a, b = pd.read_pickle(cubos["read_excel"]), pd.read_pickle(cubos["lotes"])
+            fila["diferencia_max"] = float((a - b).abs().max().max()) if a.index.equals(b.index) else None
+            resultados.append(fila)
+            print(f"{fila['excel']} ({fila['mb']:.1f} MB): "
+                  f"read_excel {fila['read_excel']['segundos']:.1f} s, pico {fila['read_excel']['pico_mb']:.0f} MB "
+                  f"(+{fila['read_excel']['sobre_base_mb']:.0f}); "
+                  f"lotes {fila['lotes']['segundos']:.1f} s, pico {fila['lotes']['pico_mb']:.0f} MB "
+                  f"(+{fila['lotes']['sobre_base_mb']:.0f}), "
+                  f"diferencia {fila['diferencia_max']}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+    if any(fila["diferencia_max"] is None or fila["diferencia_max"] > 1e-9 for fila in resultados):
+        sys.exit("❌ Los cubos no coinciden")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Muchas sesiones abriendo los mismos grupos a la vez (p. ej. todos los
+# docentes al publicarse las calificaciones): cuánto tarda cada sesión con las
+# cachés compartidas frías y calientes, y cuántas veces se construyó cada cosa.
+#
+#   python benchmarks/sesiones.py --sesiones 40 --grupos 5
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(AQUI))
+
+from calificaciones import Analisis
+from calificaciones.cache import cache_resultados
+from calificaciones.graficas import cache_figuras, figura_histograma, grafica_png
+
+
+def sesion(analisis, clave):
+    # Lo que pide la página de un grupo: pasteles, histograma (imagen) y PDF
+    inicio = time.perf_counter()
+    analisis.pastel_de(clave)
+    analisis.histograma_de(clave)
+    grafica_png((analisis.version, *clave), None, "histograma",
+                lambda: figura_histograma(analisis.calificaciones_de(clave)))
+    analisis.reporte_pdf(clave)
+    return time.perf_counter() - inicio
+
+
+def ronda(analisis, claves, sesiones):
+    with ThreadPoolExecutor(max_workers=sesiones) as pool:
+        tiempos = list(pool.map(lambda i: sesion(analisis, claves[i % len(claves)]), range(sesiones)))
+    return {"p50_s": statistics.median(tiempos), "max_s": max(tiempos)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sesiones simultáneas con cachés compartidas")
+    parser.add_argument("--excel", default=None, help="Libro a usar (por defecto el primero de la raíz)")
+    parser.add_argument("--sesiones", type=int, default=40)
+    parser.add_argument("--grupos", type=int, default=5, help="Grupos distintos que se reparten las sesiones")
+    args = parser.parse_args()
+
+    raiz = os.path.dirname(AQUI)
+    ruta = args.excel or next(os.path.join(raiz, f) for f in sorted(os.listdir(raiz)) if f.endswith(".xlsx"))
+    analisis = Analisis.desde_excel(ruta)
+    claves = analisis.combinaciones()[:args.grupos]
+
+    for nombre in ("fría", "caliente"):
+        tiempos = ronda(analisis, claves, args.sesiones)
+        print(f"caché {nombre}: p50 {tiempos['p50_s'] * 1000:.0f} ms, máx {tiempos['max_s'] * 1000:.0f} ms por sesión")
+    for nombre, cache in (("resultados", cache_resultados), ("figuras", cache_figuras)):
+        print(f"{nombre}: {cache.estadisticas()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Vistas agregadas (Carrera, Semestre, plantel) contra la vista por grupo: lo
+# que pide la página al elegir una clave (estadísticas, cambios entre
+# parciales, rangos, cajas del boxplot y aprobados), sin caché. Con los
+# acumuladores ya resumidos una Carrera cuesta lo mismo que un grupo
+#
+#   python benchmarks/vistas.py --filas 100000
+import argparse
+import os
+import statistics
+import sys
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(AQUI))
+
+from calificaciones import VISTAS, Analisis, carga
+from etapas import libro_sintetico
+
+
+def consultar(consulta, clave):
+    inicio = time.perf_counter()
+    consulta.estadisticas_de(clave)
+    consulta.tendencias_de(clave)
+    consulta.rangos_de(clave)
+    consulta.cajas_de(clave)
+    consulta.aprobados_de(clave)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consultas por vista agregada vs. por grupo")
+    parser.add_argument("--filas", type=int, default=100_000)
+    parser.add_argument("--claves", type=int, default=30, help="Claves a consultar por vista")
+    args = parser.parse_args()
+
+    df = carga.cargar_calificaciones(libro_sintetico(args.filas))
+    inicio = time.perf_counter()
+    analisis = Analisis(df)  # sin versión: nada se guarda en caché
+    print(f"{args.filas} filas: Analisis con {len(VISTAS) - 1} vistas agregadas en "
+          f"{(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    for vista in VISTAS:
+        consulta = analisis.vista_de(vista)
+        claves = (analisis.combinaciones() if vista == "Grupo" else consulta.opciones())[:args.claves]
+        tiempos = [consultar(consulta, clave) for clave in claves]
+        filas = [len(analisis.filas(clave)) for clave in claves] if vista == "Grupo" else None
+        print(f"{vista:>9}: p50 {statistics.median(tiempos) * 1000:6.1f} ms, máx {max(tiempos) * 1000:6.1f} ms "
+              f"por clave ({len(claves)} claves"
+              + (f", ~{statistics.median(filas):.0f} alumnos por grupo)" if filas else ")"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# Lógica de análisis de calificaciones (sin Streamlit)
+from .acumuladores import Acumuladores
+from .api import Analisis, VistaAgregada
+from .carga import cargar_calificaciones, memoria_calificaciones, version_calificaciones
+from .esquema import normalizar_esquema, uso_memoria
+from .estadisticas import (MEDIDAS, PARCIALES, calcular_cubo, calcular_tendencias, cubo_desde_conteos,
+                           detectar_parciales, estadisticas_por_grupo, tendencias_por_grupo)
+from .filtros import NIVELES, VISTAS, IndiceFiltros
+from .lectura import leer_por_lotes
+
+__all__ = [
+    "MEDIDAS",
+    "NIVELES",
+    "PARCIALES",
+    "VISTAS",
+    "Acumuladores",
+    "Analisis",
+    "IndiceFiltros",
+    "VistaAgregada",
+    "calcular_cubo",
+    "calcular_tendencias",
+    "cargar_calificaciones",
+    "cubo_desde_conteos",
+    "detectar_parciales",
+    "estadisticas_por_grupo",
+    "leer_por_lotes",
+    "memoria_calificaciones",
+    "normalizar_esquema",
+    "tendencias_por_grupo",
+    "uso_memoria",
+    "version_calificaciones",
+]
@@ -0,0 +1,78 @@
+# CLI: reporte de un grupo sin levantar Streamlit
+#
+#   python -m calificaciones --semestre 6 --carrera Programación --grupo A \
+#       --asignatura "Inglés VI" --out reporte.pdf
+#   python -m calificaciones --semestre 6 --carrera Programación --listar
+import argparse
+import json
+import sys
+
+from .api import Analisis
+
+ARCHIVO_EXCEL = "Calificaciones 1 y 2 parcial Plantel Xonacatlán.xlsx"
+NIVELES_CLI = ["semestre", "carrera", "grupo", "asignatura"]
+
+
+def _elegir(opciones, valor, nivel, parser):
+    # Los argumentos llegan como texto; el semestre en el Excel es número
+    for opcion in opciones:
+        if str(opcion) == valor:
+            return opcion
+    disponibles = ", ".join(str(o) for o in opciones) or "(ninguno)"
+    parser.error(f"{nivel} '{valor}' no existe. Disponibles: {disponibles}")
+
+
+def _a_json(valor):
+    return valor.item() if hasattr(valor, "item") else str(valor)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m calificaciones",
+                                     description="Estadísticas y reporte PDF de un grupo")
+    parser.add_argument("--excel", default=ARCHIVO_EXCEL, help="Libro de calificaciones (.xlsx)")
+    for nivel in NIVELES_CLI:
+        parser.add_argument(f"--{nivel}")
+    parser.add_argument("--out", help="Ruta del PDF a generar")
+    parser.add_argument("--json", action="store_true",
+                        help="Imprime estadísticas, histograma y pastel del grupo en JSON")
+    parser.add_argument("--listar", action="store_true",
+                        help="Lista las opciones del siguiente nivel sin especificar")
+    args = parser.parse_args(argv)
+
+    analisis = Analisis.desde_excel(args.excel)
+
+    clave = []
+    for nivel in NIVELES_CLI:
+        valor = getattr(args, nivel)
+        if valor is None:
+            break
+        clave.append(_elegir(analisis.opciones(*clave), valor, nivel, parser))
+
+    if args.listar or len(clave) < len(NIVELES_CLI):
+        if not args.listar:
+            faltante = NIVELES_CLI[len(clave)]
+            print(f"Falta --{faltante}. Opciones:", file=sys.stderr)
+        for opcion in analisis.opciones(*clave):
+            print(opcion)
+        return 0 if args.listar else 2
+
+    if args.json:
+        resultado = {
+            "clave": dict(zip(NIVELES_CLI, clave)),
+            "estadisticas": analisis.estadisticas_de(clave),
+            "tendencias": analisis.tendencias_de(clave),
+            "histograma": analisis.histograma_de(clave),
+            "pastel": analisis.pastel_de(clave),
+        }
+        json.dump(resultado, sys.stdout, ensure_ascii=False, indent=2, default=_a_json)
+        print()
+
+    if args.out:
+        with open(args.out, "wb") as f:
+            f.write(analisis.reporte_pdf(clave))
+        print(f"✅ Reporte guardado en {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+# Acumuladores combinables por (grupo, parcial). Cada grupo guarda:
+#   - momentos: n, media, m2 (suma de desvíos al cuadrado), mín y máx
+#   - histograma fijo sobre rango_bins (las barras y pasteles de la página)
+#   - cuántas veces aparece cada calificación (cuartiles y moda exactos)
+# Dos acumuladores se combinan sin volver a leer filas (Chan et al. para media
+# y varianza), así que los totales por Carrera o Semestre salen de los de cada
+# Grupo, y agregar filas nuevas sólo toca los grupos que traen: el lote se
+# resume al agregarlo y se combina con lo acumulado en la siguiente consulta
+import numpy as np
+import pandas as pd
+
+from .estadisticas import APROBATORIA, MEDIDAS, cubo_desde_conteos, detectar_parciales, formato_largo
+from .filtros import NIVELES
+from .rangos import matriz_rangos, rango_labels
+
+MOMENTOS = ["n", "media", "m2", "min", "max"]
+
+
+def _sin_categorias(indice, niveles):
+    # Las dimensiones llegan como categorías distintas en cada lote; se pasan a
+    # sus valores para que índices de lotes distintos se puedan alinear. El
+    # parcial sigue siendo categoría ordenada (P2 antes que P10)
+    return indice.set_levels([indice.levels[i].astype(object) if nombre in niveles else indice.levels[i]
+                              for i, nombre in enumerate(indice.names)])
+
+
+def _multiindice(tabla):
+    # Al resumir a ningún nivel (todo el plantel) groupby devuelve un índice
+    # simple de parciales; se deja como MultiIndex de un nivel igual que los demás
+    if not isinstance(tabla.index, pd.MultiIndex):
+        tabla.index = pd.MultiIndex.from_arrays([tabla.index])
+    return tabla
+
+
+def _reducir_momentos(momentos, llaves):
+    # Combinación de Chan para k partes a la vez:
+    #   media = Σ nᵢ·mediaᵢ / n
+    #   m2    = Σ m2ᵢ + nᵢ·(mediaᵢ − media)²
+    grupos = momentos.groupby(level=llaves, sort=True, observed=True)
+    ponderada = (momentos["n"] * momentos["media"]).groupby(level=llaves, sort=True, observed=True)
+    media = ponderada.transform("sum") / grupos["n"].transform("sum")
+    desvios = momentos["m2"] + momentos["n"] * (momentos["media"] - media) ** 2
+
+    resultado = grupos.agg(n=("n", "sum"), min=("min", "min"), max=("max", "max"))
+    resultado["media"] = ponderada.sum() / resultado["n"]
+    resultado["m2"] = desvios.groupby(level=llaves, sort=True, observed=True).sum()
+    return resultado[MOMENTOS]
+
+
+class Acumuladores:
+    # Se llenan con agregar(lote) (todas las filas de una vez o por lotes, como
+    # los de lectura.leer_por_lotes) y se consultan con cubo(), resumir() e
+    # histograma_de(). Las filas no se guardan
+
+    def __init__(self, niveles=NIVELES, parciales=None):
+        self.niveles = list(niveles)
+        self.parciales = None if parciales is None else list(parciales)
+        self.filas = 0
+        llaves = self.niveles + ["parcial"]
+        vacio = pd.MultiIndex.from_tuples([], names=llaves)
+        self._momentos = pd.DataFrame({c: pd.Series(dtype=np.float64) for c in MOMENTOS}, index=vacio)
+        self._histograma = pd.DataFrame({c: pd.Series(dtype=np.int64) for c in rango_labels}, index=vacio)
+        self._conteos = pd.Series(dtype=np.int64, name="n",
+                                  index=pd.MultiIndex.from_tuples([], names=llaves + ["calificacion"]))
+        # Lotes ya resumidos que aún no se combinan con lo acumulado
+        self._pendientes = []
+        # Último cubo() y los (grupo, parcial) que cambiaron desde entonces
+        self._cubo = None
+        self._tocados = None
+
+    # Lo acumulado, con los lotes pendientes ya combinados
+    @property
+    def momentos(self):
+        self._consolidar()
+        return self._momentos
+
+    @property
+    def histograma(self):
+        self._consolidar()
+        return self._histograma
+
+    @property
+    def conteos(self):
+        self._consolidar()
+        return self._conteos
+
+    @classmethod
+    def desde_filas(cls, df, niveles=NIVELES, parciales=None):
+        return cls(niveles, parciales).agregar(df)
+
+    def _de_lote(self, lote):
+        # Acumuladores de un solo lote (con el mismo esquema que self)
+        if self.parciales is None:
+            self.parciales = detectar_parciales(lote)
+        largo = formato_largo(lote, self.niveles, self.parciales)
+        llaves = self.niveles + ["parcial"]
+        grupos = largo.groupby(llaves, sort=True, observed=True)["calificacion"]
+        codigo = grupos.ngroup().to_numpy()
+        valores = largo["calificacion"].to_numpy()
+
+        momentos = grupos.agg(n="count", media="mean", min="min", max="max")
+        # Dentro del lote, dos pasadas vectorizadas (media y luego desvíos)
+        # dan lo mismo que Welford fila por fila sin el ciclo en Python
+        momentos["m2"] = np.bincount(codigo, weights=(valores - momentos["media"].to_numpy()[codigo]) ** 2,
+                                     minlength=len(momentos))
+        momentos["n"] = momentos["n"].astype(np.float64)
+        momentos.index = _sin_categorias(momentos.index, self.niveles)
+
+        histograma = pd.DataFrame(matriz_rangos(codigo, valores, len(momentos)),
+                                  index=momentos.index, columns=rango_labels)
+
+        conteos = largo.groupby(llaves + ["calificacion"], sort=True, observed=True).size().rename("n")
+        conteos.index = _sin_categorias(conteos.index, self.niveles)
+        return momentos[MOMENTOS], histograma, conteos
+
+    def agregar(self, lote):
+        # Sólo resume el lote (cuesta lo que el lote); se combina con lo
+        # acumulado en la siguiente consulta, junto con los demás pendientes
+        momentos, histograma, conteos = self._de_lote(lote)
+        self.filas += len(lote)
+        if len(momentos):
+            self._pendientes.append((momentos, histograma, conteos))
+        return self
+
+    def _consolidar(self):
+        # Los lotes pendientes se reducen entre sí y luego sólo se tocan los
+        # grupos que traen: los que ya existían se actualizan en su lugar y los
+        # nuevos se anexan (sólo entonces se copia lo acumulado)
+        if not self._pendientes:
+            return
+        momentos, histograma, conteos = zip(*self._pendientes)
+        self._pendientes = []
+        llaves = self.niveles + ["parcial"]
+        if len(momentos) == 1:
+            momentos, histograma, conteos = momentos[0], histograma[0], conteos[0]
+        else:
+            momentos = _reducir_momentos(pd.concat(momentos), llaves)
+            histograma = pd.concat(histograma).groupby(level=llaves, sort=True, observed=True).sum()
+            conteos = pd.concat(conteos).groupby(level=llaves + ["calificacion"], sort=True, observed=True).sum()
+        self._tocados = momentos.index if self._tocados is None else self._tocados.union(momentos.index)
+
+        posiciones = self._momentos.index.get_indexer(momentos.index)
+        existen = posiciones >= 0
+        if existen.any():
+            viejos = self._momentos.iloc[posiciones[existen]]
+            juntos = pd.concat([viejos, momentos[existen]])
+            combinados = _reducir_momentos(juntos, list(range(juntos.index.nlevels)))
+            combinados = combinados.reindex(viejos.index)
+            self._momentos.iloc[posiciones[existen]] = combinados.to_numpy()
+            self._histograma.iloc[posiciones[existen]] += histograma[existen].to_numpy()
+        if not existen.all():
+            self._momentos = pd.concat([self._momentos, momentos[~existen]])
+            self._histograma = pd.concat([self._histograma, histograma[~existen]])
+
+        posiciones = self._conteos.index.get_indexer(conteos.index)
+        existen = posiciones >= 0
+        if existen.any():
+            self._conteos.iloc[posiciones[existen]] += conteos[existen].to_numpy()
+        if not existen.all():
+            self._conteos = pd.concat([self._conteos, conteos[~existen]])
+
+    def copiar(self):
+        # Copia independiente (lo acumulado, los pendientes y el último cubo)
+        copia = Acumuladores(self.niveles, self.parciales)
+        copia.filas = self.filas
+        copia._momentos, copia._histograma = self._momentos.copy(), self._histograma.copy()
+        copia._conteos = self._conteos.copy()
+        copia._pendientes = list(self._pendientes)
+        copia._cubo, copia._tocados = self._cubo, self._tocados
+        return copia
+
+    def combinar(self, otro):
+        # Acumuladores de dos fuentes (p. ej. dos planteles o dos libros)
+        if self.niveles != otro.niveles:
+            raise ValueError(f"Niveles distintos: {self.niveles} y {otro.niveles}")
+        llaves = self.niveles + ["parcial"]
+        resultado = Acumuladores(self.niveles, self.parciales or otro.parciales)
+        resultado.filas = self.filas + otro.filas
+        resultado._momentos = _reducir_momentos(pd.concat([self.momentos, otro.momentos]), llaves)
+        resultado._histograma = (pd.concat([self.histograma, otro.histograma])
+                                 .groupby(level=llaves, sort=True, observed=True).sum())
+        resultado._conteos = (pd.concat([self.conteos, otro.conteos])
+                              .groupby(level=llaves + ["calificacion"], sort=True, observed=True).sum())
+        return resultado
+
+    def resumir(self, niveles):
+        # Totales a un nivel más alto (p. ej. ["Semestre", "Carrera"], o []
+        # para todo el plantel) a partir de los acumuladores de cada grupo, sin
+        # volver a leer filas
+        niveles = list(niveles)
+        faltan = [n for n in niveles if n not in self.niveles]
+        if faltan:
+            raise ValueError(f"Niveles desconocidos: {faltan}")
+        llaves = niveles + ["parcial"]
+        resultado = Acumuladores(niveles, self.parciales)
+        resultado.filas = self.filas
+        resultado._momentos = _multiindice(_reducir_momentos(self.momentos, llaves))
+        resultado._histograma = _multiindice(self.histograma.groupby(level=llaves, sort=True, observed=True).sum())
+        resultado._conteos = self.conteos.groupby(level=llaves + ["calificacion"], sort=True, observed=True).sum()
+        return resultado
+
+    def cubo(self):
+        # Las mismas medidas que calcular_cubo. Se guarda el último: después de
+        # agregar un lote sólo se recalculan los (grupo, parcial) que trajo
+        self._consolidar()
+        if self._cubo is None:
+            self._cubo = self._cubo_de(self._conteos)
+        elif self._tocados is not None:
+            tocados = self._conteos.index.droplevel(-1).isin(self._tocados)
+            nuevo = self._cubo_de(self._conteos[tocados])
+            self._cubo = pd.concat([self._cubo[~self._cubo.index.isin(self._tocados)], nuevo]).sort_index()
+        self._tocados = None
+        return self._cubo
+
+    def _cubo_de(self, conteos):
+        # Cuartiles y moda salen de los conteos (exactos: con calificaciones
+        # en décimas hay a lo más ~100 valores por grupo); media, varianza,
+        # extremos y total de los momentos
+        if not len(conteos):
+            return pd.DataFrame(columns=MEDIDAS)
+        cubo = cubo_desde_conteos(conteos.reset_index(), self.niveles)
+        momentos = self._momentos.reindex(cubo.index)
+        n = momentos["n"].to_numpy()
+        cubo["media"] = momentos["media"].to_numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cubo["varianza"] = np.where(n > 1, momentos["m2"].to_numpy() / (n - 1), np.nan)
+        cubo["min"] = momentos["min"].to_numpy()
+        cubo["max"] = momentos["max"].to_numpy()
+        cubo["rango"] = cubo["max"] - cubo["min"]
+        cubo["total"] = n.astype(np.int64)
+        return cubo[MEDIDAS]
+
+    def aprobados(self, minima=APROBATORIA):
+        # % de calificaciones >= minima de cada (grupo, parcial), todos a la
+        # vez desde los conteos (mismo índice que cubo())
+        llaves = self.niveles + ["parcial"]
+        aprobatoria = self.conteos.index.get_level_values(-1) >= minima
+        por_grupo = self.conteos.groupby(level=llaves, sort=True, observed=True)
+        aprobados = self.conteos.where(aprobatoria, 0).groupby(level=llaves, sort=True, observed=True).sum()
+        return _multiindice((aprobados / por_grupo.sum() * 100).rename("aprobados"))
+
+    def histograma_de(self, clave):
+        # {parcial: (conteo por rango, total de calificaciones del parcial)}
+        resultado = {}
+        for parcial in self.parciales or []:
+            llave = tuple(clave) + (parcial,)
+            posicion = self.momentos.index.get_indexer([llave])[0]
+            if posicion >= 0:
+                resultado[parcial] = (self.histograma.iloc[posicion].to_numpy(),
+                                      int(self.momentos["n"].iloc[posicion]))
+        return resultado
+
+    def conteos_de(self, clave):
+        # {parcial: (calificaciones distintas ordenadas, veces)} de un grupo;
+        # de aquí salen las cajas del boxplot y los aprobados sin tocar filas
+        indice = self.conteos.index
+        dentro = np.ones(len(indice), dtype=bool)
+        for nivel, valor in enumerate(clave):
+            codigo = indice.levels[nivel].get_indexer([valor])[0]
+            dentro &= indice.codes[nivel] == codigo
+        del_grupo = self.conteos[dentro]
+        parcial = del_grupo.index.get_level_values(len(self.niveles))
+        calificacion = del_grupo.index.get_level_values(-1).to_numpy(dtype=np.float64)
+        veces = del_grupo.to_numpy()
+
+        resultado = {}
+        for nombre in self.parciales or []:
+            es_parcial = np.asarray(parcial == nombre)
+            if es_parcial.any():
+                orden = np.argsort(calificacion[es_parcial], kind="stable")
+                resultado[nombre] = (calificacion[es_parcial][orden], veces[es_parcial][orden])
+        return resultado
@@ -0,0 +1,209 @@
+# API de análisis sin Streamlit: la página, la CLI y los lotes usan esto
+import os
+
+import pandas as pd
+
+from .acumuladores import Acumuladores
+from .cache import CacheLRU, cache_resultados
+from .cajas import caja_desde_conteos
+from .carga import cargar_libro
+from .esquema import a_float64
+from .estadisticas import (calcular_ranking, calcular_tendencias, detectar_parciales, estadisticas_por_grupo,
+                           porcentaje_aprobados, tendencias_por_grupo)
+from .filtros import NIVELES, TODOS, VISTAS, IndiceFiltros
+from .graficas import cache_figuras
+from .ingesta import cargar_planteles, ingerir, planteles_disponibles, versiones_vigentes
+from .rangos import curvas_tendencia, resumen_rangos
+
+# Un Analisis por versión de datos para todo el proceso: lo comparten todas las
+# sesiones y todas las páginas (análisis y ranking). Se cuentan entradas, no
+# bytes: a lo más 8 versiones (planteles) en memoria
+cache_analisis = CacheLRU(max_bytes=8, ttl=None, medir=lambda _: 1)
+
+
+def ingerir_libros(carpeta=None):
+    # Lo que hacen las páginas en cada rerun antes de elegir plantel: ingresar
+    # los libros .xlsx de la carpeta (CALIFICACIONES_CARPETA, por defecto la
+    # actual) al dataset por plantel, releyendo sólo los que cambiaron, y si
+    # cambió alguno liberar ya lo calculado con versiones que ya no existen
+    # (análisis, estadísticas, imágenes, PDF). Devuelve lo de ingesta.ingerir
+    # más "planteles" (los disponibles, ordenados)
+    carpeta = carpeta or os.environ.get("CALIFICACIONES_CARPETA", ".")
+    ingesta = ingerir(carpeta)
+    if ingesta["nuevos"] or ingesta["actualizados"] or ingesta["eliminados"]:
+        vigentes = versiones_vigentes(ingesta["manifiesto"])
+        for cache in (cache_analisis, cache_resultados, cache_figuras):
+            cache.conservar_versiones(vigentes)
+    ingesta["planteles"] = planteles_disponibles(ingesta["manifiesto"])
+    return ingesta
+
+
+def datos_plantel(ingesta, plantel):
+    # (version, DataFrame) de un plantel ya ingerido (ver ingerir_libros)
+    return cargar_planteles(ingesta["destino"], ingesta["manifiesto"], [plantel])
+
+
+class _Consultas:
+    # Consultas por clave comunes a la vista por grupo (Analisis) y a las
+    # vistas agregadas (VistaAgregada). Todo sale de los acumuladores y del
+    # cubo ya calculados, así que cuesta lo mismo para un grupo que para una
+    # Carrera completa. Cada clase define vista, niveles, version, parciales,
+    # acumuladores, estadisticas y tendencias
+
+    def _armar(self, acumuladores):
+        self.acumuladores = acumuladores
+        self.cubo = acumuladores.cubo()
+        self.estadisticas = estadisticas_por_grupo(self.cubo)
+        self.tendencias = tendencias_por_grupo(calcular_tendencias(self.cubo))
+
+    def _compartido(self, tipo, clave, construir):
+        # Resultados por clave compartidos entre sesiones (ver cache.py); sin
+        # versión no hay forma de saber si siguen valiendo y no se guardan
+        if self.version is None:
+            return construir()
+        return cache_resultados.obtener((self.version, tipo, self.vista, tuple(clave)), construir)
+
+    def etiquetas(self, clave):
+        # (semestre, carrera, grupo, asignatura) para encabezados y PDF; los
+        # niveles resumidos dicen "Todos"/"Todas"
+        elegidos = dict(zip(self.niveles, clave))
+        return tuple(elegidos.get(nivel, TODOS[nivel]) for nivel in NIVELES)
+
+    def estadisticas_de(self, clave):
+        # {parcial: {medida: valor}}; sólo parciales con calificaciones. Ya
+        # están todas calculadas (y Analisis se comparte por versión)
+        return self.estadisticas.get(tuple(clave), {})
+
+    def tendencias_de(self, clave):
+        # [{"desde": "P1", "hasta": "P2", medida: cambio}, ...] en orden
+        return self.tendencias.get(tuple(clave), [])
+
+    def rangos_de(self, clave):
+        # {parcial: conteo, porcentajes y curva de tendencia} (ver rangos.resumen_rangos);
+        # sale del histograma acumulado del grupo, sin recorrer sus filas. Lo
+        # comparten el histograma, los pasteles, la leyenda del PDF y EduBot
+        def construir():
+            histograma = self.acumuladores.histograma_de(clave)
+            if not histograma:
+                return {}
+            # Las curvas de tendencia de todos los parciales en un solo producto
+            curvas = curvas_tendencia([conteo for conteo, _ in histograma.values()])
+            return {parcial: resumen_rangos(conteo, total, curva)
+                    for (parcial, (conteo, total)), curva in zip(histograma.items(), curvas)}
+
+        return self._compartido("rangos", clave, construir)
+
+    def histograma_de(self, clave):
+        return {parcial: {"conteo": rangos["conteo"].tolist(),
+                          "porcentajes": rangos["porcentajes_histograma"].tolist()}
+                for parcial, rangos in self.rangos_de(clave).items()}
+
+    def pastel_de(self, clave):
+        return {parcial: {"colores": rangos["colores"], "etiquetas": rangos["etiquetas"],
+                          "porcentajes": rangos["porcentajes_pastel"].tolist()}
+                for parcial, rangos in self.rangos_de(clave).items()}
+
+    def cajas_de(self, clave):
+        # {parcial: cinco números + puntos muestreados} para el boxplot (ver
+        # cajas.py), desde las veces que aparece cada calificación; lo
+        # comparten la gráfica de la página (ambos motores) y el PDF
+        return self._compartido("cajas", clave, lambda: {
+            parcial: caja_desde_conteos(valores, veces)
+            for parcial, (valores, veces) in self.acumuladores.conteos_de(clave).items()})
+
+    def aprobados_de(self, clave):
+        # {parcial: % de calificaciones aprobatorias}
+        return {parcial: porcentaje_aprobados(valores, veces)
+                for parcial, (valores, veces) in self.acumuladores.conteos_de(clave).items()}
+
+    def reporte_pdf(self, clave):
+        # Importación diferida: fpdf/matplotlib sólo hacen falta para el PDF
+        from .reporte import generar_reporte_grupo
+
+        return self._compartido("pdf", clave, lambda: generar_reporte_grupo(
+            self.etiquetas(clave), None, self.estadisticas_de(clave), self.parciales,
+            self.rangos_de(clave), self.cajas_de(clave)))
+
+
+class Analisis(_Consultas):
+    # Todo lo que se calcula una vez por versión de datos: el índice de filtros,
+    # los acumuladores por grupo, el cubo de estadísticas, los cambios entre
+    # parciales y las vistas agregadas. Las consultas por grupo reciben la
+    # clave (semestre, carrera, grupo, asignatura)
+    vista = "Grupo"
+    niveles = NIVELES
+
+    def __init__(self, df, version=None):
+        self.df = df
+        self.version = version
+        self.parciales = detectar_parciales(df)
+        self.indice = IndiceFiltros(df)
+        self._armar(Acumuladores.desde_filas(df, parciales=self.parciales))
+        # Los totales por Carrera, Semestre y plantel se resumen ya: cambiar de
+        # vista cuesta lo mismo que cambiar de grupo
+        self.vistas = {vista: VistaAgregada(self, vista) for vista in VISTAS if vista != self.vista}
+
+    @classmethod
+    def desde_excel(cls, ruta):
+        version, df, _ = cargar_libro(ruta)
+        return cls(df, version)
+
+    @classmethod
+    def compartido(cls, version, df):
+        # El de esta versión si ya se construyó (en cualquier sesión o página)
+        return cache_analisis.obtener((version,), lambda: cls(df, version))
+
+    @classmethod
+    def de_plantel(cls, ingesta, plantel):
+        return cls.compartido(*datos_plantel(ingesta, plantel))
+
+    def vista_de(self, vista):
+        # La misma API para otra vista ("Grupo", "Carrera", "Semestre" o "Plantel")
+        return self if vista == self.vista else self.vistas[vista]
+
+    def opciones(self, *prefijo):
+        return self.indice.opciones(*prefijo)
+
+    def combinaciones(self):
+        return self.indice.combinaciones()
+
+    def filas(self, clave):
+        return self.indice.filas(*clave)
+
+    def calificaciones_de(self, clave):
+        grupo_df = self.filas(clave)
+        # float64 exacto (en memoria se guardan en float32)
+        calificaciones = {}
+        for parcial in self.parciales:
+            serie = grupo_df[parcial].dropna()
+            calificaciones[parcial] = pd.Series(a_float64(serie), index=serie.index, name=parcial)
+        return calificaciones
+
+    def ranking(self):
+        # Cambios de media, mediana, IQR, varianza y % de aprobados entre
+        # parciales consecutivos de todos los (grupo, asignatura), en una
+        # pasada sobre el cubo (ver estadisticas.calcular_ranking)
+        return self._compartido("ranking", (), lambda: calcular_ranking(self.cubo, self.acumuladores.aprobados()))
+
+    def resumen(self, niveles):
+        # Cubo de estadísticas a otro nivel (p. ej. ["Semestre", "Carrera"])
+        # combinando los acumuladores de cada grupo
+        return self.acumuladores.resumir(niveles).cubo()
+
+
+class VistaAgregada(_Consultas):
+    # Estadísticas, rangos, cajas y cambios entre parciales de todos los
+    # grupos de una Carrera, de un Semestre o del plantel, resumidos desde los
+    # acumuladores de cada grupo (no se vuelven a leer filas). Las claves son
+    # los valores de VISTAS[vista]: ("Programación",), (4,) o ()
+
+    def __init__(self, analisis, vista):
+        self.vista = vista
+        self.niveles = VISTAS[vista]
+        self.version = analisis.version
+        self.parciales = analisis.parciales
+        self._armar(analisis.acumuladores.resumir(self.niveles))
+
+    def opciones(self):
+        # Claves posibles de la vista, ordenadas
+        return sorted(self.estadisticas)
@@ -0,0 +1,140 @@
+# Cachés LRU del proceso, compartidas por todas las sesiones de Streamlit:
+# presupuesto en bytes, caducidad (TTL), contadores de aciertos/fallos e
+# invalidación por versión de datos
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+# Las entradas viejas se descartan aunque sobre presupuesto: la versión de
+# los datos ya las invalida al cambiar el Excel, el TTL sólo libera memoria
+TTL_CACHE = 2 * 60 * 60
+
+
+def tamano_aproximado(valor):
+    # Bytes que ocupa un valor: exacto para bytes (PNG, PDF) y el tamaño
+    # serializado para lo demás (diccionarios de estadísticas, conteos)
+    if isinstance(valor, (bytes, bytearray)):
+        return len(valor)
+    return len(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class CacheLRU:
+    # Cuando se pasa del presupuesto expulsa los valores que llevan más
+    # tiempo sin usarse. Las llaves que dependen de los datos empiezan con la
+    # versión (ver conservar_versiones)
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=TTL_CACHE, medir=tamano_aproximado, reloj=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.medir = medir
+        self.reloj = reloj
+        self.bytes_usados = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsados = 0
+        self._datos = OrderedDict()   # llave -> (valor, tamaño, caduca)
+        self._candado = threading.Lock()
+        self._construyendo = {}       # llave -> candado de quien la está construyendo
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __contains__(self, llave):
+        with self._candado:
+            return self._vigente(llave) is not None
+
+    def _vigente(self, llave):
+        # (con el candado tomado) la entrada si existe y no ha caducado
+        entrada = self._datos.get(llave)
+        if entrada is not None and entrada[2] is not None and entrada[2] <= self.reloj():
+            self._quitar(llave)
+            return None
+        return entrada
+
+    def _quitar(self, llave):
+        _, tamano, _ = self._datos.pop(llave)
+        self.bytes_usados -= tamano
+
+    def get(self, llave, defecto=None):
+        with self._candado:
+            entrada = self._vigente(llave)
+            if entrada is None:
+                self.fallos += 1
+                return defecto
+            self.aciertos += 1
+            self._datos.move_to_end(llave)
+            return entrada[0]
+
+    def put(self, llave, valor):
+        tamano = self.medir(valor)
+        if tamano > self.max_bytes:
+            return valor  # no cabe ni solo; se usa pero no se guarda
+        caduca = None if self.ttl is None else self.reloj() + self.ttl
+        with self._candado:
+            if llave in self._datos:
+                self._quitar(llave)
+            self._datos[llave] = (valor, tamano, caduca)
+            self.bytes_usados += tamano
+            while self.bytes_usados > self.max_bytes:
+                self._quitar(next(iter(self._datos)))
+                self.expulsados += 1
+        return valor
+
+    def obtener(self, llave, construir):
+        # Devuelve el valor guardado o lo construye y lo guarda. Si varias
+        # sesiones piden la misma llave a la vez, sólo una construye y las
+        # demás esperan su resultado (p. ej. todo un plantel abriendo el mismo
+        # grupo al publicarse las calificaciones)
+        faltante = object()
+        valor = self.get(llave, faltante)
+        if valor is not faltante:
+            return valor
+
+        with self._candado:
+            candado = self._construyendo.setdefault(llave, threading.Lock())
+        with candado:
+            with self._candado:
+                entrada = self._vigente(llave)
+            if entrada is not None:
+                return entrada[0]
+            try:
+                return self.put(llave, construir())
+            finally:
+                with self._candado:
+                    self._construyendo.pop(llave, None)
+
+    def invalidar(self, condicion):
+        # Quita las entradas cuya llave cumple la condición; devuelve cuántas
+        with self._candado:
+            llaves = [llave for llave in self._datos if condicion(llave)]
+            for llave in llaves:
+                self._quitar(llave)
+        return len(llaves)
+
+    def conservar_versiones(self, vigentes):
+        # Al cambiar un Excel su versión deja de estar entre las vigentes y
+        # todo lo calculado con ella se libera de inmediato
+        vigentes = set(vigentes)
+        return self.invalidar(lambda llave: isinstance(llave, tuple) and llave and llave[0] not in vigentes)
+
+    def estadisticas(self):
+        with self._candado:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._datos),
+                "bytes": self.bytes_usados,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+                "expulsados": self.expulsados,
+            }
+
+    def limpiar(self):
+        with self._candado:
+            self._datos.clear()
+            self.bytes_usados = 0
+
+
+# Resultados por (versión, tipo, grupo): pasteles, histogramas y PDF
+cache_resultados = CacheLRU(max_bytes=128 * 1024 * 1024)
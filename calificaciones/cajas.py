@@ -0,0 +1,82 @@
+# Datos del boxplot ya resumidos: los cinco números de cada parcial y una
+# muestra acotada de puntos para el strip plot. Todo sale de cuántas veces
+# aparece cada calificación, así que cuesta lo mismo para un grupo de 30
+# alumnos que para una Carrera completa, y lo que se dibuja no crece con el
+# tamaño del grupo
+import numpy as np
+
+from .estadisticas import interpolar_lineal
+
+# Puntos del strip plot por parcial; con más alumnos se muestrea
+MAX_PUNTOS = 300
+
+# Media anchura (en unidades del eje x) de la dispersión horizontal de los
+# puntos en la zona más densa; las demás se abren en proporción
+ANCHO_DISPERSION = 0.25
+
+# Franjas del rango de calificaciones en las que se mide esa densidad
+BANDAS_DENSIDAD = 12
+
+
+def conteo_valores(calificaciones):
+    # (calificaciones distintas ordenadas, veces que aparece cada una)
+    valores = np.asarray(calificaciones, dtype=np.float64)
+    return np.unique(valores[~np.isnan(valores)], return_counts=True)
+
+
+def resumen_desde_conteos(valores, veces, bigote=1.5):
+    # Los números que dibuja un boxplot (como seaborn/matplotlib): cuartiles
+    # con interpolación lineal y bigotes hasta la calificación más lejana que
+    # quede dentro de 1.5·IQR
+    acumulado = np.cumsum(veces)
+    total = int(acumulado[-1])
+    posiciones = (total - 1) * np.array([0.25, 0.50, 0.75])
+    abajo, arriba = np.floor(posiciones), np.ceil(posiciones)
+    q1, mediana, q3 = interpolar_lineal(valores[np.searchsorted(acumulado, abajo, side="right")],
+                                        valores[np.searchsorted(acumulado, arriba, side="right")],
+                                        posiciones - abajo)
+    alcance = bigote * (q3 - q1)
+    dentro = valores[(valores >= q1 - alcance) & (valores <= q3 + alcance)]
+    # Q1/Q3 interpolados pueden quedar fuera de las calificaciones dentro del
+    # alcance (p. ej. Q3 = 5.25 y la siguiente calificación ya es atípica): el
+    # bigote nunca se mete en la caja, igual que en matplotlib
+    return {"q1": float(q1), "mediana": float(mediana), "q3": float(q3),
+            "bigote_inferior": float(min(dentro.min(), q1)), "bigote_superior": float(max(dentro.max(), q3)),
+            "total": total}
+
+
+def puntos_strip(valores, veces, max_puntos=MAX_PUNTOS, ancho=ANCHO_DISPERSION):
+    # (desplazamiento en x, calificación) de los puntos a dibujar. Si hay más
+    # de `max_puntos` alumnos se toma una muestra sistemática sobre las
+    # calificaciones ordenadas (conserva la forma de la distribución). La
+    # dispersión horizontal es proporcional a la densidad de calificaciones
+    # alrededor de cada punto: donde hay más alumnos la nube se abre más y los
+    # aislados quedan cerca del centro. Semilla fija: el mismo grupo da
+    # siempre la misma figura
+    acumulado = np.cumsum(veces)
+    total = int(acumulado[-1])
+    if total > max_puntos:
+        indice = np.searchsorted(acumulado, np.linspace(0, total - 1, max_puntos), side="right")
+        veces = np.bincount(indice, minlength=len(valores))
+    y = np.repeat(valores, veces)
+
+    densidad, bordes = np.histogram(y, bins=BANDAS_DENSIDAD)
+    banda = np.clip(np.searchsorted(bordes, y, side="right") - 1, 0, BANDAS_DENSIDAD - 1)
+    amplitud = ancho * densidad[banda] / densidad.max()
+    x = amplitud * np.random.default_rng(0).uniform(-1, 1, len(y))
+    return x, y
+
+
+def caja_desde_conteos(valores, veces, max_puntos=MAX_PUNTOS):
+    x, y = puntos_strip(valores, veces, max_puntos)
+    return {**resumen_desde_conteos(valores, veces), "x": x, "y": y}
+
+
+def cajas_de_calificaciones(calificaciones_dict, max_puntos=MAX_PUNTOS):
+    # {parcial: {q1, mediana, q3, bigotes, total, x, y}}; sin los parciales vacíos
+    cajas = {}
+    for parcial, calificaciones in calificaciones_dict.items():
+        valores, veces = conteo_valores(calificaciones)
+        if len(valores):
+            cajas[parcial] = caja_desde_conteos(valores, veces, max_puntos)
+    return cajas
@@ -0,0 +1,34 @@
+# Carga de un solo libro de calificaciones (CLI, lotes y benchmarks). No
+# tiene caché propia: el libro pasa por el mismo dataset Parquet que la página
+# (ingesta.py, `.dataset_calificaciones` junto al Excel) y por la misma copia
+# en memoria, así que no hay dos cachés que puedan quedar desfasadas
+import os
+
+from .ingesta import cargar_archivos, ingerir
+
+
+def cargar_libro(ruta):
+    # (version, DataFrame, memoria). Si el libro no cambió desde la última
+    # ingesta sólo se revisa su firma; si cambió, se vuelve a ingerir sólo él
+    ruta = os.path.abspath(ruta)
+    nombre = os.path.basename(ruta)
+    ingesta = ingerir(os.path.dirname(ruta), libros=[ruta])
+    registro = ingesta["manifiesto"].get(nombre)
+    if registro is None:
+        raise FileNotFoundError(f"No se encontró el libro {ruta}")
+    version, df = cargar_archivos(ingesta["destino"], ingesta["manifiesto"], [nombre])
+    return version, df, registro["memoria"]
+
+
+def cargar_calificaciones(ruta):
+    return cargar_libro(ruta)[1]
+
+
+def version_calificaciones(ruta):
+    # Llave de los demás cachés: cambia sólo si cambia el contenido del libro
+    return cargar_libro(ruta)[0]
+
+
+def memoria_calificaciones(ruta):
+    # {"antes": bytes del Excel crudo, "despues": bytes ya compactado}
+    return dict(cargar_libro(ruta)[2])
@@ -0,0 +1,227 @@
+# Motor de intenciones de EduBot: índice de palabras normalizadas -> respuesta
+import re
+import unicodedata
+
+# Comparaciones entre parciales consecutivos (P1 -> P2 -> P3 ...). Cada
+# plantilla se arma una sola vez al importar el módulo; al responder sólo se
+# llama a .format con los valores del grupo.
+#   medida: llave de estadisticas_dict (o función que la calcula)
+#   conclusiones: (subió, bajó, se mantuvo); {desde} y {hasta} son los parciales
+COMPARACIONES = {
+    "media": {
+        "medida": "media",
+        "texto": "📊 Media\n"
+                 "La media es el promedio de todas las calificaciones.\n",
+        "conclusiones": ("📈 Conclusión: La media subió.",
+                         "📉 Conclusión: La media bajó.",
+                         "➖ Conclusión: La media se mantuvo igual."),
+    },
+    "moda": {
+        "medida": "moda",
+        "texto": "📌 Moda\n"
+                 "La moda es el valor que más se repite. Si cambia entre parciales, indica un cambio en las calificaciones más comunes.\n",
+        "conclusiones": ("📈 Conclusión: La moda subió, los valores más frecuentes fueron más altos en {hasta}.",
+                         "📉 Conclusión: La moda bajó, los valores más repetidos fueron más bajos en {hasta}.",
+                         "➖ Conclusión: La moda se mantuvo igual en {desde} y {hasta}."),
+    },
+    "mediana": {
+        "medida": "mediana",
+        "texto": "📈 Mediana\n"
+                 "Divide los datos ordenados por la mitad. Menos sensible a extremos que la media.\n",
+        "conclusiones": ("📈 Conclusión: La mediana subió, los valores más frecuentes fueron más altos en {hasta}.",
+                         "📉 Conclusión: La mediana bajó, los valores más repetidos fueron más bajos en {hasta}.",
+                         "➖ Conclusión: La mediana se mantuvo igual en {desde} y {hasta}."),
+    },
+    "rango": {
+        "medida": "rango",
+        "texto": "📏 Rango (Máx - Mín)\n"
+                 "El rango muestra qué tan dispersas están las calificaciones, comparando la más alta con la más baja.\n",
+        "conclusiones": ("📈 Conclusión: Aumentó el rango en {hasta}, hay mayor variabilidad entre los alumnos.",
+                         "📉 Conclusión: Disminuyó el rango en {hasta}, las calificaciones fueron más homogéneas.",
+                         "➖ Conclusión: El rango se mantuvo igual, la dispersión fue la misma."),
+    },
+    "q1": {
+        "medida": "q1",
+        "texto": "🟪 Q1 (Primer Cuartil - 25%)\n"
+                 "El 25% de las calificaciones están por debajo de este valor. Útil para ver el rendimiento más bajo.\n",
+        "conclusiones": ("📈 Conclusión: El Q1 subió en {hasta}, los alumnos con menor rendimiento mejoraron.",
+                         "📉 Conclusión: El Q1 bajó, hubo menor rendimiento en el 25% inferior.",
+                         "➖ Conclusión: El Q1 se mantuvo igual, sin cambios en el grupo de menor rendimiento."),
+    },
+    "q2": {
+        "medida": "q2",
+        "texto": "🔵 Q2 (Mediana - 50%)\n"
+                 "Mitad de alumnos sacó menos y mitad más que este valor. Es menos sensible a valores extremos.\n",
+        "conclusiones": ("📈 Conclusión: El Q2 subió, mejoró el rendimiento medio.",
+                         "📉 Conclusión: El Q2 bajó, el rendimiento medio fue más bajo.",
+                         "➖ Conclusión: El Q2 se mantuvo igual, sin cambios en la mediana."),
+    },
+    "q3": {
+        "medida": "q3",
+        "texto": "🟥 Q3 (Tercer Cuartil - 75%)\n"
+                 "El 75% de los alumnos sacó menos o igual que este valor. Mide el rendimiento del grupo superior.\n",
+        "conclusiones": ("📈 Conclusión: El Q3 subió, el grupo alto mejoró aún más.",
+                         "📉 Conclusión: El Q3 bajó, el grupo alto tuvo menor rendimiento.",
+                         "➖ Conclusión: El Q3 se mantuvo igual, sin cambios en el grupo con mejores notas."),
+    },
+    "iqr": {
+        "medida": lambda estadisticas: estadisticas["q3"] - estadisticas["q1"],
+        "texto": "📏 IQR - Rango Intercuartílico\n"
+                 "Es la diferencia entre el tercer cuartil (Q3) y el primero (Q1). Representa la dispersión del 50% central de los datos.\n",
+        "marcas": ("🟩", "🟦", "🟪", "🟧", "🟨", "🟥"),
+        "conclusiones": ("⚠️ Conclusión: La dispersión aumentó en {hasta}. Hubo más variación entre los alumnos.",
+                         "✅ Conclusión: La dispersión disminuyó en {hasta}. Las calificaciones están más concentradas.",
+                         "➖ Conclusión: El IQR se mantuvo igual. La concentración de calificaciones no cambió."),
+    },
+    "total": {
+        "medida": "total",
+        "formato": "",
+        "texto": "👥 Total de alumnos con calificación registrada\n"
+                 "Refleja cuántos estudiantes fueron evaluados en cada parcial. Las diferencias pueden deberse a inasistencias, faltas de entrega o errores en la captura de datos.\n",
+        "conclusiones": ("📈 Conclusión: Más alumnos fueron evaluados en {hasta}.",
+                         "📉 Conclusión: Menos alumnos tienen calificación en {hasta}. Puede indicar ausencias o datos faltantes.",
+                         "➖ Conclusión: El número de alumnos evaluados se mantuvo igual en {desde} y {hasta}."),
+    },
+    "varianza": {
+        "medida": "varianza",
+        "texto": "📉 Varianza\n"
+                 "Mide la dispersión de las calificaciones con respecto a la media. Valores altos indican más variabilidad.\n",
+        "conclusiones": ("⚠️ Conclusión: La varianza aumentó en {hasta}, mayor dispersión entre los alumnos.",
+                         "✅ Conclusión: La varianza disminuyó en {hasta}, las calificaciones están más concentradas.",
+                         "➖ Conclusión: La varianza se mantuvo igual en {desde} y {hasta}."),
+    },
+}
+
+# Respuestas que no dependen de los datos
+RESPUESTAS_FIJAS = {
+    "boxplot": (
+        "📦 Boxplot\n"
+        "Gráfico que muestra la distribución de calificaciones, destacando mediana, cuartiles y posibles valores atípicos.\n"
+        "Es útil para visualizar la dispersión y detectar datos extremos.\n"
+        "Para más detalles, revisa las gráficas generadas en el panel principal."
+    ),
+    "pdf": "📄 Puedes generar un PDF con las gráficas y estadísticas actuales usando el botón que aparece al final del análisis.",
+}
+
+# Viñeta de cada parcial en la lista de valores (se repiten si hay más)
+MARCAS = ("🟢", "🔵", "🟣", "🟠", "🟡", "🔴")
+
+# Distribución por rango de calificación (los mismos conteos que el
+# histograma y los pasteles)
+TEXTO_DISTRIBUCION = "📊 Distribución por rango\nPorcentaje de alumnos en cada rango de calificación por parcial:\n"
+SIN_DISTRIBUCION = "⚠️ No hay calificaciones en este grupo para mostrar su distribución."
+
+NO_ENTENDI = "❓ No entendí la pregunta. Puedes intentar con: media, moda, varianza, IQR, distribución, PDF, etc."
+
+# Palabras (ya normalizadas, sin acentos) y sinónimos de cada intención.
+# Las frases de dos palabras se buscan como bigramas.
+SINONIMOS = {
+    "iqr": ["iqr", "intercuartil", "intercuartilico", "rango intercuartil", "rango intercuartilico"],
+    "q1": ["q1", "cuartil 1", "primer cuartil"],
+    "q2": ["q2", "cuartil 2", "segundo cuartil"],
+    "q3": ["q3", "cuartil 3", "tercer cuartil"],
+    "mediana": ["mediana"],
+    "media": ["media", "promedio"],
+    "moda": ["moda", "frecuente"],
+    "varianza": ["varianza", "variabilidad"],
+    "rango": ["rango", "amplitud"],
+    "distribucion": ["distribucion", "rangos", "pastel", "histograma", "porcentajes"],
+    "total": ["total", "alumnos", "estudiantes", "cuantos"],
+    "boxplot": ["boxplot", "caja", "bigotes"],
+    "pdf": ["pdf", "descargar", "reporte"],
+}
+
+# Si una pregunta menciona varias cosas gana la más específica
+# ("rango intercuartil" es IQR aunque también diga "rango")
+PRIORIDAD = ["iqr", "q1", "q2", "q3", "mediana", "media", "moda", "varianza", "distribucion",
+             "rango", "total", "boxplot", "pdf"]
+
+
+def normalizar(texto):
+    # Minúsculas y sin acentos: "Rango Intercuartílico" -> "rango intercuartilico"
+    sin_acentos = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in sin_acentos if not unicodedata.combining(c))
+
+
+def tokens(texto):
+    return re.findall(r"[a-z0-9]+", normalizar(texto))
+
+
+def _construir_indice():
+    indice = {}
+    for nombre, palabras in SINONIMOS.items():
+        for palabra in palabras:
+            indice[" ".join(tokens(palabra))] = PRIORIDAD.index(nombre)
+    return indice
+
+
+def _construir_plantillas():
+    # Encabezado + una línea "🟢 P1: 7.50" por parcial
+    plantillas = {}
+    for nombre, datos in COMPARACIONES.items():
+        formato = datos.get("formato", ".2f")
+        plantillas[nombre] = (datos["texto"], f"{{marca}} {{parcial}}: {{valor:{formato}}}\n",
+                              datos.get("marcas", MARCAS))
+    return plantillas
+
+
+# Se arman una vez: buscar cuesta lo mismo haya 12 o 100 intenciones
+INDICE = _construir_indice()
+PLANTILLAS = _construir_plantillas()
+
+
+def detectar_intencion(pregunta):
+    palabras = tokens(pregunta)
+    candidatos = palabras + [" ".join(par) for par in zip(palabras, palabras[1:])]
+    prioridades = [INDICE[c] for c in candidatos if c in INDICE]
+    return PRIORIDAD[min(prioridades)] if prioridades else None
+
+
+def _comparar(nombre, estadisticas_dict):
+    datos = COMPARACIONES[nombre]
+    if len(estadisticas_dict) < 2:
+        return "⚠️ No hay calificaciones de al menos dos parciales en este grupo para comparar."
+
+    medida = datos["medida"]
+    valores = {parcial: medida(estadisticas) if callable(medida) else estadisticas[medida]
+               for parcial, estadisticas in estadisticas_dict.items()}
+
+    texto, linea, marcas = PLANTILLAS[nombre]
+    respuesta = texto + "".join(linea.format(marca=marcas[i % len(marcas)], parcial=parcial, valor=valor)
+                                for i, (parcial, valor) in enumerate(valores.items()))
+
+    # Una conclusión por cada par de parciales consecutivos; con sólo dos
+    # parciales queda una sola línea, sin prefijo
+    subio, bajo, igual = datos["conclusiones"]
+    parciales = list(valores)
+    conclusiones = []
+    for desde, hasta in zip(parciales, parciales[1:]):
+        antes, despues = valores[desde], valores[hasta]
+        conclusion = subio if despues > antes else bajo if despues < antes else igual
+        prefijo = f"{desde} → {hasta}: " if len(parciales) > 2 else ""
+        conclusiones.append(prefijo + conclusion.format(desde=desde, hasta=hasta))
+    return respuesta + "\n".join(conclusiones)
+
+
+def _distribucion(rangos_dict):
+    # Una línea por parcial con el porcentaje de cada rango y el más frecuente
+    if not rangos_dict:
+        return SIN_DISTRIBUCION
+    lineas = []
+    for i, (parcial, rangos) in enumerate(rangos_dict.items()):
+        porcentajes = " · ".join(f"{etiqueta}: {porcentaje:.1f}%"
+                                 for etiqueta, porcentaje in zip(rangos["etiquetas"], rangos["porcentajes_pastel"]))
+        frecuente = rangos["etiquetas"][int(rangos["conteo"].argmax())]
+        lineas.append(f"{MARCAS[i % len(MARCAS)]} {parcial}: {porcentajes} (más frecuente: {frecuente})")
+    return TEXTO_DISTRIBUCION + "\n".join(lineas)
+
+
+def responder(pregunta, estadisticas_dict, rangos_dict=None):
+    # `rangos_dict`: {parcial: conteos por rango} de rangos.distribucion_rangos
+    # (o Analisis.rangos_de), el mismo que usan las gráficas
+    intencion = detectar_intencion(pregunta)
+    if intencion in COMPARACIONES:
+        return _comparar(intencion, estadisticas_dict)
+    if intencion == "distribucion":
+        return _distribucion(rangos_dict)
+    return RESPUESTAS_FIJAS.get(intencion, NO_ENTENDI)
@@ -0,0 +1,50 @@
+# Esquema compacto de la tabla de calificaciones: dimensiones como categorías,
+# calificaciones en float32 y matrícula en el entero más chico que alcance
+import numpy as np
+import pandas as pd
+
+# Columnas que se repiten miles de veces: se guardan como códigos + diccionario
+DIMENSIONES = ["Plantel", "Archivo", "Semestre", "Clave Carrera", "Carrera", "Grupo", "Asignatura"]
+COLUMNA_ALUMNO = "Número de control"
+
+# float32 guarda 7 cifras significativas: al redondear a 4 decimales se
+# recupera exactamente la calificación capturada (0.0–10.0 con hasta 4 decimales)
+DECIMALES_CALIFICACION = 4
+
+
+def columnas_calificacion(df):
+    # Parciales (P1, P2, ...) y cualquier otra columna numérica no dimensional
+    return [c for c in df.columns
+            if c not in DIMENSIONES and c != COLUMNA_ALUMNO and pd.api.types.is_numeric_dtype(df[c])]
+
+
+def uso_memoria(df):
+    # Bytes reales (deep=True cuenta también el texto de las columnas object/str)
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def normalizar_esquema(df):
+    # Idempotente: un DataFrame ya normalizado (p. ej. leído del Parquet) se
+    # devuelve con los mismos tipos
+    df = df.copy()
+    for columna in DIMENSIONES:
+        if columna in df.columns and not isinstance(df[columna].dtype, pd.CategoricalDtype):
+            df[columna] = df[columna].astype("category")
+
+    if COLUMNA_ALUMNO in df.columns:
+        alumno = df[COLUMNA_ALUMNO]
+        if pd.api.types.is_integer_dtype(alumno):
+            df[COLUMNA_ALUMNO] = pd.to_numeric(alumno, downcast="integer")
+        elif not isinstance(alumno.dtype, pd.CategoricalDtype):
+            # Matrículas alfanuméricas: cada texto distinto se guarda una sola vez
+            df[COLUMNA_ALUMNO] = alumno.astype("category")
+
+    for columna in columnas_calificacion(df):
+        df[columna] = df[columna].astype(np.float32)
+    return df
+
+
+def a_float64(valores):
+    # Para estadísticas: float32 -> float64 sin el ruido de la conversión
+    # (np.float32(7.2) es 7.1999998...; aquí vuelve a ser 7.2)
+    return np.round(np.asarray(valores, dtype=np.float64), DECIMALES_CALIFICACION)
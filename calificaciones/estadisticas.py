@@ -0,0 +1,178 @@
+# Motor de estadísticas: un solo groupby calcula todas las medidas de todos los grupos
+import re
+
+import numpy as np
+import pandas as pd
+
+from .esquema import a_float64
+from .filtros import NIVELES
+
+# Parciales del libro original; los libros nuevos pueden traer P3, P4... y final
+PARCIALES = ["P1", "P2"]
+
+PATRON_PARCIAL = re.compile(r"^P(\d+)$", re.IGNORECASE)
+NOMBRES_FINAL = {"final", "cf", "calificacion final", "calificación final", "promedio final"}
+
+# Calificación mínima aprobatoria con la que la página compara parciales
+APROBATORIA = 60
+
+# Mismas llaves que usa estadisticas_dict en la página, EduBot y el PDF
+MEDIDAS = ["media", "mediana", "moda", "varianza", "q1", "q2", "q3", "max", "min", "rango", "total"]
+
+# Cambios entre parciales que compara la página de ranking, en este orden
+MEDIDAS_RANKING = ["media", "mediana", "iqr", "varianza", "aprobados"]
+
+
+def detectar_parciales(df):
+    # Columnas de evaluación en orden cronológico: P1, P2, ..., P10 y al final
+    # la calificación final si existe
+    numerados = sorted((int(m.group(1)), columna) for columna in df.columns
+                       if (m := PATRON_PARCIAL.match(str(columna).strip())))
+    finales = [columna for columna in df.columns if str(columna).strip().lower() in NOMBRES_FINAL]
+    return [columna for _, columna in numerados] + finales
+
+
+def formato_largo(df, niveles=NIVELES, parciales=None):
+    # Una fila por (grupo, parcial, calificación), sin vacíos
+    parciales = detectar_parciales(df) if parciales is None else list(parciales)
+    largo = df.melt(id_vars=niveles, value_vars=parciales,
+                    var_name="parcial", value_name="calificacion")
+    largo = largo.dropna(subset=list(niveles) + ["calificacion"])
+    # Categoría ordenada: los groupby recorren los parciales en orden cronológico
+    # (con texto, "P10" quedaría antes que "P2")
+    largo["parcial"] = pd.Categorical(largo["parcial"], categories=parciales, ordered=True)
+    # Las calificaciones se guardan en float32; las medidas se calculan en float64
+    largo["calificacion"] = a_float64(largo["calificacion"])
+    return largo
+
+
+def calcular_cubo(df, niveles=NIVELES, parciales=None):
+    largo = formato_largo(df, niveles, parciales)
+    llaves = list(niveles) + ["parcial"]
+    grupos = largo.groupby(llaves, sort=True, observed=True)["calificacion"]
+
+    cubo = grupos.agg(media="mean", varianza="var", max="max", min="min", total="count")
+
+    # Los tres cuartiles en una sola llamada
+    cuartiles = grupos.quantile([0.25, 0.50, 0.75]).unstack()
+    cubo["q1"] = cuartiles[0.25]
+    cubo["q2"] = cuartiles[0.50]
+    cubo["q3"] = cuartiles[0.75]
+    cubo["mediana"] = cubo["q2"]
+    cubo["rango"] = cubo["max"] - cubo["min"]
+
+    # Moda vectorizada: frecuencia de cada calificación dentro de su grupo.
+    # Las frecuencias salen ordenadas por valor, así que idxmax se queda con la
+    # menor en caso de empate (igual que scipy.stats.mode)
+    frecuencias = largo.groupby(llaves + ["calificacion"], sort=True, observed=True).size()
+    posicion_moda = frecuencias.groupby(level=llaves, sort=True, observed=True).idxmax()
+    cubo["moda"] = [llave[-1] for llave in posicion_moda]
+
+    return cubo[MEDIDAS]
+
+
+def porcentaje_aprobados(valores, veces, minima=APROBATORIA):
+    # % de calificaciones >= minima, desde (calificaciones distintas, veces)
+    total = veces.sum()
+    return float(veces[valores >= minima].sum() / total * 100) if total > 0 else 0.0
+
+
+def interpolar_lineal(a, b, t):
+    # Misma interpolación que numpy/pandas en quantile(method="linear")
+    return np.where(t >= 0.5, b - (b - a) * (1 - t), a + (b - a) * t)
+
+
+def cubo_desde_conteos(conteos, niveles=NIVELES):
+    # Las mismas medidas que calcular_cubo, pero a partir de cuántas veces
+    # aparece cada calificación en cada (grupo, parcial). Con calificaciones en
+    # décimas hay a lo más ~100 valores distintos por grupo, así que esto no
+    # crece con el número de alumnos y los cuartiles siguen siendo exactos
+    llaves = list(niveles) + ["parcial"]
+    conteos = conteos.sort_values(llaves + ["calificacion"], ignore_index=True)
+    valores = conteos["calificacion"].to_numpy(dtype=np.float64)
+    veces = conteos["n"].to_numpy(dtype=np.float64)
+
+    # Posición de cada fila dentro de su grupo (las filas ya vienen ordenadas)
+    grupo = conteos.groupby(llaves, sort=False, observed=True).ngroup().to_numpy()
+    inicio = np.flatnonzero(np.r_[True, grupo[1:] != grupo[:-1]])
+    fin = np.r_[inicio[1:], len(grupo)] - 1
+
+    total = np.bincount(grupo, weights=veces)
+    media = np.bincount(grupo, weights=valores * veces) / total
+    desvios = np.bincount(grupo, weights=veces * (valores - media[grupo]) ** 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        varianza = np.where(total > 1, desvios / (total - 1), np.nan)
+
+    # Cuartiles: la k-ésima calificación ordenada del grupo es la primera cuyo
+    # conteo acumulado supera base + k
+    acumulado = np.cumsum(veces)
+    base = acumulado[inicio] - veces[inicio]
+    cuartiles = {}
+    for nombre, q in (("q1", 0.25), ("q2", 0.50), ("q3", 0.75)):
+        posicion = (total - 1) * q
+        abajo, arriba = np.floor(posicion), np.ceil(posicion)
+        valor_abajo = valores[np.searchsorted(acumulado, base + abajo, side="right")]
+        valor_arriba = valores[np.searchsorted(acumulado, base + arriba, side="right")]
+        cuartiles[nombre] = interpolar_lineal(valor_abajo, valor_arriba, posicion - abajo)
+
+    # Moda: la calificación con más repeticiones; en empate, la menor
+    maximo = np.maximum.reduceat(veces, inicio)
+    candidatas = np.where(veces == maximo[grupo], np.arange(len(veces)), len(veces))
+    moda = valores[np.minimum.reduceat(candidatas, inicio)]
+
+    cubo = pd.DataFrame({
+        "media": media,
+        "varianza": varianza,
+        "max": valores[fin],
+        "min": valores[inicio],
+        "total": total.astype(np.int64),
+        **cuartiles,
+        "moda": moda,
+    }, index=pd.MultiIndex.from_frame(conteos.loc[inicio, llaves]))
+    cubo["mediana"] = cubo["q2"]
+    cubo["rango"] = cubo["max"] - cubo["min"]
+    return cubo[MEDIDAS]
+
+
+def estadisticas_por_grupo(cubo):
+    # {(semestre, carrera, grupo, asignatura): {parcial: {medida: valor}}}
+    # para que la página sólo haga búsquedas en diccionarios
+    resultado = {}
+    for llave, medidas in cubo.to_dict("index").items():
+        resultado.setdefault(llave[:-1], {})[llave[-1]] = medidas
+    return resultado
+
+
+def calcular_tendencias(cubo):
+    # Cambio de cada medida respecto al parcial anterior del mismo grupo, para
+    # todos los grupos a la vez. Si un grupo no tiene calificaciones en un
+    # parcial se compara contra el último que sí tiene ("desde")
+    niveles = list(cubo.index.names[:-1])
+    # Sin niveles (todo el plantel) todos los parciales son de un mismo grupo
+    grupo = {"level": niveles} if niveles else {"by": np.zeros(len(cubo), dtype=np.int8)}
+    tendencias = cubo.groupby(**grupo, sort=False, observed=True).diff()
+    tendencias["iqr"] = tendencias["q3"] - tendencias["q1"]
+
+    parcial = pd.Series(cubo.index.get_level_values(-1).astype(str), index=cubo.index)
+    tendencias.insert(0, "desde", parcial.groupby(**grupo, sort=False, observed=True).shift())
+    return tendencias.dropna(subset=["desde"])
+
+
+def calcular_ranking(cubo, aprobados):
+    # Una fila por (grupo, asignatura) y par de parciales consecutivos con el
+    # cambio de cada medida de MEDIDAS_RANKING (aprobados en puntos
+    # porcentuales), todo en una pasada sobre el cubo. `aprobados`: % por
+    # (grupo, parcial), p. ej. Acumuladores.aprobados()
+    tendencias = calcular_tendencias(cubo.assign(aprobados=aprobados.reindex(cubo.index).to_numpy()))
+    ranking = tendencias[["desde"] + MEDIDAS_RANKING].reset_index()
+    ranking = ranking.rename(columns={ranking.columns[len(cubo.index.names) - 1]: "hasta"})
+    ranking["hasta"] = ranking["hasta"].astype(str)
+    return ranking
+
+
+def tendencias_por_grupo(tendencias):
+    # {(semestre, carrera, grupo, asignatura): [{"desde", "hasta", medida: delta}, ...]}
+    resultado = {}
+    for llave, deltas in tendencias.to_dict("index").items():
+        resultado.setdefault(llave[:-1], []).append({"hasta": llave[-1], **deltas})
+    return resultado
@@ -0,0 +1,56 @@
+# Índice jerárquico para los filtros Semestre → Carrera → Grupo → Asignatura
+import numpy as np
+
+NIVELES = ["Semestre", "Carrera", "Grupo", "Asignatura"]
+
+# Vistas de la página y los niveles que distinguen a cada una: por grupo y
+# asignatura (la de siempre), por Carrera, por Semestre y todo el plantel
+VISTAS = {
+    "Grupo": NIVELES,
+    "Carrera": ["Carrera"],
+    "Semestre": ["Semestre"],
+    "Plantel": [],
+}
+
+# Cómo se nombra un nivel resumido en encabezados y PDF
+TODOS = {"Semestre": "Todos", "Carrera": "Todas", "Grupo": "Todos", "Asignatura": "Todas"}
+
+
+def _como_tupla(llave):
+    return llave if isinstance(llave, tuple) else (llave,)
+
+
+class IndiceFiltros:
+    # Se construye una sola vez por versión de datos. Después, las opciones de
+    # cada selectbox y las filas de cualquier combinación salen de diccionarios
+    # (O(1)) en lugar de recorrer toda la tabla con máscaras booleanas.
+
+    def __init__(self, df, niveles=NIVELES):
+        self.df = df
+        self.niveles = list(niveles)
+        self._posiciones = {(): np.arange(len(df))}
+        self._hijos = {}
+
+        for profundidad in range(1, len(self.niveles) + 1):
+            grupos = df.groupby(self.niveles[:profundidad], sort=True, dropna=True, observed=True)
+            for llave, posiciones in grupos.indices.items():
+                llave = _como_tupla(llave)
+                self._posiciones[llave] = posiciones
+                self._hijos.setdefault(llave[:-1], []).append(llave[-1])
+
+        for padre, hijos in self._hijos.items():
+            self._hijos[padre] = sorted(hijos)
+
+    def opciones(self, *prefijo):
+        # Valores posibles del siguiente nivel dado lo ya seleccionado
+        return self._hijos.get(tuple(prefijo), [])
+
+    def posiciones(self, *claves):
+        return self._posiciones.get(tuple(claves), np.empty(0, dtype=np.intp))
+
+    def filas(self, *claves):
+        return self.df.take(self.posiciones(*claves))
+
+    def combinaciones(self):
+        # Todas las tuplas completas (semestre, carrera, grupo, asignatura)
+        return [llave for llave in self._posiciones if len(llave) == len(self.niveles)]
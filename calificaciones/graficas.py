@@ -0,0 +1,244 @@
+# Construcción de las gráficas (histograma, pasteles y boxplot) y caché de PNG
+import io
+
+import numpy as np
+
+from .cache import CacheLRU
+from .cajas import cajas_de_calificaciones
+from .estadisticas import detectar_parciales
+from .rangos import EJE_TENDENCIA, distribucion_rangos, rango_colores, rango_labels
+
+# Colores de fondo/texto por tema; hoy la app sólo usa el oscuro
+TEMAS = {
+    "oscuro": {"fondo": "#121212", "texto": "white"},
+}
+
+# Mismas opciones con las que st.pyplot guardaba las figuras
+OPCIONES_PNG = {"bbox_inches": "tight", "dpi": 200, "format": "png"}
+
+# Colores de cada parcial en el boxplot: rojo coral y verde menta para P1 y
+# P2, luego amarillo, azul, lila y salmón (se repiten si hay más parciales)
+PALETA_PARCIALES = ['#e63946', '#06d6a0', '#ffd166', '#118ab2', '#b388eb', '#f78c6b']
+
+# Paneles por fila en las gráficas de varios parciales (histograma)
+COLUMNAS_PANELES = 2
+
+# PNG ya renderizados: (versión, *grupo, parcial, tipo de gráfica, tema) -> bytes
+cache_figuras = CacheLRU(max_bytes=96 * 1024 * 1024)
+
+
+# Las figuras se crean con matplotlib.figure.Figure y no con pyplot: no quedan
+# registradas en el estado global, así que no hay nada que cerrar y se pueden
+# renderizar desde varios hilos (sesiones/exportaciones simultáneas).
+# matplotlib se importa dentro de cada función: la página pinta encabezado,
+# filtros y tablas antes de pagar esa importación
+
+
+def _nueva_figura(**opciones):
+    from matplotlib.figure import Figure
+
+    return Figure(**opciones)
+
+
+def figura_a_png(fig):
+    # Renderiza la figura a PNG en memoria y suelta sus artistas
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, **OPCIONES_PNG)
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+
+class RegistroFiguras:
+    # Gráficas de una sesión por nombre ("histograma", "pastel_P1", "boxplot"...),
+    # ya como PNG. Ninguna figura queda viva: el PDF lee de aquí y no del
+    # estado global de pyplot, que mezclaba figuras de otros reruns y sesiones
+
+    def __init__(self):
+        self._imagenes = {}
+
+    def __contains__(self, nombre):
+        return nombre in self._imagenes
+
+    def __len__(self):
+        return len(self._imagenes)
+
+    def registrar(self, nombre, png):
+        self._imagenes[nombre] = png
+        return png
+
+    def registrar_figura(self, nombre, fig):
+        return self.registrar(nombre, figura_a_png(fig))
+
+    def get(self, nombre, defecto=None):
+        return self._imagenes.get(nombre, defecto)
+
+    def nombres(self):
+        return list(self._imagenes)
+
+    def limpiar(self):
+        self._imagenes.clear()
+
+
+def figura_histograma(calificaciones_dict=None, tema="oscuro", rangos=None, parciales=None):
+    # `rangos` es distribucion_rangos(calificaciones_dict) si ya se calculó
+    # (la página y el PDF lo comparten con pasteles y leyendas); con `rangos`
+    # y `parciales` (un panel por cada uno) no hacen falta las calificaciones
+    if parciales is None:
+        parciales = list(calificaciones_dict)
+    if rangos is None:
+        rangos = distribucion_rangos(calificaciones_dict)
+
+    colores = TEMAS[tema]
+    # Un panel por parcial, COLUMNAS_PANELES por fila (con 2 parciales queda
+    # igual que antes: 14x6 en una sola fila)
+    columnas = min(len(parciales), COLUMNAS_PANELES) or 1
+    filas = -(-len(parciales) // columnas) or 1
+    fig = _nueva_figura(figsize=(7 * columnas, 6 * filas))
+    axes = fig.subplots(filas, columnas, squeeze=False).ravel()
+    fig.patch.set_facecolor(colores["fondo"])  # fondo oscuro
+    for ax in axes[len(parciales):]:
+        ax.axis('off')  # paneles sobrantes de la última fila
+
+    for idx, parcial in enumerate(parciales):
+        if parcial not in rangos:
+            axes[idx].set_title(f'{parcial} - Sin datos', color=colores["texto"])
+            axes[idx].axis('off')
+            continue
+
+        conteo, porcentajes = rangos[parcial]["conteo"], rangos[parcial]["porcentajes_histograma"]
+
+        axes[idx].set_facecolor(colores["fondo"])  # fondo oscuro subplot
+        #solo si es recta la linea 
+        #axes[idx].plot(x_vals, conteo, color='cyan', linewidth=2, marker='o', linestyle='-', label='Tendencia')
+        #comienza la linea curva
+        barras = axes[idx].bar(rango_labels, conteo, color=[rango_colores[label] for label in rango_labels])
+        # Spline cúbica ya evaluada (rangos.curvas_tendencia: base precalculada @ conteo)
+        x_new, conteo_smooth = EJE_TENDENCIA, rangos[parcial]["tendencia"]
+        # Dibujar la curva suave
+        # Capa inferior como "sombra"
+        axes[idx].plot(x_new, conteo_smooth, color='deepskyblue', linewidth=3)
+
+        # Capa superior real
+        axes[idx].plot(x_new, conteo_smooth, color="#7230c9", linewidth=3, label='tendencia')
+        #termina la de la curva xd 
+
+        # Porcentajes encima de cada barra
+        for bar, pct in zip(barras, porcentajes):
+            height = bar.get_height()
+            axes[idx].text(bar.get_x() + bar.get_width()/2, height + 0.3,
+                           f'{pct:.1f}%', ha='center', color=colores["texto"], fontsize=10, fontweight='bold')
+
+        axes[idx].set_title(f'Histograma {parcial}', color=colores["texto"], fontsize=16, fontweight='bold')
+        axes[idx].set_xlabel('Rango', color=colores["texto"], fontsize=12)
+        axes[idx].set_ylabel('Frecuencia', color=colores["texto"], fontsize=12)
+        axes[idx].tick_params(colors=colores["texto"])  # ticks blancos
+        #la esa barrita de tendencia xd 
+        axes[idx].legend(facecolor=colores["fondo"], edgecolor=colores["texto"], labelcolor=colores["texto"])
+
+    fig.tight_layout()
+    return fig
+
+
+def figura_pastel(conteo, parcial, tema="oscuro"):
+    # `conteo`: alumnos por rango, en el orden de rango_labels
+    colores_tema = TEMAS[tema]
+    valores = np.asarray(conteo)
+    colores = [rango_colores[label] for label in rango_labels]
+
+    fig = _nueva_figura(figsize=(6, 6), facecolor=colores_tema["fondo"])
+    ax = fig.subplots()
+    ax.set_facecolor(colores_tema["fondo"])
+
+    ax.pie(
+        valores,
+        labels=None,           # sin etiquetas
+        autopct=None,          # sin porcentaje
+        startangle=90,
+        colors=colores,
+        wedgeprops={'edgecolor': colores_tema["fondo"], 'linewidth': 1.5}
+    )
+
+    ax.set_title(f"Distribución - {parcial}", color=colores_tema["texto"], fontsize=15, fontweight='bold')
+    return fig
+
+
+def colores_parciales(n):
+    return [PALETA_PARCIALES[i % len(PALETA_PARCIALES)] for i in range(n)]
+
+
+def _desaturar(color, proporcion=0.75):
+    # Igual que seaborn: las cajas se rellenan con la paleta un poco apagada
+    import colorsys
+
+    from matplotlib.colors import to_rgb
+
+    tono, luz, saturacion = colorsys.rgb_to_hls(*to_rgb(color))
+    return colorsys.hls_to_rgb(tono, luz, saturacion * proporcion)
+
+
+def _gris_lineas(colores):
+    # Gris de bordes, bigotes y mediana: 60 % de la luminosidad del color más oscuro
+    import colorsys
+
+    from matplotlib.colors import to_rgb
+
+    luz = min(colorsys.rgb_to_hls(*to_rgb(color))[1] for color in colores) * 0.6
+    return (luz, luz, luz)
+
+
+def figura_boxplot(grupo_df=None, parciales=None, tema="oscuro", cajas=None):
+    # `cajas`: {parcial: caja} ya resumida (Analisis.cajas_de /
+    # cajas.cajas_de_calificaciones). Se dibujan los cinco números con bxp y
+    # una muestra acotada de puntos, así que el costo no depende de cuántos
+    # alumnos tenga el grupo. Sin `cajas` se resumen las filas de `grupo_df`
+    if cajas is None:
+        parciales = detectar_parciales(grupo_df) if parciales is None else list(parciales)
+        cajas = cajas_de_calificaciones({parcial: grupo_df[parcial] for parcial in parciales})
+    colores = TEMAS[tema]
+    paleta = colores_parciales(len(cajas))
+    gris = _gris_lineas(paleta)
+    fig = _nueva_figura(figsize=(7.5, 5.5), facecolor=colores["fondo"])
+    ax = fig.subplots()
+    fig.patch.set_facecolor(colores["fondo"])  # Fondo global oscuro
+
+    # --- BOXPLOT ---
+    lineas = {"color": gris, "linewidth": 2.2}
+    resumenes = [{"label": parcial, "q1": caja["q1"], "med": caja["mediana"], "q3": caja["q3"],
+                  "whislo": caja["bigote_inferior"], "whishi": caja["bigote_superior"]}
+                 for parcial, caja in cajas.items()]
+    patas = ax.bxp(resumenes, positions=range(len(cajas)), widths=0.4, showfliers=False, patch_artist=True,
+                   boxprops={"edgecolor": gris, "linewidth": 2.2}, whiskerprops=lineas, capprops=lineas,
+                   medianprops=lineas, capwidths=0.2)
+    for caja, color in zip(patas["boxes"], paleta):
+        caja.set_facecolor(_desaturar(color))
+
+    # --- STRIP PLOT: puntos ya muestreados y dispersos (ver cajas.puntos_strip) ---
+    for posicion, caja in enumerate(cajas.values()):
+        ax.scatter(posicion + caja["x"], caja["y"], s=36, color='white', alpha=0.5, linewidths=0, zorder=3)
+    ax.set_xlim(-0.5, len(cajas) - 0.5)
+
+    # --- Ejes y fondo ---
+    ax.set_facecolor(colores["fondo"])
+    ax.tick_params(colors=colores["texto"], labelsize=12)
+    ax.set_ylabel('Calificación', color='#f1f1f1', fontsize=13)
+    ax.set_xlabel('', color=colores["texto"])
+
+    # --- Borde blanco ---
+    for spine in ax.spines.values():
+        spine.set_color(colores["texto"])
+        spine.set_linewidth(1.3)
+
+    # --- Grid sutil en Y ---
+    ax.yaxis.grid(True, linestyle='--', linewidth=0.6, color='gray', alpha=0.3)
+    ax.set_axisbelow(True)
+    return fig
+
+
+def grafica_png(grupo, parcial, tipo, construir, tema="oscuro"):
+    # `grupo` es (versión de los datos, *clave): no se sirven imágenes de un
+    # Excel anterior y conservar_versiones las libera; `construir` sólo se
+    # llama si no hay copia
+    llave = (*grupo, parcial, tipo, tema)
+    return cache_figuras.obtener(llave, lambda: figura_a_png(construir()))
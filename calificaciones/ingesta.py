@@ -0,0 +1,349 @@
+# Ingesta de varios libros (uno o más por plantel) a un dataset Parquet
+# particionado por plantel, con manifiesto para re-ingestas incrementales.
+#
+#   python -m calificaciones.ingesta carpeta_con_excels --procesos 4
+#
+# Estructura en disco (dentro de `carpeta/.dataset_calificaciones`):
+#   manifiesto.json                  archivo -> firma, sha256, partes, memoria
+#   Plantel=Xonacatlán/<sha>.parquet  filas de ese libro para ese plantel
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .esquema import normalizar_esquema, uso_memoria
+from .estadisticas import detectar_parciales
+from .lectura import FILAS_POR_LOTE, leer_por_lotes
+
+CARPETA_DATASET = ".dataset_calificaciones"
+COLUMNA_PLANTEL = "Plantel"
+COLUMNA_ARCHIVO = "Archivo"
+
+# Libros de este tamaño o más se leen por lotes (memoria acotada) en lugar de
+# con pd.read_excel
+UMBRAL_POR_LOTES = 32 * 1024 * 1024
+
+# "Calificaciones 1 y 2 parcial Plantel Xonacatlán.xlsx" -> "Xonacatlán"
+PATRON_PLANTEL = re.compile(r"plantel\s+(.+)$", re.IGNORECASE)
+
+# Datasets ya leídos: (destino, planteles, archivos) -> (version, DataFrame)
+_memoria = {}
+_candado = threading.Lock()
+
+
+def firma_archivo(ruta):
+    # mtime + tamaño: es barato y se revisa en cada rerun
+    info = os.stat(ruta)
+    return info.st_mtime_ns, info.st_size
+
+
+def hash_archivo(ruta, bloque=1 << 20):
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for trozo in iter(lambda: f.read(bloque), b""):
+            h.update(trozo)
+    return h.hexdigest()
+
+
+def plantel_de_archivo(ruta):
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    coincidencia = PATRON_PLANTEL.search(nombre)
+    return (coincidencia.group(1) if coincidencia else nombre).strip()
+
+
+def _carpeta_particion(plantel):
+    # Estilo Hive ("Plantel=Xonacatlán"), sin caracteres inválidos en rutas
+    seguro = re.sub(r'[\\/:*?"<>|]+', "_", str(plantel))
+    return f"{COLUMNA_PLANTEL}={seguro}"
+
+
+def libros_en(carpeta):
+    # Ignora los archivos de bloqueo que deja Excel abierto ("~$...xlsx")
+    return sorted(ruta for ruta in glob.glob(os.path.join(carpeta, "*.xlsx"))
+                  if not os.path.basename(ruta).startswith("~$"))
+
+
+def _leer_manifiesto(destino):
+    try:
+        with open(os.path.join(destino, "manifiesto.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _guardar_manifiesto(destino, manifiesto):
+    temporal = os.path.join(destino, f"manifiesto.json.{os.getpid()}.tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=1)
+    os.replace(temporal, os.path.join(destino, "manifiesto.json"))
+
+
+def _etiquetar(df, ruta):
+    if COLUMNA_PLANTEL not in df.columns:
+        df[COLUMNA_PLANTEL] = plantel_de_archivo(ruta)
+    df[COLUMNA_ARCHIVO] = os.path.basename(ruta)
+    return df
+
+
+def _ruta_parte(destino, plantel, sha):
+    relativa = os.path.join(_carpeta_particion(plantel), f"{sha}.parquet")
+    os.makedirs(os.path.dirname(os.path.join(destino, relativa)), exist_ok=True)
+    return relativa
+
+
+def _procesar_libro(ruta, sha, destino):
+    # Corre en un proceso hijo: lee el Excel, etiqueta cada fila con plantel y
+    # archivo de origen y escribe una parte por plantel. Sólo regresa metadatos
+    # (los DataFrames no viajan de vuelta al proceso principal)
+    if os.path.getsize(ruta) >= UMBRAL_POR_LOTES:
+        return _procesar_libro_por_lotes(ruta, sha, destino)
+
+    crudo = _etiquetar(pd.read_excel(ruta), ruta)
+    df = normalizar_esquema(crudo)
+
+    partes = []
+    for plantel, filas in df.groupby(COLUMNA_PLANTEL, observed=True, sort=True):
+        relativa = _ruta_parte(destino, plantel, sha)
+        ruta_parte = os.path.join(destino, relativa)
+        temporal = f"{ruta_parte}.{os.getpid()}.tmp"
+        filas.to_parquet(temporal, index=False)
+        os.replace(temporal, ruta_parte)  # escritura atómica
+        partes.append({"plantel": str(plantel), "ruta": relativa, "filas": len(filas)})
+    return {"sha256": sha, "partes": partes,
+            "memoria": {"antes": uso_memoria(crudo), "despues": uso_memoria(df)}}
+
+
+def _plano(lote):
+    # Las categorías de cada lote son distintas; en Parquet las dimensiones
+    # van como texto/entero simple y normalizar_esquema las vuelve categorías
+    # al leer
+    plano = lote.copy()
+    for columna in plano.columns:
+        if isinstance(plano[columna].dtype, pd.CategoricalDtype):
+            plano[columna] = plano[columna].astype(object).where(plano[columna].notna(), None)
+    return plano
+
+
+def _esquema_arrow(plano):
+    import pyarrow as pa
+
+    esquema = pa.Schema.from_pandas(plano, preserve_index=False)
+    # Columnas sin ningún valor en el primer lote: float32 si son
+    # calificaciones, texto si no
+    parciales = detectar_parciales(plano)
+    for i, campo in enumerate(esquema):
+        if pa.types.is_null(campo.type):
+            tipo = pa.float32() if campo.name in parciales else pa.string()
+            esquema = esquema.set(i, pa.field(campo.name, tipo))
+    return esquema
+
+
+def _procesar_libro_por_lotes(ruta, sha, destino, filas_por_lote=FILAS_POR_LOTE):
+    # Igual que _procesar_libro, pero lote por lote: cada lote se reparte entre
+    # los escritores Parquet de sus planteles y se descarta
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    escritores, temporales, partes = {}, {}, {}
+    # "antes" aproxima lo que ocuparía la tabla con dimensiones como texto
+    memoria = {"antes": 0, "despues": 0}
+    esquema = None
+    try:
+        for lote in leer_por_lotes(ruta, filas_por_lote):
+            lote = normalizar_esquema(_etiquetar(lote, ruta))
+            plano = _plano(lote)
+            memoria["antes"] += uso_memoria(plano)
+            memoria["despues"] += uso_memoria(lote)
+            esquema = esquema or _esquema_arrow(plano)
+            for plantel, filas in plano.groupby(COLUMNA_PLANTEL, sort=True):
+                plantel = str(plantel)
+                if plantel not in escritores:
+                    relativa = _ruta_parte(destino, plantel, sha)
+                    temporales[plantel] = f"{os.path.join(destino, relativa)}.{os.getpid()}.tmp"
+                    escritores[plantel] = pq.ParquetWriter(temporales[plantel], esquema)
+                    partes[plantel] = {"plantel": plantel, "ruta": relativa, "filas": 0}
+                escritores[plantel].write_table(pa.Table.from_pandas(filas, schema=esquema, preserve_index=False))
+                partes[plantel]["filas"] += len(filas)
+    finally:
+        for escritor in escritores.values():
+            escritor.close()
+
+    for plantel, parte in partes.items():
+        os.replace(temporales[plantel], os.path.join(destino, parte["ruta"]))  # escritura atómica
+    return {"sha256": sha, "partes": [partes[p] for p in sorted(partes)], "memoria": memoria}
+
+
+def _borrar_partes(destino, registro, manifiesto, conservar=()):
+    # No borra partes que otro libro con el mismo contenido (mismo sha256) usa
+    en_uso = {parte["ruta"] for otro in manifiesto.values() if otro is not registro
+              for parte in otro["partes"]}
+    for parte in registro.get("partes", []):
+        if parte["ruta"] in en_uso or parte["ruta"] in conservar:
+            continue
+        try:
+            os.remove(os.path.join(destino, parte["ruta"]))
+        except FileNotFoundError:
+            pass
+
+
+def ingerir(carpeta, destino=None, procesos=None, progreso=None, libros=None):
+    # Sólo se parsean los libros nuevos o cuyo contenido cambió: si mtime y
+    # tamaño coinciden con el manifiesto no se lee nada; si cambiaron pero el
+    # sha256 es el mismo (un "touch") sólo se actualiza la firma. Con `libros`
+    # (rutas dentro de `carpeta`) sólo se revisan esos; los demás quedan como
+    # estén en el manifiesto.
+    # Devuelve {"nuevos", "actualizados", "sin_cambios", "eliminados", "manifiesto", "destino"}
+    destino = destino or os.path.join(carpeta, CARPETA_DATASET)
+    with _candado:
+        os.makedirs(destino, exist_ok=True)
+        manifiesto = _leer_manifiesto(destino)
+        resumen = {"nuevos": [], "actualizados": [], "sin_cambios": [], "eliminados": []}
+        modificado = False
+
+        pendientes = []
+        presentes = libros_en(carpeta)
+        for ruta in presentes if libros is None else libros:
+            nombre = os.path.basename(ruta)
+            firma = firma_archivo(ruta)
+            registro = manifiesto.get(nombre)
+            if registro and (registro["mtime_ns"], registro["tamano"]) == firma:
+                resumen["sin_cambios"].append(nombre)
+                continue
+            sha = hash_archivo(ruta)
+            if registro and registro["sha256"] == sha:
+                registro["mtime_ns"], registro["tamano"] = firma
+                resumen["sin_cambios"].append(nombre)
+                modificado = True
+                continue
+            pendientes.append((ruta, nombre, firma, sha))
+
+        def registrar(nombre, firma, resultado):
+            anterior = manifiesto.get(nombre)
+            if anterior:
+                _borrar_partes(destino, anterior, manifiesto, {p["ruta"] for p in resultado["partes"]})
+            resumen["actualizados" if anterior else "nuevos"].append(nombre)
+            manifiesto[nombre] = {"mtime_ns": firma[0], "tamano": firma[1], **resultado}
+            if progreso:
+                progreso(len(resumen["nuevos"]) + len(resumen["actualizados"]), len(pendientes), nombre)
+
+        if len(pendientes) > 1 and procesos != 1:
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                futuros = {ejecutor.submit(_procesar_libro, ruta, sha, destino): (nombre, firma)
+                           for ruta, nombre, firma, sha in pendientes}
+                for futuro in as_completed(futuros):
+                    registrar(*futuros[futuro], futuro.result())
+        else:
+            # Un solo libro: no vale la pena levantar procesos
+            for ruta, nombre, firma, sha in pendientes:
+                registrar(nombre, firma, _procesar_libro(ruta, sha, destino))
+
+        presentes = {os.path.basename(ruta) for ruta in presentes}
+        for nombre in [n for n in manifiesto if n not in presentes]:
+            _borrar_partes(destino, manifiesto[nombre], manifiesto)
+            del manifiesto[nombre]
+            resumen["eliminados"].append(nombre)
+
+        if modificado or pendientes or resumen["eliminados"]:
+            _guardar_manifiesto(destino, manifiesto)
+        resumen["manifiesto"] = manifiesto
+        resumen["destino"] = destino
+        return resumen
+
+
+def planteles_disponibles(manifiesto):
+    return sorted({parte["plantel"] for registro in manifiesto.values() for parte in registro["partes"]})
+
+
+def _partes_de(manifiesto, planteles=None, archivos=None):
+    return sorted((registro["sha256"], parte["ruta"])
+                  for nombre, registro in manifiesto.items() if archivos is None or nombre in archivos
+                  for parte in registro["partes"]
+                  if planteles is None or parte["plantel"] in planteles)
+
+
+def version_planteles(manifiesto, planteles=None, archivos=None):
+    # Hash de los sha256 de las partes leídas: cambia sólo si cambia algún
+    # libro de esos planteles (sirve como llave de los demás cachés)
+    h = hashlib.sha256()
+    for sha, ruta in _partes_de(manifiesto, planteles, archivos):
+        h.update(f"{sha}:{ruta}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def versiones_vigentes(manifiesto):
+    # La versión de cada plantel tal como la calcula cargar_planteles([plantel]);
+    # lo que esté en caché con otra versión ya no corresponde a ningún Excel
+    return {version_planteles(manifiesto, (plantel,)) for plantel in planteles_disponibles(manifiesto)}
+
+
+def memoria_planteles(manifiesto, planteles=None):
+    # {"antes": bytes de los Excel crudos, "despues": bytes ya compactados}
+    memoria = {"antes": 0, "despues": 0}
+    for registro in manifiesto.values():
+        if planteles is None or any(p["plantel"] in planteles for p in registro["partes"]):
+            for llave in memoria:
+                memoria[llave] += registro["memoria"][llave]
+    return memoria
+
+
+def cargar_planteles(destino, manifiesto, planteles=None):
+    # Lee sólo las particiones de los planteles pedidos (None = todos).
+    # Devuelve (version, DataFrame); la copia en memoria se reutiliza mientras
+    # no cambie la versión
+    planteles = None if planteles is None else tuple(sorted(planteles))
+    return _cargar_partes(destino, manifiesto, planteles=planteles)
+
+
+def cargar_archivos(destino, manifiesto, archivos):
+    # Igual, pero sólo las filas de los libros pedidos (nombres de archivo
+    # como en el manifiesto); lo usan la CLI y los lotes (ver carga.py)
+    return _cargar_partes(destino, manifiesto, archivos=tuple(sorted(archivos)))
+
+
+def _cargar_partes(destino, manifiesto, planteles=None, archivos=None):
+    version = version_planteles(manifiesto, planteles, archivos)
+    llave = (os.path.abspath(destino), planteles, archivos)
+
+    en_memoria = _memoria.get(llave)
+    if en_memoria and en_memoria[0] == version:
+        return en_memoria
+
+    with _candado:
+        en_memoria = _memoria.get(llave)
+        if en_memoria and en_memoria[0] == version:
+            return en_memoria
+        partes = [pd.read_parquet(os.path.join(destino, ruta))
+                  for _, ruta in _partes_de(manifiesto, planteles, archivos)]
+        # Al concatenar libros con categorías distintas pandas regresa a texto:
+        # se vuelve a compactar el resultado
+        df = normalizar_esquema(pd.concat(partes, ignore_index=True)) if partes else pd.DataFrame()
+        _memoria[llave] = (version, df)
+        return _memoria[llave]
+
+
+def _imprimir_progreso(hechos, total, nombre):
+    print(f"[{hechos}/{total}] {nombre}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingresa los libros de calificaciones de una carpeta al dataset por plantel")
+    parser.add_argument("carpeta", help="Carpeta con los libros (.xlsx)")
+    parser.add_argument("--destino", default=None, help=f"Carpeta del dataset (por defecto, carpeta/{CARPETA_DATASET})")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos a usar (por defecto, todos los núcleos)")
+    args = parser.parse_args(argv)
+
+    resumen = ingerir(args.carpeta, args.destino, procesos=args.procesos, progreso=_imprimir_progreso)
+    for estado in ("nuevos", "actualizados", "sin_cambios", "eliminados"):
+        print(f"{estado}: {len(resumen[estado])}", file=sys.stderr)
+    print(f"✅ Planteles: {', '.join(planteles_disponibles(resumen['manifiesto']))}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
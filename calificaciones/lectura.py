@@ -0,0 +1,51 @@
+# Lectura por lotes de libros grandes. openpyxl en modo read_only recorre el
+# XML de la hoja fila por fila: la memoria depende del tamaño del lote y no
+# del tamaño del archivo (pd.read_excel arma toda la tabla de una vez)
+import pandas as pd
+
+from .esquema import normalizar_esquema
+from .estadisticas import detectar_parciales
+
+FILAS_POR_LOTE = 50_000
+
+
+def _a_tabla(filas, columnas):
+    # Filas crudas -> DataFrame con el esquema compacto. Las columnas de
+    # parciales se fuerzan a número: un lote con sólo celdas vacías en P3
+    # llegaría como object
+    lote = pd.DataFrame.from_records(filas, columns=columnas)
+    for parcial in detectar_parciales(lote):
+        lote[parcial] = pd.to_numeric(lote[parcial], errors="coerce")
+    return normalizar_esquema(lote)
+
+
+def leer_por_lotes(ruta, filas_por_lote=FILAS_POR_LOTE, hoja=None):
+    # Genera DataFrames de hasta `filas_por_lote` filas con el mismo esquema
+    # que cargar_calificaciones (categorías, float32). La primera fila de la
+    # hoja es el encabezado; las filas totalmente vacías se saltan
+    from openpyxl import load_workbook
+
+    libro = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        hoja = libro[hoja] if hoja else libro.worksheets[0]
+        filas = hoja.iter_rows(values_only=True)
+        encabezado = next(filas, None)
+        if encabezado is None:
+            return
+        columnas = [f"Unnamed: {i}" if c is None else str(c) for i, c in enumerate(encabezado)]
+        ancho = len(columnas)
+
+        lote = []
+        for fila in filas:
+            if all(valor is None for valor in fila):
+                continue
+            # read_only no garantiza que todas las filas traigan todas las celdas
+            lote.append(fila[:ancho] + (None,) * (ancho - len(fila)))
+            if len(lote) == filas_por_lote:
+                yield _a_tabla(lote, columnas)
+                lote = []
+        if lote:
+            yield _a_tabla(lote, columnas)
+    finally:
+        libro.close()
+
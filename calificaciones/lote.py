@@ -0,0 +1,77 @@
+# Generación por lotes: un PDF por cada (Semestre, Carrera, Grupo, Asignatura),
+# repartidos entre todos los núcleos con un ProcessPoolExecutor.
+#
+#   python -m calificaciones.lote "Calificaciones 1 y 2 parcial Plantel Xonacatlán.xlsx" --salida reportes.zip
+import argparse
+import os
+import re
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .api import Analisis
+from .carga import cargar_calificaciones
+from .reporte import generar_reporte_grupo
+
+
+def _trabajo(clave, grupo_df, estadisticas_dict):
+    # Corre en un proceso hijo; devuelve la clave para saber a qué grupo pertenece
+    return clave, generar_reporte_grupo(clave, grupo_df, estadisticas_dict)
+
+
+def nombre_reporte(clave):
+    semestre, carrera, grupo, asignatura = clave
+    nombre = f"S{semestre}_{carrera}_{grupo}_{asignatura}"
+    return re.sub(r"[^\w.-]+", "_", nombre).strip("_") + ".pdf"
+
+
+def _imprimir_progreso(hechos, total, clave):
+    print(f"[{hechos}/{total}] {nombre_reporte(clave)}", file=sys.stderr)
+
+
+def generar_lote(df, salida, procesos=None, progreso=_imprimir_progreso):
+    # `salida` puede ser un .zip o una carpeta. Devuelve cuántos PDF se escribieron
+    analisis = Analisis(df)
+    claves = analisis.combinaciones()
+    total = len(claves)
+
+    if salida.lower().endswith(".zip"):
+        destino = zipfile.ZipFile(salida, "w", compression=zipfile.ZIP_DEFLATED)
+        escribir = destino.writestr
+    else:
+        os.makedirs(salida, exist_ok=True)
+        destino = None
+
+        def escribir(nombre, datos):
+            with open(os.path.join(salida, nombre), "wb") as f:
+                f.write(datos)
+
+    try:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            pendientes = [ejecutor.submit(_trabajo, clave, analisis.filas(clave),
+                                          analisis.estadisticas_de(clave))
+                          for clave in claves]
+            for hechos, futuro in enumerate(as_completed(pendientes), start=1):
+                clave, pdf_bytes = futuro.result()
+                escribir(nombre_reporte(clave), pdf_bytes)
+                if progreso:
+                    progreso(hechos, total, clave)
+    finally:
+        if destino is not None:
+            destino.close()
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera el reporte PDF de todos los grupos")
+    parser.add_argument("excel", help="Libro de calificaciones (.xlsx)")
+    parser.add_argument("--salida", default="reportes.zip", help="Archivo .zip o carpeta de salida")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos a usar (por defecto, todos los núcleos)")
+    args = parser.parse_args(argv)
+
+    total = generar_lote(cargar_calificaciones(args.excel), args.salida, procesos=args.procesos)
+    print(f"✅ {total} reportes en {args.salida}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Tiempos por etapa de cada rerun, guardados en un buffer circular del proceso
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class MedicionRerun:
+    # Tiempos (ms) de las etapas de un solo rerun
+
+    def __init__(self, cronometro):
+        self.cronometro = cronometro
+        self.inicio = time.time()
+        self.etapas = {}
+
+    @contextmanager
+    def etapa(self, nombre):
+        comienzo = time.perf_counter()
+        try:
+            yield
+        finally:
+            transcurrido = (time.perf_counter() - comienzo) * 1000
+            self.etapas[nombre] = self.etapas.get(nombre, 0.0) + transcurrido
+
+    def terminar(self):
+        self.cronometro.agregar(self)
+
+
+class Cronometro:
+    # Guarda los últimos `capacidad` reruns (de todas las sesiones) para sacar
+    # p50/p95 por etapa; los más viejos se descartan solos
+
+    def __init__(self, capacidad=500):
+        self._reruns = deque(maxlen=capacidad)
+        self._candado = threading.Lock()
+
+    def __len__(self):
+        return len(self._reruns)
+
+    def iniciar(self):
+        return MedicionRerun(self)
+
+    def agregar(self, medicion):
+        registro = {"inicio": medicion.inicio, "etapas": dict(medicion.etapas)}
+        with self._candado:
+            self._reruns.append(registro)
+
+    def reruns(self):
+        with self._candado:
+            return list(self._reruns)
+
+    def resumen(self):
+        # {etapa: {"n", "p50_ms", "p95_ms"}} con las etapas en el orden en que aparecieron
+        por_etapa = {}
+        for registro in self.reruns():
+            for nombre, ms in registro["etapas"].items():
+                por_etapa.setdefault(nombre, []).append(ms)
+        return {
+            nombre: {
+                "n": len(tiempos),
+                "p50_ms": float(np.percentile(tiempos, 50)),
+                "p95_ms": float(np.percentile(tiempos, 95)),
+            }
+            for nombre, tiempos in por_etapa.items()
+        }
+
+    def a_jsonl(self):
+        return "".join(json.dumps(registro, ensure_ascii=False) + "\n" for registro in self.reruns())
+
+    def limpiar(self):
+        with self._candado:
+            self._reruns.clear()
+
+
+# Compartido por todas las sesiones de Streamlit del proceso
+cronometro = Cronometro()
@@ -0,0 +1,40 @@
+import importlib
+import threading
+
+# Módulos pesados que la página usa después del primer pintado: las gráficas
+# (matplotlib) y el PDF (fpdf, PIL). Importarlos en un hilo
+# mientras se cargan el Excel y los filtros adelanta ese costo sin bloquear
+MODULOS_PESADOS = [
+    "matplotlib.figure",
+    "matplotlib.backends.backend_agg",
+    "fpdf",
+    "PIL.Image",
+]
+
+_candado = threading.Lock()
+_hilo = None
+
+
+def _importar(modulos):
+    for modulo in modulos:
+        try:
+            importlib.import_module(modulo)
+        except ImportError:
+            # Si falta una dependencia opcional, el error real saldrá al usarla
+            pass
+
+
+def precalentar(modulos=None):
+    # Sólo un hilo por proceso: Streamlit vuelve a ejecutar la página en cada
+    # interacción y las importaciones ya hechas quedan en sys.modules
+    global _hilo
+    with _candado:
+        if _hilo is None:
+            _hilo = threading.Thread(
+                target=_importar,
+                args=(list(modulos or MODULOS_PESADOS),),
+                name="precarga-modulos",
+                daemon=True,
+            )
+            _hilo.start()
+        return _hilo
@@ -0,0 +1,119 @@
+# Rangos de calificación que comparten las gráficas, las tablas y el PDF
+from functools import lru_cache
+
+import numpy as np
+
+# Colores para rangos (tonos suaves y agradables)
+rango_colores = {
+    '5-6': '#e74c3c',    # rojo suave (✅ excelente para calificaciones bajas)
+    '6-7': '#e67e22',    # naranja quemado (✅ buen intermedio)
+    '7-8': '#f1c40f',    # amarillo mostaza (🟡 un poco brillante, pero aceptable)
+    '8-9': "#58a8d6",   # verde jade suave (más natural)
+    '9-10': "#09ff6fcf"   # verde profesional profundo
+}
+
+
+rango_bins = [5, 6, 7, 8, 9, 10.1]
+rango_labels = ['5-6', '6-7', '7-8', '8-9', '9-10']
+
+# Puntos de la curva de tendencia del histograma, sobre las posiciones 0..4
+# de las barras
+PUNTOS_TENDENCIA = 300
+EJE_TENDENCIA = np.linspace(0, len(rango_labels) - 1, PUNTOS_TENDENCIA)
+
+
+def indices_rango(valores):
+    # Rango de cada calificación con una sola búsqueda binaria; -1 si queda
+    # fuera de rango_bins. Como np.histogram, el último rango incluye su tope
+    valores = np.asarray(valores, dtype=np.float64)
+    rango = np.searchsorted(rango_bins, valores, side="right") - 1
+    rango[valores == rango_bins[-1]] = len(rango_labels) - 1
+    rango[(rango < 0) | (rango >= len(rango_labels))] = -1
+    return rango
+
+
+def matriz_rangos(grupos, valores, n_grupos=None):
+    # Conteo por (grupo, rango) de todos los grupos en un solo bincount.
+    # `grupos` es el número de grupo (0..n-1) de cada calificación
+    grupos = np.asarray(grupos)
+    n_grupos = int(grupos.max()) + 1 if n_grupos is None else n_grupos
+    rango = indices_rango(valores)
+    dentro = rango >= 0
+    conteo = np.bincount(grupos[dentro] * len(rango_labels) + rango[dentro],
+                         minlength=n_grupos * len(rango_labels))
+    return conteo.reshape(n_grupos, len(rango_labels))
+
+
+@lru_cache(maxsize=None)
+def base_tendencia(puntos=PUNTOS_TENDENCIA):
+    # Matriz (puntos × rangos) de la spline cúbica "not-a-knot" que pasa por
+    # los conteos (la misma curva que make_interp_spline(x, conteo, k=3)).
+    # La spline es lineal en los conteos: su columna j es la curva de un
+    # histograma con 1 en el rango j y 0 en los demás, así que cualquier curva
+    # es base @ conteo. Se arma una vez con numpy (sin scipy)
+    nodos = np.arange(len(rango_labels), dtype=np.float64)
+    n, tramos = len(nodos), len(nodos) - 1
+    # Incógnitas: coeficientes (1, t, t², t³) de cada tramo, con t = x - nodo
+    ecuaciones = np.zeros((4 * tramos, 4 * tramos))
+    valores = np.zeros((4 * tramos, n))
+    fila = 0
+    for i in range(tramos):
+        h, c = nodos[i + 1] - nodos[i], 4 * i
+        ecuaciones[fila, c], valores[fila, i] = 1, 1                      # pasa por el nodo i
+        ecuaciones[fila + 1, c:c + 4], valores[fila + 1, i + 1] = [1, h, h**2, h**3], 1   # y por el i+1
+        fila += 2
+    for i in range(tramos - 1):
+        h, c, siguiente = nodos[i + 1] - nodos[i], 4 * i, 4 * (i + 1)
+        ecuaciones[fila, c:c + 4], ecuaciones[fila, siguiente + 1] = [0, 1, 2 * h, 3 * h**2], -1   # 1a derivada
+        ecuaciones[fila + 1, c:c + 4], ecuaciones[fila + 1, siguiente + 2] = [0, 0, 2, 6 * h], -2  # 2a derivada
+        fila += 2
+    # not-a-knot: tercera derivada continua en el segundo y el penúltimo nodo
+    ecuaciones[fila, [3, 7]] = [6, -6]
+    ecuaciones[fila + 1, [4 * (tramos - 2) + 3, 4 * (tramos - 1) + 3]] = [6, -6]
+    coeficientes = np.linalg.solve(ecuaciones, valores).reshape(tramos, 4, n)
+
+    x = np.linspace(nodos[0], nodos[-1], puntos)
+    tramo = np.clip(np.searchsorted(nodos, x, side="right") - 1, 0, tramos - 1)
+    t = x - nodos[tramo]
+    potencias = np.stack([np.ones_like(t), t, t**2, t**3], axis=1)
+    base = np.einsum("pk,pkn->pn", potencias, coeficientes[tramo])
+    base.flags.writeable = False
+    return base
+
+
+def curvas_tendencia(conteos):
+    # (grupos × rangos) -> (grupos × PUNTOS_TENDENCIA) en un solo producto de
+    # matrices; un vector de conteos da una sola curva
+    return np.asarray(conteos, dtype=np.float64) @ base_tendencia().T
+
+
+def resumen_rangos(conteo, total, tendencia=None):
+    # Lo que necesitan todas las vistas a partir del conteo por rango:
+    # el histograma (porcentaje de todas las calificaciones del parcial y la
+    # curva de tendencia) y los pasteles/leyenda del PDF (porcentaje entre
+    # los rangos). `tendencia` se pasa si ya se calculó junto con otras curvas
+    conteo = np.asarray(conteo)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "conteo": conteo,
+            "total": int(total),
+            "etiquetas": list(rango_labels),
+            "colores": [rango_colores[label] for label in rango_labels],
+            "porcentajes_histograma": conteo / total * 100,
+            "porcentajes_pastel": conteo / conteo.sum() * 100,
+            "tendencia": curvas_tendencia(conteo) if tendencia is None else tendencia,
+        }
+
+
+def distribucion_rangos(calificaciones_dict):
+    # {parcial: resumen_rangos(...)} de todos los parciales en una pasada; los
+    # parciales sin calificaciones no aparecen
+    parciales = [parcial for parcial, calificaciones in calificaciones_dict.items() if len(calificaciones)]
+    if not parciales:
+        return {}
+    tamanos = [len(calificaciones_dict[parcial]) for parcial in parciales]
+    valores = np.concatenate([np.asarray(calificaciones_dict[parcial], dtype=np.float64) for parcial in parciales])
+    matriz = matriz_rangos(np.repeat(np.arange(len(parciales)), tamanos), valores, len(parciales))
+    curvas = curvas_tendencia(matriz)
+    return {parcial: resumen_rangos(fila, total, curva)
+            for parcial, fila, total, curva in zip(parciales, matriz, tamanos, curvas)}
@@ -0,0 +1,193 @@
+# Reporte PDF de un grupo, generado completamente en memoria
+import io
+import re
+
+from fpdf import FPDF        # Generar documentos PDF desde Python, agregar texto e imágenes
+from PIL import Image        # Biblioteca Pillow para abrir y manejar imágenes (dimensiones, formatos)
+
+from .cajas import cajas_de_calificaciones
+from .estadisticas import detectar_parciales
+from .graficas import RegistroFiguras, figura_boxplot, figura_histograma, figura_pastel
+from .rangos import distribucion_rangos
+
+
+# Función para quitar emojis (¡clave para evitar errores!)
+def quitar_emojis(texto):
+    emoji_pattern = re.compile("["
+        u"\U0001F600-\U0001F64F"  # emoticonos
+        u"\U0001F300-\U0001F5FF"  # símbolos y pictogramas
+        u"\U0001F680-\U0001F6FF"  # transporte y mapas
+        u"\U0001F1E0-\U0001F1FF"  # banderas
+        u"\U00002700-\U000027BF"
+        u"\U0001F900-\U0001F9FF"
+        u"\U0001FA70-\U0001FAFF"
+        "]+", flags=re.UNICODE)
+    return emoji_pattern.sub(r'', texto)
+
+#--------------Creación del PDF sin errores de emoji----------------
+def generar_pdf(estadisticas_dict, carrera, grupo, asignatura, semestre,
+                registro_figuras, colores_pies=None, etiquetas_pies=None, porcentajes_pies=None):
+
+    pdf = FPDF(orientation='P', unit='mm', format='A4')
+    
+    def poner_fondo_negro():
+        pdf.set_fill_color(0, 0, 0)
+        pdf.rect(0, 0, 210, 297, 'F')
+
+    def quitar_emojis(texto):
+        return texto.encode('ascii', 'ignore').decode('ascii')
+
+    # Primera página - encabezado y estadísticas
+    pdf.add_page()
+    poner_fondo_negro()
+    pdf.set_text_color(0, 255, 213)
+    pdf.set_font("Helvetica", 'B', 14)
+    pdf.cell(0, 10, quitar_emojis("Reporte de Calificaciones"), new_x="LMARGIN", new_y="NEXT", align='C')
+
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_font("Helvetica", '', 12)
+    pdf.ln(5)
+    encabezado = f"Carrera: {carrera} | Asignatura: {asignatura} | Grupo: {grupo} | Semestre: {semestre}"
+    pdf.cell(0, 10, quitar_emojis(encabezado), new_x="LMARGIN", new_y="NEXT")
+
+    for parcial, estadisticas in estadisticas_dict.items():
+        pdf.set_text_color(0, 255, 213)
+        pdf.set_font("Helvetica", 'B', 12)
+        pdf.ln(8)
+        pdf.cell(0, 10, quitar_emojis(f"Estadísticas de {parcial}"), new_x="LMARGIN", new_y="NEXT")
+        pdf.set_text_color(255, 255, 255)
+        pdf.set_font("Helvetica", '', 11)
+
+        pdf.cell(0, 8, f"Media: {estadisticas['media']:.2f}", new_x="LMARGIN", new_y="NEXT")
+        pdf.cell(0, 8, f"Mediana: {estadisticas['mediana']:.2f}", new_x="LMARGIN", new_y="NEXT")
+        pdf.cell(0, 8, f"Moda: {estadisticas['moda']:.2f}", new_x="LMARGIN", new_y="NEXT")
+        pdf.cell(0, 8, f"Varianza: {estadisticas['varianza']:.2f}", new_x="LMARGIN", new_y="NEXT")
+        pdf.cell(0, 8, f"Rango: {estadisticas['rango']:.2f}", new_x="LMARGIN", new_y="NEXT")
+
+    # Las gráficas registradas (PNG por nombre) se insertan directo desde memoria
+    imagenes = {nombre: registro_figuras.get(nombre) for nombre in registro_figuras.nombres()}
+
+    def colocar_imagen(png, x, y, max_width, max_height):
+        im = Image.open(io.BytesIO(png))
+        width_px, height_px = im.size
+        dpi = im.info.get('dpi', (72, 72))[0]
+
+        width_mm = (width_px / dpi) * 25.4
+        height_mm = (height_px / dpi) * 25.4
+
+        scale = min(max_width / width_mm, max_height / height_mm, 1)
+
+        final_width = width_mm * scale
+        final_height = height_mm * scale
+
+        pdf.image(io.BytesIO(png), x=x, y=y, w=final_width, h=final_height)
+
+    def titulo_pagina(titulo):
+        pdf.add_page()
+        poner_fondo_negro()
+        pdf.set_text_color(255, 255, 255)
+        pdf.set_font("Helvetica", 'B', 14)
+        pdf.cell(0, 10, titulo, new_x="LMARGIN", new_y="NEXT", align='C')
+
+    # Histograma en su propia página
+    if "histograma" in imagenes:
+        titulo_pagina("Histograma")
+        colocar_imagen(imagenes["histograma"], 15, 25, 180, 250)
+
+    # Las gráficas de pastel (una por parcial, en el orden en que se
+    # registraron) de dos en dos por página, verticalmente
+    pasteles = [png for nombre, png in imagenes.items() if nombre.startswith("pastel_")]
+    max_width = 180  # casi el ancho total con margen
+    max_height = 120  # la mitad aprox. de la página menos márgenes
+    y_positions = [25, 25 + max_height + 10]  # arriba y abajo con separación de 10mm
+    x_position = 15  # margen lateral fijo
+
+    for inicio in range(0, len(pasteles), 2):
+        par = pasteles[inicio:inicio + 2]
+        titulo_pagina(f"Gráficas {inicio + 1} y {inicio + 2}" if len(par) == 2 else f"Gráfica {inicio + 1}")
+        for png, y_position in zip(par, y_positions):
+            colocar_imagen(png, x_position, y_position, max_width, max_height)
+
+    # Después de los pasteles, el boxplot en página nueva
+    if "boxplot" in imagenes:
+        titulo_pagina(f"Gráfica {len(pasteles) + 1} - Boxplot")
+        # Escalar para que quepa casi toda la página con margen
+        colocar_imagen(imagenes["boxplot"], 15, 25, 180, 250)
+
+    # Luego de las gráficas, pon leyendas si existen (en su propia página)
+    if colores_pies and etiquetas_pies and porcentajes_pies:
+        pdf.add_page()
+        poner_fondo_negro()
+        pdf.set_text_color(255, 255, 255)
+        pdf.set_font("Helvetica", 'B', 12)
+        pdf.cell(0, 10, "Leyendas:", new_x="LMARGIN", new_y="NEXT")
+        pdf.set_font("Helvetica", '', 11)
+
+        ancho_cuadro = 8
+        alto_cuadro = 8
+
+        # Leyendas para cada gráfica de pastel
+        for i in range(len(colores_pies)):
+            colores = list(colores_pies[i])
+            etiquetas = list(etiquetas_pies[i])
+            porcentajes = list(porcentajes_pies[i])
+
+            pdf.set_text_color(255, 255, 255)
+            pdf.set_font("Helvetica", 'B', 12)
+            pdf.cell(0, 10, f"Datos Grafica {i + 1}", new_x="LMARGIN", new_y="NEXT")
+            pdf.set_font("Helvetica", '', 11)
+
+            for idx, (c, etiqueta, porcentaje) in enumerate(zip(colores, etiquetas, porcentajes)):
+                x = 10
+                y = pdf.get_y() + 2
+
+                r, g, b = tuple(int(c.strip('#')[j:j+2], 16) for j in (0, 2, 4))
+                pdf.set_fill_color(r, g, b)
+                pdf.rect(x, y, ancho_cuadro, alto_cuadro, 'F')
+                pdf.set_xy(x + ancho_cuadro + 2, y - 2)
+                pdf.set_text_color(255, 255, 255)
+                pdf.cell(60, 10, etiqueta)
+                pdf.cell(20, 10, f"{porcentaje:.1f}%", new_x="LMARGIN", new_y="NEXT")
+
+            pdf.ln(5)
+
+    # El PDF sale como bytes: nada se escribe a disco, así dos exportaciones
+    # simultáneas no se pisan
+    return bytes(pdf.output())
+
+
+def generar_reporte_grupo(clave, grupo_df, estadisticas_dict, parciales=None, rangos=None, cajas=None):
+    # Lo mismo que arma la página para un grupo, pero sin Streamlit. `rangos`
+    # (conteos por rango de cada parcial) y `cajas` (datos del boxplot) se
+    # calculan aquí si no vienen dados. Con los dos y `parciales` no hacen
+    # falta filas (grupo_df=None): así sale el de una vista agregada, cuya
+    # `clave` trae "Todos"/"Todas" en los niveles resumidos
+    semestre, carrera, grupo, asignatura = clave
+    if grupo_df is not None:
+        parciales = detectar_parciales(grupo_df) if parciales is None else list(parciales)
+        calificaciones_dict = {parcial: grupo_df[parcial].dropna() for parcial in parciales}
+        if rangos is None:
+            rangos = distribucion_rangos(calificaciones_dict)
+        if cajas is None:
+            cajas = cajas_de_calificaciones(calificaciones_dict)
+
+    registro = RegistroFiguras()
+    registro.registrar_figura("histograma", figura_histograma(rangos=rangos, parciales=parciales))
+
+    colores_pies, etiquetas_pies, porcentajes_pies = [], [], []
+    for parcial in parciales:
+        colores, etiquetas, porcentajes = [], [], []
+        if parcial in rangos:
+            registro.registrar_figura(f"pastel_{parcial}", figura_pastel(rangos[parcial]["conteo"], parcial))
+            colores, etiquetas, porcentajes = (rangos[parcial][llave]
+                                               for llave in ("colores", "etiquetas", "porcentajes_pastel"))
+        colores_pies.append(colores)
+        etiquetas_pies.append(etiquetas)
+        porcentajes_pies.append(porcentajes)
+
+    if cajas:
+        registro.registrar_figura("boxplot", figura_boxplot(cajas=cajas))
+
+    return generar_pdf(estadisticas_dict, carrera, grupo, asignatura, semestre, registro,
+                       colores_pies=colores_pies, etiquetas_pies=etiquetas_pies,
+                       porcentajes_pies=porcentajes_pies)
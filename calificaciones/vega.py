@@ -0,0 +1,174 @@
+# Gráficas para el navegador: especificaciones Vega-Lite (diccionarios JSON)
+# con sólo los datos agregados (conteos por rango, cuartiles y las
+# calificaciones del strip plot). El navegador las dibuja; el servidor no
+# renderiza imágenes. Mismo tema oscuro y mismos colores que graficas.py,
+# que sigue siendo el motor del PDF
+from .cajas import ANCHO_DISPERSION
+from .graficas import TEMAS, colores_parciales
+from .rangos import EJE_TENDENCIA, rango_colores, rango_labels
+
+ESQUEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+
+# Color de la curva de tendencia del histograma (igual que en matplotlib)
+COLOR_TENDENCIA = "#7230c9"
+
+# Ancho de las barras del histograma, en unidades del eje (un rango = 1);
+# el mismo que usa matplotlib
+ANCHO_BARRA = 0.8
+
+# Ancho (px) de las cajas del boxplot
+ANCHO_CAJA = 70
+
+# Lo que se manda de cada caja (sin los puntos, que van aparte)
+MEDIDAS_CAJA = ["q1", "mediana", "q3", "bigote_inferior", "bigote_superior", "total"]
+
+# Dominio del desplazamiento de los puntos dentro de la banda de su parcial:
+# la nube más ancha ocupa un tercio de la banda, como antes
+DOMINIO_DISPERSION = ANCHO_DISPERSION * 3
+
+
+def _configuracion(tema):
+    colores = TEMAS[tema]
+    texto = colores["texto"]
+    return {
+        "background": colores["fondo"],
+        "view": {"stroke": None},
+        "axis": {"labelColor": texto, "titleColor": texto, "domainColor": texto, "tickColor": texto,
+                 "labelFontSize": 12, "titleFontSize": 13, "gridColor": "gray", "gridOpacity": 0.3,
+                 "gridDash": [4, 4]},
+        "header": {"labelColor": texto, "labelFontSize": 16, "labelFontWeight": "bold"},
+        "title": {"color": texto, "fontSize": 16, "fontWeight": "bold"},
+        "legend": {"labelColor": texto, "titleColor": texto},
+    }
+
+
+def _escala_rangos():
+    return {"domain": list(rango_labels), "range": [rango_colores[label] for label in rango_labels]}
+
+
+def spec_histograma(rangos_dict, tema="oscuro"):
+    # `rangos_dict`: {parcial: resumen_rangos(...)} (Analisis.rangos_de). Un
+    # panel por parcial, dos por fila, con barras, curva y porcentajes. La
+    # curva es la spline ya evaluada en el servidor (rangos.EJE_TENDENCIA
+    # contra rangos[parcial]["tendencia"]), igual que en matplotlib; va en
+    # sus propias filas y Vega sólo une los puntos
+    barras = [{"panel": f"Histograma {parcial}", "posicion": i, "rango": etiqueta, "conteo": int(conteo),
+               "porcentaje": round(float(pct), 1)}
+              for parcial, rangos in rangos_dict.items()
+              for i, (etiqueta, conteo, pct) in enumerate(zip(rangos["etiquetas"], rangos["conteo"],
+                                                              rangos["porcentajes_histograma"]))]
+    curvas = [{"panel": f"Histograma {parcial}", "eje": round(float(eje), 4), "tendencia": round(float(valor), 3)}
+              for parcial, rangos in rangos_dict.items()
+              for eje, valor in zip(EJE_TENDENCIA, rangos["tendencia"])]
+    # Un solo eje x cuantitativo para barras y curva: la barra del rango i
+    # va centrada en i, justo donde la spline pasa por su conteo
+    etiquetas = "[" + ", ".join(f"'{label}'" for label in rango_labels) + "]"
+    escala_x = {"domain": [-0.5, len(rango_labels) - 0.5], "nice": False, "zero": False}
+    eje_x = {"values": list(range(len(rango_labels))), "labelExpr": f"{etiquetas}[datum.value]",
+             "labelAngle": 0, "grid": False}
+    x = {"field": "posicion", "type": "quantitative", "title": "Rango", "scale": escala_x, "axis": eje_x}
+    y = {"field": "conteo", "type": "quantitative", "title": "Frecuencia"}
+    solo_barras = {"filter": "isValid(datum.conteo)"}
+    return {
+        "$schema": ESQUEMA,
+        "data": {"values": barras + curvas},
+        "facet": {"field": "panel", "type": "nominal", "sort": [f"Histograma {parcial}" for parcial in rangos_dict],
+                  "header": {"title": None}},
+        "columns": 2,
+        "resolve": {"scale": {"y": "independent"}},
+        "spec": {
+            "width": 320,
+            "height": 260,
+            "layer": [
+                {"transform": [solo_barras,
+                               {"calculate": f"datum.posicion - {ANCHO_BARRA / 2}", "as": "desde"},
+                               {"calculate": f"datum.posicion + {ANCHO_BARRA / 2}", "as": "hasta"}],
+                 "mark": "bar",
+                 "encoding": {"x": {**x, "field": "desde"}, "x2": {"field": "hasta"}, "y": y, "y2": {"datum": 0},
+                              "color": {"field": "rango", "scale": _escala_rangos(), "legend": None},
+                              "tooltip": [{"field": "rango", "title": "Rango"},
+                                          {"field": "conteo", "title": "Alumnos"},
+                                          {"field": "porcentaje", "title": "%"}]}},
+                {"transform": [{"filter": "isValid(datum.tendencia)"}],
+                 "mark": {"type": "line", "color": COLOR_TENDENCIA, "strokeWidth": 3},
+                 "encoding": {"x": {**x, "field": "eje"}, "y": {**y, "field": "tendencia"},
+                              "order": {"field": "eje"}}},
+                {"transform": [solo_barras,
+                               {"calculate": "format(datum.porcentaje, '.1f') + '%'", "as": "etiqueta"}],
+                 "mark": {"type": "text", "dy": -8, "color": TEMAS[tema]["texto"], "fontWeight": "bold"},
+                 "encoding": {"x": x, "y": y, "text": {"field": "etiqueta"}}},
+            ],
+        },
+        "config": _configuracion(tema),
+    }
+
+
+def spec_pastel(rangos, parcial, tema="oscuro"):
+    # `rangos`: resumen_rangos(...) de un parcial
+    valores = [{"rango": etiqueta, "orden": i, "conteo": int(conteo), "porcentaje": round(float(pct), 1)}
+               for i, (etiqueta, conteo, pct) in enumerate(zip(rangos["etiquetas"], rangos["conteo"],
+                                                               rangos["porcentajes_pastel"]))]
+    return {
+        "$schema": ESQUEMA,
+        "data": {"values": valores},
+        "title": f"Distribución - {parcial}",
+        "height": 300,
+        "mark": {"type": "arc", "stroke": TEMAS[tema]["fondo"], "strokeWidth": 1.5},
+        "encoding": {
+            "theta": {"field": "conteo", "type": "quantitative", "stack": True},
+            "order": {"field": "orden"},
+            "color": {"field": "rango", "scale": _escala_rangos(), "legend": None},
+            "tooltip": [{"field": "rango", "title": "Rango"},
+                        {"field": "conteo", "title": "Alumnos"},
+                        {"field": "porcentaje", "title": "%"}],
+        },
+        "config": _configuracion(tema),
+    }
+
+
+def spec_boxplot(cajas, tema="oscuro"):
+    # `cajas`: {parcial: caja} (Analisis.cajas_de): cinco números ya calculados
+    # y a lo más cajas.MAX_PUNTOS puntos por parcial con su dispersión
+    # horizontal, así que el JSON no crece con el tamaño del grupo
+    parciales = list(cajas)
+    resumenes = [{"parcial": parcial, **{medida: caja[medida] for medida in MEDIDAS_CAJA}}
+                 for parcial, caja in cajas.items()]
+    puntos = [{"parcial": parcial, "calificacion": float(y), "dispersion": round(float(x), 4)}
+              for parcial, caja in cajas.items() for x, y in zip(caja["x"], caja["y"])]
+    colores = TEMAS[tema]
+    x = {"field": "parcial", "type": "nominal", "sort": parciales, "title": None, "axis": {"labelAngle": 0}}
+    color = {"field": "parcial", "scale": {"domain": parciales, "range": colores_parciales(len(parciales))},
+             "legend": None}
+    escala_y = {"zero": False}
+    return {
+        "$schema": ESQUEMA,
+        "datasets": {"cajas": resumenes, "puntos": puntos},
+        "width": 420,
+        "height": 380,
+        "layer": [
+            {"data": {"name": "cajas"},
+             "mark": {"type": "rule", "strokeWidth": 2.2},
+             "encoding": {"x": x, "y": {"field": "bigote_inferior", "type": "quantitative",
+                                         "title": "Calificación", "scale": escala_y},
+                          "y2": {"field": "bigote_superior"}, "color": color}},
+            {"data": {"name": "cajas"},
+             "mark": {"type": "bar", "size": ANCHO_CAJA},
+             "encoding": {"x": x, "y": {"field": "q1", "type": "quantitative"}, "y2": {"field": "q3"},
+                          "color": color,
+                          "tooltip": [{"field": "parcial", "title": "Parcial"},
+                                      {"field": "q1", "title": "Q1", "format": ".2f"},
+                                      {"field": "mediana", "title": "Mediana", "format": ".2f"},
+                                      {"field": "q3", "title": "Q3", "format": ".2f"},
+                                      {"field": "total", "title": "Alumnos"}]}},
+            # Mediana: una barra de alto cero con borde, del mismo ancho que la caja
+            {"data": {"name": "cajas"},
+             "mark": {"type": "bar", "size": ANCHO_CAJA, "stroke": colores["fondo"], "strokeWidth": 2.2},
+             "encoding": {"x": x, "y": {"field": "mediana", "type": "quantitative"}, "y2": {"field": "mediana"}}},
+            {"data": {"name": "puntos"},
+             "mark": {"type": "circle", "size": 36, "color": colores["texto"], "opacity": 0.5},
+             "encoding": {"x": x, "y": {"field": "calificacion", "type": "quantitative"},
+                          "xOffset": {"field": "dispersion", "type": "quantitative",
+                                      "scale": {"domain": [-DOMINIO_DISPERSION, DOMINIO_DISPERSION]}}}},
+        ],
+        "config": _configuracion(tema),
+    }
@@ -0,0 +1,88 @@
+import streamlit as st       # Framework para crear aplicaciones web interactivas fácilmente
+from calificaciones import Analisis
+from calificaciones.api import ingerir_libros
+from calificaciones.estadisticas import APROBATORIA, MEDIDAS_RANKING
+
+# Ranking de todos los (grupo, asignatura) por cuánto cambió cada medida entre
+# parciales: qué grupos y materias bajaron más de P1 a P2 sin recorrer los
+# filtros uno por uno. Usa el mismo Analisis que la página principal (uno por
+# versión de datos para todo el proceso) y el ranking se calcula una sola vez
+
+# Nombre de cada columna de cambio en la tabla
+NOMBRES_MEDIDAS = {
+    "media": "Δ Media",
+    "mediana": "Δ Mediana",
+    "iqr": "Δ IQR",
+    "varianza": "Δ Varianza",
+    "aprobados": "Δ % Aprobados",
+}
+
+st.set_page_config(layout="wide", page_title="Ranking de Calificaciones")
+st.markdown("""
+<h1 style='font-family:Segoe UI, sans-serif; color:#00ffc8; font-weight:600;'>
+🏆 Ranking de Grupos y Asignaturas
+</h1>
+<h4 style='color:#cccccc; font-family:Segoe UI, sans-serif; font-weight:400; margin-top:-10px;'>
+Cambios entre parciales de todos los grupos a la vez
+</h4>
+""", unsafe_allow_html=True)
+
+# Mismos libros, mismo dataset Parquet y mismas cachés que la página principal
+ingesta = ingerir_libros()
+plantel_seleccionado = st.sidebar.selectbox("Selecciona un plantel", ingesta["planteles"])
+analisis = Analisis.de_plantel(ingesta, plantel_seleccionado)
+
+# Una fila por (grupo, asignatura) y par de parciales; ya calculado y compartido
+ranking = analisis.ranking()
+ranking = ranking.assign(cambio=ranking["desde"] + " → " + ranking["hasta"])
+
+# ----------- Filtros ------------------
+cambios = list(dict.fromkeys(ranking["cambio"]))
+cambio_seleccionado = st.sidebar.selectbox("Parciales a comparar", cambios)
+semestres = st.sidebar.multiselect("Semestre", sorted(ranking["Semestre"].unique()))
+carreras = st.sidebar.multiselect("Carrera", sorted(ranking["Carrera"].unique()))
+busqueda = st.sidebar.text_input("🔎 Buscar asignatura o grupo")
+medida_orden = st.sidebar.selectbox("Ordenar por", MEDIDAS_RANKING, format_func=NOMBRES_MEDIDAS.get)
+caidas_primero = st.sidebar.radio("Orden", ["Mayores caídas primero", "Mayores aumentos primero"]) \
+    == "Mayores caídas primero"
+
+filtro = ranking["cambio"] == cambio_seleccionado
+if semestres:
+    filtro &= ranking["Semestre"].isin(semestres)
+if carreras:
+    filtro &= ranking["Carrera"].isin(carreras)
+if busqueda.strip():
+    texto = busqueda.strip()
+    filtro &= (ranking["Asignatura"].str.contains(texto, case=False, regex=False)
+               | ranking["Grupo"].str.contains(texto, case=False, regex=False))
+tabla = ranking[filtro].sort_values(medida_orden, ascending=caidas_primero, na_position="last")
+
+# ----------- Resumen ------------------
+col1, col2, col3 = st.columns(3)
+col1.metric("Grupos × asignaturas", len(tabla))
+col2.metric("Bajaron la media", int((tabla["media"] < 0).sum()))
+col3.metric("Subieron la media", int((tabla["media"] > 0).sum()))
+
+# ----------- Ranking ------------------
+# st.dataframe ya permite reordenar con un clic en cada encabezado
+st.markdown(f"## 📋 <b>Ranking por {NOMBRES_MEDIDAS[medida_orden]} ({cambio_seleccionado})</b>",
+            unsafe_allow_html=True)
+st.dataframe(
+    tabla[["Semestre", "Carrera", "Grupo", "Asignatura"] + MEDIDAS_RANKING].rename(columns=NOMBRES_MEDIDAS),
+    hide_index=True,
+    column_config={nombre: st.column_config.NumberColumn(format="%.2f") for nombre in NOMBRES_MEDIDAS.values()},
+)
+
+# ----------- Matriz grupo × asignatura ------------------
+with st.expander(f"🧮 Matriz grupo × asignatura ({NOMBRES_MEDIDAS[medida_orden]}) ⬇️"):
+    matriz = tabla.pivot_table(index=["Semestre", "Carrera", "Grupo"], columns="Asignatura",
+                               values=medida_orden, observed=True)
+    st.dataframe(matriz.round(2))
+
+with st.expander("📋 ¿Cómo leer el ranking? ⬇️"):
+    st.markdown(f"""
+    - Cada fila es un grupo en una asignatura; los valores son el cambio de {cambio_seleccionado.replace("→", "a")}.
+    - Un **Δ Media** o **Δ Mediana** negativo indica que las calificaciones bajaron.
+    - Un **Δ IQR** o **Δ Varianza** positivo indica calificaciones más dispersas.
+    - **Δ % Aprobados** es el cambio en puntos porcentuales de alumnos con calificación >= {APROBATORIA}.
+    """)
@@ -1,45 +1,64 @@
 import pandas as pd          # Manejo y análisis de datos en estructuras tipo tabla (DataFrames)
-import matplotlib.pyplot as plt  # Creación de gráficos estáticos (barras, pasteles, boxplots, etc.)
-import seaborn as sns        # Visualización estadística avanzada y gráfica más estética sobre matplotlib
-import numpy as np           # Cálculos numéricos y operaciones con arreglos, estadística básica
 import streamlit as st       # Framework para crear aplicaciones web interactivas fácilmente
-from scipy import stats      # Funciones estadísticas avanzadas como moda, pruebas, etc.
-from fpdf import FPDF        # Generar documentos PDF desde Python, agregar texto e imágenes
-import tempfile              # Crear archivos temporales para guardar imágenes o datos temporales
-import os                    # Manejo de sistema de archivos (eliminar archivos temporales, rutas, etc.)
-import re                    # Expresiones regulares para manipular y limpiar texto (ej. quitar emojis)
-from PIL import Image        # Biblioteca Pillow para abrir y manejar imágenes (dimensiones, formatos)
-from scipy.interpolate import make_interp_spline
+import os
 import time
-
-def burbuja_bot_animada(texto, contenedor, velocidad=0.04):
-    espacio = contenedor
-    respuesta = ""
-    
-    # Mientras escribe: solo texto plano con ▌
-    for c in texto:
-        respuesta += c
-        espacio.markdown(f"""
-        <div style='background-color:#2b2b2b; padding: 12px 15px; border-radius: 12px 12px 12px 0px;
-                        margin-bottom:10px; border-left: 4px solid #00ffc8; color:#f1f1f1;
-                        font-family: "Segoe UI", sans-serif; font-size: 14px; white-space: pre-wrap;'>
-            🤖 <b>EduBot:</b><br>{respuesta}▌
-        </div>
-        """, unsafe_allow_html=True)
-        time.sleep(velocidad)
-
-    # Al finalizar: reemplazamos saltos de línea correctamente
-    respuesta_final = texto.replace("\n", "<br>")
-    espacio.markdown(f"""
+from calificaciones import Analisis
+from calificaciones.api import cache_analisis, datos_plantel, ingerir_libros
+from calificaciones.cache import cache_resultados
+from calificaciones.edubot import responder as responder_edubot
+from calificaciones.filtros import VISTAS
+from calificaciones.graficas import (RegistroFiguras, cache_figuras, figura_boxplot, figura_histograma,
+                                    figura_pastel, grafica_png)
+from calificaciones.ingesta import memoria_planteles
+from calificaciones.perf import cronometro
+from calificaciones.precarga import precalentar
+from calificaciones.vega import spec_boxplot, spec_histograma, spec_pastel
+
+def burbuja_html(texto, escribiendo=False):
+    if escribiendo:
+        # Mientras escribe: texto plano con ▌
+        cuerpo, extra = f"{texto}▌", " white-space: pre-wrap;"
+    else:
+        # Al finalizar: reemplazamos saltos de línea correctamente
+        cuerpo, extra = texto.replace("\n", "<br>"), ""
+    return f"""
     <div style='background-color:#2b2b2b; padding: 12px 15px; border-radius: 12px 12px 12px 0px;
                     margin-bottom:10px; border-left: 4px solid #00ffc8; color:#f1f1f1;
-                    font-family: "Segoe UI", sans-serif; font-size: 14px;'>
-        🤖 <b>EduBot:</b><br>{respuesta_final}
+                    font-family: "Segoe UI", sans-serif; font-size: 14px;{extra}'>
+        🤖 <b>EduBot:</b><br>{cuerpo}
     </div>
-    """, unsafe_allow_html=True)
+    """
 
-# Cargar archivo Excel
-df = pd.read_excel("Calificaciones 1 y 2 parcial Plantel Xonacatlán.xlsx")
+
+def trozos_respuesta(texto, tamano_inicial=12):
+    # Trozos que terminan en palabra y duplican su tamaño cada vez: son ~log(n)
+    # actualizaciones y, como cada una reenvía el texto acumulado, en total se
+    # mandan unas 3n letras, O(n) (antes era una actualización por letra, O(n²))
+    inicio, tamano = 0, tamano_inicial
+    while inicio < len(texto):
+        fin = texto.find(" ", inicio + tamano)
+        fin = len(texto) if fin == -1 else fin + 1
+        yield texto[inicio:fin]
+        inicio, tamano = fin, tamano * 2
+
+
+def burbuja_bot_animada(texto, contenedor, velocidad=0.04, instantaneo=None):
+    # `velocidad` es la pausa entre trozos (no entre letras); en modo instantáneo
+    # se pinta la respuesta completa de una vez
+    if instantaneo is None:
+        instantaneo = st.session_state.get("bot_instantaneo", False)
+
+    if not instantaneo:
+        respuesta = ""
+        for trozo in trozos_respuesta(texto):
+            respuesta += trozo
+            contenedor.markdown(burbuja_html(respuesta, escribiendo=True), unsafe_allow_html=True)
+            time.sleep(velocidad)
+
+    contenedor.markdown(burbuja_html(texto), unsafe_allow_html=True)
+
+# Tiempos de este rerun por etapa (se ven en el panel oculto ?perf=1)
+medicion = cronometro.iniciar()
 
 # Configurar Streamlit
 st.set_page_config(layout="wide", page_title="Análisis de Calificaciones")
@@ -52,34 +71,69 @@ Visualización y comparación de resultados por parcial
 </h4>
 """, unsafe_allow_html=True)
 
-# Filtro de semestre
-semestres = df["Semestre"].dropna().unique()
-semestre_seleccionado = st.sidebar.selectbox("Selecciona un semestre", sorted(semestres))
-
-# Filtro de carrera dinámico según semestre
-carreras_filtradas = df[df["Semestre"] == semestre_seleccionado]["Carrera"].dropna().unique()
-carrera_seleccionada = st.sidebar.selectbox("Selecciona una carrera", sorted(carreras_filtradas))
-
-# Filtro de grupo dinámico según semestre y carrera
-grupos_filtrados = df[
-    (df["Semestre"] == semestre_seleccionado) &
-    (df["Carrera"] == carrera_seleccionada)
-]["Grupo"].dropna().unique()
-grupo_seleccionado = st.sidebar.selectbox("Selecciona un grupo", sorted(grupos_filtrados))
-
-# Filtrar el DataFrame base según todos los filtros
-df_filtrado = df[
-    (df["Semestre"] == semestre_seleccionado) &
-    (df["Carrera"] == carrera_seleccionada) &
-    (df["Grupo"] == grupo_seleccionado)
-]
-
-# Filtro de asignatura
-todas_asignaturas = df_filtrado["Asignatura"].dropna().unique()
-asignatura_seleccionada = st.sidebar.selectbox("Selecciona una asignatura", sorted(todas_asignaturas))
+# El encabezado ya se pintó; mientras se carga el Excel, un hilo importa en
+# segundo plano matplotlib/fpdf para las gráficas y el PDF
+precalentar()
+
+# Todos los libros .xlsx de la carpeta (uno o más por plantel) se ingresan a
+# un dataset Parquet por plantel; sólo se vuelven a leer los que cambiaron, y
+# si cambió alguno lo calculado con la versión anterior se libera ya
+with medicion.etapa("ingesta"):
+    ingesta = ingerir_libros()
+
+# Filtro de plantel: sólo se leen las particiones del plantel elegido
+plantel_seleccionado = st.sidebar.selectbox("Selecciona un plantel", ingesta["planteles"])
+
+with medicion.etapa("carga"):
+    version_datos, df = datos_plantel(ingesta, plantel_seleccionado)
+
+# Índice de filtros y cubo de estadísticas: se arman una vez por versión del
+# Excel y los comparten todas las sesiones y la página de ranking (las
+# versiones viejas se descartan)
+with medicion.etapa("indices"):
+    analisis = Analisis.compartido(version_datos, df)
+
+# Vista: un grupo y asignatura, o los totales de una Carrera, de un Semestre
+# o de todo el plantel (ya resumidos en Analisis, sin volver a leer filas)
+vista_seleccionada = st.sidebar.selectbox("Selecciona una vista", list(VISTAS))
+consulta = analisis.vista_de(vista_seleccionada)
+
+if vista_seleccionada == "Grupo":
+    # Filtro de semestre
+    with medicion.etapa("filtro_semestre"):
+        semestre_seleccionado = st.sidebar.selectbox("Selecciona un semestre", analisis.opciones())
+
+    # Filtro de carrera dinámico según semestre
+    with medicion.etapa("filtro_carrera"):
+        carreras_filtradas = analisis.opciones(semestre_seleccionado)
+        carrera_seleccionada = st.sidebar.selectbox("Selecciona una carrera", carreras_filtradas)
+
+    # Filtro de grupo dinámico según semestre y carrera
+    with medicion.etapa("filtro_grupo"):
+        grupos_filtrados = analisis.opciones(semestre_seleccionado, carrera_seleccionada)
+        grupo_seleccionado = st.sidebar.selectbox("Selecciona un grupo", grupos_filtrados)
+
+    # Filtro de asignatura
+    with medicion.etapa("filtro_asignatura"):
+        todas_asignaturas = analisis.opciones(semestre_seleccionado, carrera_seleccionada, grupo_seleccionado)
+        asignatura_seleccionada = st.sidebar.selectbox("Selecciona una asignatura", todas_asignaturas)
+
+    clave_seleccion = (semestre_seleccionado, carrera_seleccionada,
+                       grupo_seleccionado, asignatura_seleccionada)
+    titulo_seleccion = asignatura_seleccionada
+elif vista_seleccionada == "Plantel":
+    clave_seleccion = ()
+    titulo_seleccion = f"todo el plantel {plantel_seleccionado}"
+else:
+    # Un solo filtro: la carrera o el semestre a resumir
+    with medicion.etapa("filtro_vista"):
+        texto_filtro = {"Carrera": "Selecciona una carrera", "Semestre": "Selecciona un semestre"}[vista_seleccionada]
+        valor_seleccionado = st.sidebar.selectbox(texto_filtro, [clave[0] for clave in consulta.opciones()])
+    clave_seleccion = (valor_seleccionado,)
+    titulo_seleccion = f"{vista_seleccionada} {valor_seleccionado}"
 
-# Filtrado final
-grupo_df = df_filtrado[df_filtrado["Asignatura"] == asignatura_seleccionada]
+semestre_seleccionado, carrera_seleccionada, grupo_seleccionado, asignatura_seleccionada = \
+    consulta.etiquetas(clave_seleccion)
 
 # Encabezado personalizado con estilo moderno
 st.markdown(f"""
@@ -100,126 +154,103 @@ st.markdown(f"""
 </style>
 
 <div class="encabezado-box">
+    <h4>🏫 Plantel: <span style='color:white'>{plantel_seleccionado}</span></h4>
     <h4>🎓 Carrera: <span style='color:white'>{carrera_seleccionada}</span></h4>
     <h4>📘 Asignatura: <span style='color:white'>{asignatura_seleccionada}</span></h4>
     <h4>👥 Grupo: <span style='color:white'>{grupo_seleccionado}</span> | 🗓️ Semestre: <span style='color:white'>{semestre_seleccionado}</span></h4>
 </div>
 """, unsafe_allow_html=True)
 
-# Colores para rangos (tonos suaves y agradables)
-rango_colores = {
-    '5-6': '#e74c3c',    # rojo suave (✅ excelente para calificaciones bajas)
-    '6-7': '#e67e22',    # naranja quemado (✅ buen intermedio)
-    '7-8': '#f1c40f',    # amarillo mostaza (🟡 un poco brillante, pero aceptable)
-    '8-9': "#58a8d6",   # verde jade suave (más natural)
-    '9-10': "#09ff6fcf"   # verde profesional profundo
-}
-
 
-rango_bins = [5, 6, 7, 8, 9, 10.1]
-rango_labels = ['5-6', '6-7', '7-8', '8-9', '9-10']
-
-calificaciones_dict = {}
 estadisticas_dict = {}
 
-cols = st.columns(2)  # Dividimos en 2 columnas horizontales
-
-for idx, parcial in enumerate(['P1', 'P2']):
-    calificaciones = grupo_df[parcial].dropna()
-    calificaciones_dict[parcial] = calificaciones
-    
-
-    if calificaciones.empty:
-        cols[idx].warning(f"⚠️ Estadísticas de {parcial}: No disponibles")
-        continue   
-
-    # Cálculos principales
-    media = calificaciones.mean()
-    mediana = calificaciones.median()
-    moda = stats.mode(calificaciones, nan_policy='omit', keepdims=True)[0][0]
-    varianza = calificaciones.var()
-    q1 = calificaciones.quantile(0.25)
-    q2 = calificaciones.quantile(0.50)
-    q3 = calificaciones.quantile(0.75)
-
-    # Cálculos adicionales por que yo lo digo jaja xd 
-    maximo = calificaciones.max()
-    minimo = calificaciones.min()
-    rango = maximo - minimo
-    total = calificaciones.count()
-
-     # ✅ Luego de lso calculos los guardamos en el diccionario
-    estadisticas_dict[parcial] = {
-        "media": media,
-        "mediana": mediana,
-        "moda": moda,
-        "varianza": varianza,
-        "q1": q1,
-        "q2": q2,
-        "q3": q3,
-        "max": maximo,
-        "min": minimo,
-        "rango": rango,
-        "total": total
-    }
-    # HTML con estilos para las tablas
-    tabla_html = f"""
-    <style>
-        .tabla-estadisticas {{
-            border-collapse: separate;
-            border-spacing: 0;
-            width: 100%;
-            margin-top: 15px;
-            font-family: 'Segoe UI', sans-serif;
-            border-radius: 12px;
-            overflow: hidden;
-            box-shadow: 0 2px 8px rgba(0,255,200,0.1);
-        }}
-        .tabla-estadisticas th {{
-            background-color: #1f1f1f;
-            color: #00ffd5;
-            text-align: left;
-            padding: 12px 16px;
-            font-size: 14px;
-            border-bottom: 2px solid #00ffd5;
-        }}
-        .tabla-estadisticas td {{
-            background-color: #121212;
-            color: #f1f1f1;
-            padding: 12px 16px;
-            font-size: 13.5px;
-            border-bottom: 1px solid #2a2a2a;
-        }}
-        .tabla-estadisticas tr:hover td {{
-            background-color: #1c1c1c;
-        }}
-    </style>
-
-    <h4 style='color:#00ffd5; font-family:Segoe UI;'>📘 Estadísticas del {parcial}</h4>
-
-    <table class="tabla-estadisticas">
-        <thead>
-            <tr>
-                <th>📌 Medida</th>
-                <th>🔢 Valor</th>
-            </tr>
-        </thead>
-        <tbody>
-            <tr><td>Total de Alumnos</td><td>{total}</td></tr>
-            <tr><td>Media</td><td>{media:.2f}</td></tr>
-            <tr><td>Mediana</td><td>{mediana:.2f}</td></tr>
-            <tr><td>Moda</td><td>{moda:.2f}</td></tr>
-            <tr><td>Varianza</td><td>{varianza:.2f}</td></tr>
-            <tr><td>Rango</td><td>{rango:.2f}</td></tr>
-            <tr><td>Q1 (25%)</td><td>{q1:.2f}</td></tr>
-            <tr><td>Q2 (50%)</td><td>{q2:.2f}</td></tr>
-            <tr><td>Q3 (75%)</td><td>{q3:.2f}</td></tr>
-        </tbody>
-    </table>
-    """
-
-    # Mostrar la tabla en su columna correspondiente
-    cols[idx].markdown(tabla_html, unsafe_allow_html=True)
+# Parciales del Excel (P1, P2, ... y calificación final si la hay)
+parciales = consulta.parciales
+
+cols = st.columns(len(parciales))  # Una columna horizontal por parcial
+
+with medicion.etapa("estadisticas"):
+    estadisticas_grupo = consulta.estadisticas_de(clave_seleccion)
+    # Cambios de cada medida entre parciales consecutivos (ya calculados)
+    tendencias_grupo = consulta.tendencias_de(clave_seleccion)
+    # Conteo por rango de cada parcial: lo comparten el histograma, los
+    # pasteles, la leyenda del PDF y EduBot
+    rangos_grupo = consulta.rangos_de(clave_seleccion)
+
+    for idx, parcial in enumerate(parciales):
+        if parcial not in estadisticas_grupo:
+            cols[idx].warning(f"⚠️ Estadísticas de {parcial}: No disponibles")
+            continue   
+
+        # Las medidas ya vienen calculadas en el cubo; sólo las buscamos
+        estadisticas_dict[parcial] = estadisticas_grupo[parcial]
+        media = estadisticas_dict[parcial]["media"]
+        mediana = estadisticas_dict[parcial]["mediana"]
+        moda = estadisticas_dict[parcial]["moda"]
+        varianza = estadisticas_dict[parcial]["varianza"]
+        q1 = estadisticas_dict[parcial]["q1"]
+        q2 = estadisticas_dict[parcial]["q2"]
+        q3 = estadisticas_dict[parcial]["q3"]
+        rango = estadisticas_dict[parcial]["rango"]
+        total = estadisticas_dict[parcial]["total"]
+        # HTML con estilos para las tablas
+        tabla_html = f"""
+        <style>
+            .tabla-estadisticas {{
+                border-collapse: separate;
+                border-spacing: 0;
+                width: 100%;
+                margin-top: 15px;
+                font-family: 'Segoe UI', sans-serif;
+                border-radius: 12px;
+                overflow: hidden;
+                box-shadow: 0 2px 8px rgba(0,255,200,0.1);
+            }}
+            .tabla-estadisticas th {{
+                background-color: #1f1f1f;
+                color: #00ffd5;
+                text-align: left;
+                padding: 12px 16px;
+                font-size: 14px;
+                border-bottom: 2px solid #00ffd5;
+            }}
+            .tabla-estadisticas td {{
+                background-color: #121212;
+                color: #f1f1f1;
+                padding: 12px 16px;
+                font-size: 13.5px;
+                border-bottom: 1px solid #2a2a2a;
+            }}
+            .tabla-estadisticas tr:hover td {{
+                background-color: #1c1c1c;
+            }}
+        </style>
+
+        <h4 style='color:#00ffd5; font-family:Segoe UI;'>📘 Estadísticas del {parcial}</h4>
+
+        <table class="tabla-estadisticas">
+            <thead>
+                <tr>
+                    <th>📌 Medida</th>
+                    <th>🔢 Valor</th>
+                </tr>
+            </thead>
+            <tbody>
+                <tr><td>Total de Alumnos</td><td>{total}</td></tr>
+                <tr><td>Media</td><td>{media:.2f}</td></tr>
+                <tr><td>Mediana</td><td>{mediana:.2f}</td></tr>
+                <tr><td>Moda</td><td>{moda:.2f}</td></tr>
+                <tr><td>Varianza</td><td>{varianza:.2f}</td></tr>
+                <tr><td>Rango</td><td>{rango:.2f}</td></tr>
+                <tr><td>Q1 (25%)</td><td>{q1:.2f}</td></tr>
+                <tr><td>Q2 (50%)</td><td>{q2:.2f}</td></tr>
+                <tr><td>Q3 (75%)</td><td>{q3:.2f}</td></tr>
+            </tbody>
+        </table>
+        """
+
+        # Mostrar la tabla en su columna correspondiente
+        cols[idx].markdown(tabla_html, unsafe_allow_html=True)
     
 # INICIO DEL BOT CON SESSION STATE
 if 'bot_activado' not in st.session_state:
@@ -228,6 +259,8 @@ if 'pregunta' not in st.session_state:
     st.session_state.pregunta = ""
 if 'bienvenida_mostrada' not in st.session_state:
     st.session_state.bienvenida_mostrada = False
+if 'input_pregunta' not in st.session_state:
+    st.session_state.input_pregunta = ""  # caja de texto; los botones de sugerencia la llenan
 if 'sugerencia' not in st.session_state:
     st.session_state.sugerencia = ""
 if 'mostrar_bienvenida_texto' not in st.session_state:
@@ -238,7 +271,10 @@ st.session_state.bot_activado = st.sidebar.checkbox("💬 Mostrar EduBot", value
 
 if st.session_state.bot_activado:
 
-    # Mostrar bienvenida con efecto de carga solo UNA vez
+    st.session_state.bot_instantaneo = st.sidebar.checkbox(
+        "⚡ Respuestas instantáneas", value=st.session_state.get("bot_instantaneo", False))
+
+    # Mostrar bienvenida solo UNA vez (sin pausas ni rerun: no bloquea la página)
     if not st.session_state.bienvenida_mostrada:
         st.sidebar.markdown("""
         <div style='background: linear-gradient(to right, #1a1a1a, #212121); padding: 20px; border-radius: 14px; 
@@ -249,9 +285,7 @@ if st.session_state.bot_activado:
             </p>
         </div>
         """, unsafe_allow_html=True)
-        time.sleep(2)
         st.session_state.bienvenida_mostrada = True
-        st.experimental_rerun()
 
     with st.sidebar:
         if st.session_state.mostrar_bienvenida_texto:
@@ -265,382 +299,111 @@ if st.session_state.bot_activado:
     with col1:
         if st.button("📊 Media"):
             st.session_state.sugerencia = "¿Cuál es la media?"
-            st.session_state.pregunta = st.session_state.sugerencia
+            st.session_state.pregunta = st.session_state.input_pregunta = st.session_state.sugerencia
         if st.button("📈 Mediana"):
             st.session_state.sugerencia = "¿Cuál es la mediana?"
-            st.session_state.pregunta = st.session_state.sugerencia
+            st.session_state.pregunta = st.session_state.input_pregunta = st.session_state.sugerencia
         if st.button("📦 Boxplot"):
             st.session_state.sugerencia = "¿Qué es un boxplot?"
-            st.session_state.pregunta = st.session_state.sugerencia
+            st.session_state.pregunta = st.session_state.input_pregunta = st.session_state.sugerencia
     with col2:
         if st.button("📌 Moda"):
             st.session_state.sugerencia = "¿Cuál es la moda?"
-            st.session_state.pregunta = st.session_state.sugerencia
+            st.session_state.pregunta = st.session_state.input_pregunta = st.session_state.sugerencia
         if st.button("📉 Varianza"):
             st.session_state.sugerencia = "¿Qué es la varianza?"
-            st.session_state.pregunta = st.session_state.sugerencia
+            st.session_state.pregunta = st.session_state.input_pregunta = st.session_state.sugerencia
         if st.button("📐 Rango IQR"):
             st.session_state.sugerencia = "¿Qué es el rango intercuartil (IQR)?"
-            st.session_state.pregunta = st.session_state.sugerencia
+            st.session_state.pregunta = st.session_state.input_pregunta = st.session_state.sugerencia
 
-        entrada_usuario = st.sidebar.text_input("✏️ Escribe tu pregunta:", value=st.session_state.pregunta, key="input_pregunta")
+        entrada_usuario = st.sidebar.text_input("✏️ Escribe tu pregunta:", key="input_pregunta")
 
     if entrada_usuario != st.session_state.pregunta:
         st.session_state.pregunta = entrada_usuario
 
-    # Mostrar respuesta si hay pregunta
+    # Mostrar respuesta si hay pregunta (el motor de intenciones arma el texto)
     if st.session_state.pregunta.strip():
-        pregunta = st.session_state.pregunta.lower()
-
-        # 🧠 Spinner de EduBot dentro del sidebar
-        with st.sidebar:
-            with st.spinner("EduBot está escribiendo... ✍️"):
-                time.sleep(1.2)
-
-        if "media" in pregunta:
-            p1 = estadisticas_dict['P1']['media']
-            p2 = estadisticas_dict['P2']['media']
-
-            # Armar el mensaje completo como un solo string
-            respuesta = (
-                "📊 Media\n"
-                "La media es el promedio de todas las calificaciones.\n"
-                f"🟢 P1: {p1:.2f}\n"
-                f"🔵 P2: {p2:.2f}\n"
-            )
-
-            if p2 > p1:
-                respuesta += "📈 Conclusión: La media subió."
-            elif p2 < p1:
-                respuesta += "📉 Conclusión: La media bajó."
-            else:
-                respuesta += "➖ Conclusión: La media se mantuvo igual."
-
-            # Mostrar todo como una sola burbuja
-            with st.sidebar:
-                contenedor = st.empty()
-                burbuja_bot_animada(respuesta, contenedor)
-
-        elif "moda" in pregunta:
-            p1 = estadisticas_dict['P1']['moda']
-            p2 = estadisticas_dict['P2']['moda']
-
-            respuesta = (
-                "📌 Moda\n"
-                "La moda es el valor que más se repite. Si cambia entre parciales, indica un cambio en las calificaciones más comunes.\n"
-                f"🟢 P1: {p1:.2f}\n"
-                f"🔵 P2: {p2:.2f}\n"
-            )
-
-            if p2 > p1:
-                respuesta += "📈 Conclusión: La moda subió, los valores más frecuentes fueron más altos en P2."
-            elif p2 < p1:
-                respuesta += "📉 Conclusión: La moda bajó, los valores más repetidos fueron más bajos en P2."
-            else:
-                respuesta += "➖ Conclusión: La moda se mantuvo igual en ambos parciales."
-
-            with st.sidebar:
-                burbuja_bot_animada(respuesta, st.empty())
-
-        elif "mediana" in pregunta:
-            p1 = estadisticas_dict['P1']['mediana']
-            p2 = estadisticas_dict['P2']['mediana']
-
-            respuesta = (
-                "📈 Mediana\n"
-                "Divide los datos ordenados por la mitad. Menos sensible a extremos que la media.\n"
-                f"🟢 P1: {p1:.2f}\n"
-                f"🔵 P2: {p2:.2f}\n"
-            )
-
-            if p2 > p1:
-                respuesta += "📈 Conclusión: La mediana subió, los valores más frecuentes fueron más altos en P2."
-            elif p2 < p1:
-                respuesta += "📉 Conclusión: La mediana bajó, los valores más repetidos fueron más bajos en P2."
-            else:
-                respuesta += "➖ Conclusión: La mediana se mantuvo igual en ambos parciales."
-
-            with st.sidebar:
-                burbuja_bot_animada(respuesta, st.empty())
-
-        elif "rango" in pregunta:
-            p1 = estadisticas_dict['P1']['rango']
-            p2 = estadisticas_dict['P2']['rango']
-
-            respuesta = (
-                "📏 Rango (Máx - Mín)\n"
-                "El rango muestra qué tan dispersas están las calificaciones, comparando la más alta con la más baja.\n"
-                f"🟢 P1: {p1:.2f}\n"
-                f"🔵 P2: {p2:.2f}\n"
-            )
-
-            if p2 > p1:
-                respuesta += "📈 Conclusión: Aumentó el rango en P2, hay mayor variabilidad entre los alumnos."
-            elif p2 < p1:
-                respuesta += "📉 Conclusión: Disminuyó el rango en P2, las calificaciones fueron más homogéneas."
-            else:
-                respuesta += "➖ Conclusión: El rango se mantuvo igual, la dispersión fue la misma."
-
-            with st.sidebar:
-                burbuja_bot_animada(respuesta, st.empty())
-
-        elif "q1" in pregunta or "cuartil 1" in pregunta:
-            p1 = estadisticas_dict['P1']['q1']
-            p2 = estadisticas_dict['P2']['q1']
-
-            respuesta = (
-                "🟪 Q1 (Primer Cuartil - 25%)\n"
-                "El 25% de las calificaciones están por debajo de este valor. Útil para ver el rendimiento más bajo.\n"
-                f"🟢 P1: {p1:.2f}\n"
-                f"🔵 P2: {p2:.2f}\n"
-            )
-
-            if p2 > p1:
-                respuesta += "📈 Conclusión: El Q1 subió en P2, los alumnos con menor rendimiento mejoraron."
-            elif p2 < p1:
-                respuesta += "📉 Conclusión: El Q1 bajó, hubo menor rendimiento en el 25% inferior."
-            else:
-                respuesta += "➖ Conclusión: El Q1 se mantuvo igual, sin cambios en el grupo de menor rendimiento."
-
-            with st.sidebar:
-                burbuja_bot_animada(respuesta, st.empty())
-
-        elif "q2" in pregunta or "cuartil 2" in pregunta:
-            p1 = estadisticas_dict['P1']['q2']
-            p2 = estadisticas_dict['P2']['q2']
-
-            respuesta = (
-                "🔵 Q2 (Mediana - 50%)\n"
-                "Mitad de alumnos sacó menos y mitad más que este valor. Es menos sensible a valores extremos.\n"
-                f"🟢 P1: {p1:.2f}\n"
-                f"🔵 P2: {p2:.2f}\n"
-            )
-
-            if p2 > p1:
-                respuesta += "📈 Conclusión: El Q2 subió, mejoró el rendimiento medio."
-            elif p2 < p1:
-                respuesta += "📉 Conclusión: El Q2 bajó, el rendimiento medio fue más bajo."
-            else:
-                respuesta += "➖ Conclusión: El Q2 se mantuvo igual, sin cambios en la mediana."
-
-            with st.sidebar:
-                burbuja_bot_animada(respuesta, st.empty())
-
-        elif "q3" in pregunta or "cuartil 3" in pregunta:
-            p1 = estadisticas_dict['P1']['q3']
-            p2 = estadisticas_dict['P2']['q3']
-
-            respuesta = (
-                "🟥 Q3 (Tercer Cuartil - 75%)\n"
-                "El 75% de los alumnos sacó menos o igual que este valor. Mide el rendimiento del grupo superior.\n"
-                f"🟢 P1: {p1:.2f}\n"
-                f"🔵 P2: {p2:.2f}\n"
-            )
-
-            if p2 > p1:
-                respuesta += "📈 Conclusión: El Q3 subió, el grupo alto mejoró aún más."
-            elif p2 < p1:
-                respuesta += "📉 Conclusión: El Q3 bajó, el grupo alto tuvo menor rendimiento."
-            else:
-                respuesta += "➖ Conclusión: El Q3 se mantuvo igual, sin cambios en el grupo con mejores notas."
-
+        with medicion.etapa("edubot"):
+            respuesta = responder_edubot(st.session_state.pregunta, estadisticas_dict, rangos_grupo)
             with st.sidebar:
                 burbuja_bot_animada(respuesta, st.empty())
-                
-        elif "iqr" in pregunta or "rango intercuartilico" in pregunta or "rango intercuartílico" in pregunta:
-            p1_q1 = estadisticas_dict['P1']['q1']
-            p1_q3 = estadisticas_dict['P1']['q3']
-            p2_q1 = estadisticas_dict['P2']['q1']
-            p2_q3 = estadisticas_dict['P2']['q3']
-
-            iqr_p1 = p1_q3 - p1_q1
-            iqr_p2 = p2_q3 - p2_q1
-
-            respuesta = (
-                "📏 IQR - Rango Intercuartílico\n"
-                "Es la diferencia entre el tercer cuartil (Q3) y el primero (Q1). Representa la dispersión del 50% central de los datos.\n"
-                f"🟩 P1: {iqr_p1:.2f}\n"
-                f"🟦 P2: {iqr_p2:.2f}\n"
-            )
-
-            if iqr_p2 < iqr_p1:
-                respuesta += "✅ Conclusión: La dispersión disminuyó en P2. Las calificaciones están más concentradas."
-            elif iqr_p2 > iqr_p1:
-                respuesta += "⚠️ Conclusión: La dispersión aumentó en P2. Hubo más variación entre los alumnos."
-            else:
-                respuesta += "➖ Conclusión: El IQR se mantuvo igual. La concentración de calificaciones no cambió."
-
-            with st.sidebar:
-                burbuja_bot_animada(respuesta, st.empty())
-                
-        elif "total" in pregunta or "alumnos" in pregunta:
-            p1 = estadisticas_dict['P1']['total']
-            p2 = estadisticas_dict['P2']['total']
-
-            respuesta = (
-                "👥 Total de alumnos con calificación registrada\n"
-                "Refleja cuántos estudiantes fueron evaluados en cada parcial. Las diferencias pueden deberse a inasistencias, faltas de entrega o errores en la captura de datos.\n"
-                f"🟢 P1: {p1}\n"
-                f"🔵 P2: {p2}\n"
-            )
-
-            if p2 > p1:
-                respuesta += "📈 Conclusión: Más alumnos fueron evaluados en el segundo parcial."
-            elif p2 < p1:
-                respuesta += "📉 Conclusión: Menos alumnos tienen calificación en P2. Puede indicar ausencias o datos faltantes."
-            else:
-                respuesta += "➖ Conclusión: El número de alumnos evaluados se mantuvo igual en ambos parciales."
-
-            with st.sidebar:
-                burbuja_bot_animada(respuesta, st.empty())
-                
-        elif "varianza" in pregunta:
-            p1 = estadisticas_dict['P1']['varianza']
-            p2 = estadisticas_dict['P2']['varianza']
-
-            respuesta = (
-                "📉 Varianza\n"
-                "Mide la dispersión de las calificaciones con respecto a la media. Valores altos indican más variabilidad.\n"
-                f"🟢 P1: {p1:.2f}\n"
-                f"🔵 P2: {p2:.2f}\n"
-            )
-
-            if p2 > p1:
-                respuesta += "⚠️ Conclusión: La varianza aumentó en P2, mayor dispersión entre los alumnos."
-            elif p2 < p1:
-                respuesta += "✅ Conclusión: La varianza disminuyó en P2, las calificaciones están más concentradas."
-            else:
-                respuesta += "➖ Conclusión: La varianza se mantuvo igual en ambos parciales."
-
-            with st.sidebar:
-                burbuja_bot_animada(respuesta, st.empty())
-
-        elif "boxplot" in pregunta:
-            respuesta = (
-                "📦 Boxplot\n"
-                "Gráfico que muestra la distribución de calificaciones, destacando mediana, cuartiles y posibles valores atípicos.\n"
-                "Es útil para visualizar la dispersión y detectar datos extremos.\n"
-                "Para más detalles, revisa las gráficas generadas en el panel principal."
-            )
-            with st.sidebar:
-                burbuja_bot_animada(respuesta, st.empty())
-
-        elif "pdf" in pregunta or "descargar" in pregunta:
-            with st.sidebar:
-                burbuja_bot_animada("📄 Puedes generar un PDF con las gráficas y estadísticas actuales usando el botón que aparece al final del análisis.", st.empty())
-        else:
-            with st.sidebar:
-                burbuja_bot_animada("❓ No entendí la pregunta. Puedes intentar con: media, moda, varianza, IQR, PDF, etc.", st.empty())
 
 # ----------- Histograma  ------------------
-st.markdown(f"## 📘 <b>Análisis de {asignatura_seleccionada}</b>", unsafe_allow_html=True)
-
-fig, axes = plt.subplots(1, 2, figsize=(14, 6))
-fig.patch.set_facecolor('#121212')  # fondo oscuro
-
-for idx, parcial in enumerate(['P1', 'P2']):
-    calificaciones = calificaciones_dict[parcial]
-    if calificaciones.empty:
-        axes[idx].set_title(f'{parcial} - Sin datos', color='white')
-        axes[idx].axis('off')
-        continue
-
-    conteo, _ = np.histogram(calificaciones, bins=rango_bins)
-    total = len(calificaciones)
-    porcentajes = (conteo / total) * 100
-
-    axes[idx].set_facecolor('#121212')  # fondo oscuro subplot
-    #solo si es recta la linea 
-    #axes[idx].plot(x_vals, conteo, color='cyan', linewidth=2, marker='o', linestyle='-', label='Tendencia')
-    #comienza la linea curva
-    barras = axes[idx].bar(rango_labels, conteo, color=[rango_colores[label] for label in rango_labels])
-    x_vals = np.arange(len(rango_labels))
-    x_new = np.linspace(x_vals.min(), x_vals.max(), 300) 
-    spl = make_interp_spline(x_vals, conteo, k=3)  # k=3 es spline cúbica
-    conteo_smooth = spl(x_new)
-    # Dibujar la curva suave
-    # Capa inferior como "sombra"
-    axes[idx].plot(x_new, conteo_smooth, color='deepskyblue', linewidth=3)
-
-    # Capa superior real
-    axes[idx].plot(x_new, conteo_smooth, color="#7230c9", linewidth=3, label='tendencia')
-    #termina la de la curva xd 
-    
-    # Porcentajes encima de cada barra
-    for bar, pct in zip(barras, porcentajes):
-        height = bar.get_height()
-        axes[idx].text(bar.get_x() + bar.get_width()/2, height + 0.3,
-                       f'{pct:.1f}%', ha='center', color='white', fontsize=10, fontweight='bold')
-
-    axes[idx].set_title(f'Histograma {parcial}', color='white', fontsize=16, fontweight='bold')
-    axes[idx].set_xlabel('Rango', color='white', fontsize=12)
-    axes[idx].set_ylabel('Frecuencia', color='white', fontsize=12)
-    axes[idx].tick_params(colors='white')  # ticks blancos
-    #la esa barrita de tendencia xd 
-    axes[idx].legend(facecolor='#121212', edgecolor='white', labelcolor='white')
-
-
-plt.tight_layout()
-st.pyplot(fig)
+st.markdown(f"## 📘 <b>Análisis de {titulo_seleccion}</b>", unsafe_allow_html=True)
+
+# Motor de las gráficas de la página: "vega" manda sólo los datos agregados y
+# el navegador dibuja; "matplotlib" manda PNG renderizados en el servidor. El
+# PDF siempre usa matplotlib. Se cambia con CALIFICACIONES_GRAFICAS o ?graficas=
+MOTORES_GRAFICAS = ("vega", "matplotlib")
+motor_graficas = st.query_params.get("graficas", os.environ.get("CALIFICACIONES_GRAFICAS", "vega"))
+if motor_graficas not in MOTORES_GRAFICAS:
+    motor_graficas = MOTORES_GRAFICAS[0]
+
+# Identificador del grupo (incluye la versión del Excel y la vista) para la caché de imágenes
+clave_grupo = (version_datos, vista_seleccionada, *clave_seleccion)
+
+# Registro de las gráficas de este rerun (lo usa el PDF); se reinicia en cada rerun
+registro_figuras = RegistroFiguras()
+st.session_state.registro_figuras = registro_figuras
+
+# Las imágenes se sirven ya renderizadas si el grupo se vio antes
+with medicion.etapa("grafica_histograma"):
+    if motor_graficas == "vega":
+        st.vega_lite_chart(spec_histograma(rangos_grupo), theme=None)
+    else:
+        png_histograma = grafica_png(clave_grupo, None, "histograma",
+                                     lambda: figura_histograma(rangos=rangos_grupo, parciales=parciales))
+        st.image(registro_figuras.registrar("histograma", png_histograma))
 
 # Aquí agregas la explicación/comparativa abajo de la gráfica
 with st.expander("📋 Ver análisis del histograma ⬇️"):
     st.markdown("""
-    - El histograma nos muestra la frecuencia de calificaciones por rango para ambos parciales.
-    - Puedes observar cómo se distribuyen las calificaciones en P1 y P2, y si hubo cambios en la concentración o dispersión.
+    - El histograma nos muestra la frecuencia de calificaciones por rango para cada parcial.
+    - Puedes observar cómo se distribuyen las calificaciones entre parciales, y si hubo cambios en la concentración o dispersión.
     """)
 
     # Ejemplo conclusión simple con media para agregar info extra:
-    p1_media = estadisticas_dict['P1']['media']
-    p2_media = estadisticas_dict['P2']['media']
-
-    if p2_media > p1_media:
-        st.success("✅ La media en P2 aumentó, lo que indica una mejora general en las calificaciones.")
-    elif p2_media < p1_media:
-        st.warning("⚠️ La media en P2 disminuyó, lo que podría indicar un rendimiento más bajo.")
-    else:
-        st.info("➖ La media se mantuvo estable entre ambos parciales.")
+    for cambio in tendencias_grupo:
+        desde, hasta = cambio["desde"], cambio["hasta"]
+        if cambio["media"] > 0:
+            st.success(f"✅ La media en {hasta} aumentó respecto a {desde}, lo que indica una mejora general en las calificaciones.")
+        elif cambio["media"] < 0:
+            st.warning(f"⚠️ La media en {hasta} disminuyó respecto a {desde}, lo que podría indicar un rendimiento más bajo.")
+        else:
+            st.info(f"➖ La media se mantuvo estable entre {desde} y {hasta}.")
 
 # ------------------ Gráfica de pastel -------------------
-st.markdown(f"## 📘 <b>Análisis de {asignatura_seleccionada}</b>", unsafe_allow_html=True)
+st.markdown(f"## 📘 <b>Análisis de {titulo_seleccion}</b>", unsafe_allow_html=True)
 
-# Contenedor de dos columnas paralelas (una para cada parcial)
-col1, col2 = st.columns(2)
+# Contenedor con una columna paralela para cada parcial
+columnas_pastel = st.columns(len(parciales))
 
-for idx, parcial in enumerate(['P1', 'P2']):
-    col = col1 if idx == 0 else col2  # Selecciona columna actual
-    calificaciones = calificaciones_dict[parcial]
-    
-    if calificaciones.empty:
+# Datos de cada pastel para la leyenda del PDF (listas vacías si no hay datos)
+colores_pies, etiquetas_pies, porcentajes_pies = [], [], []
+
+for col, parcial in zip(columnas_pastel, parciales):
+    if parcial not in rangos_grupo:
         col.markdown(f"### {parcial} - Sin datos")
+        for lista in (colores_pies, etiquetas_pies, porcentajes_pies):
+            lista.append([])
         continue
 
     # -------- Prepara datos --------
-    ranges = pd.cut(calificaciones, bins=rango_bins, labels=rango_labels, right=False)
-    conteo = ranges.value_counts(sort=False)
-    valores = conteo.values
-    etiquetas = conteo.index.tolist()
-    colores = [rango_colores[label] for label in etiquetas]
-    total = valores.sum()
-    porcentajes = valores / total * 100
-
-    # -------- Crear figura para este parcial --------
-    fig, ax = plt.subplots(figsize=(6, 6), facecolor='#121212')
-    ax.set_facecolor('#121212')
-
-    ax.pie(
-        valores,
-        labels=None,           # sin etiquetas
-        autopct=None,          # sin porcentaje
-        startangle=90,
-        colors=colores,
-        wedgeprops={'edgecolor': '#121212', 'linewidth': 1.5}
-    )
-
-    ax.set_title(f"Distribución - {parcial}", color='white', fontsize=15, fontweight='bold')
-
-    # Mostrar gráfica
-    col.pyplot(fig)
+    colores, etiquetas, porcentajes = (rangos_grupo[parcial][llave]
+                                       for llave in ("colores", "etiquetas", "porcentajes_pastel"))
+    colores_pies.append(colores)
+    etiquetas_pies.append(etiquetas)
+    porcentajes_pies.append(porcentajes)
+
+    # -------- Figura para este parcial (desde la caché si ya existe) --------
+    with medicion.etapa(f"grafica_pastel_{parcial}"):
+        if motor_graficas == "vega":
+            col.vega_lite_chart(spec_pastel(rangos_grupo[parcial], parcial), theme=None)
+        else:
+            png_pastel = grafica_png(clave_grupo, parcial, "pastel",
+                                     lambda: figura_pastel(rangos_grupo[parcial]["conteo"], parcial))
+            col.image(registro_figuras.registrar(f"pastel_{parcial}", png_pastel))
 
     # -------- Tabla debajo de gráfica --------
     tabla = "<table style='color:white; font-size:13px; font-weight:normal;'>"
@@ -655,84 +418,38 @@ for idx, parcial in enumerate(['P1', 'P2']):
 
     col.markdown(tabla, unsafe_allow_html=True)
 
-# Guardar las variables para el PDF
-colores_pie1 = [rango_colores[label] for label in pd.cut(calificaciones_dict['P1'], bins=rango_bins, labels=rango_labels, right=False).value_counts(sort=False).index.tolist()]
-etiquetas_pie1 = rango_labels
-valores1 = pd.cut(calificaciones_dict['P1'], bins=rango_bins, labels=rango_labels, right=False).value_counts(sort=False).values
-porcentajes_pie1 = valores1 / valores1.sum() * 100
-
-colores_pie2 = [rango_colores[label] for label in pd.cut(calificaciones_dict['P2'], bins=rango_bins, labels=rango_labels, right=False).value_counts(sort=False).index.tolist()]
-etiquetas_pie2 = rango_labels
-valores2 = pd.cut(calificaciones_dict['P2'], bins=rango_bins, labels=rango_labels, right=False).value_counts(sort=False).values
-porcentajes_pie2 = valores2 / valores2.sum() * 100
-
 with st.expander("🥧 Análisis de la Gráfica de Distribución ⬇️"):
     st.markdown("""
-    - Las gráficas de pastel muestran la proporción de alumnos en cada rango de calificación para P1 y P2.
+    - Las gráficas de pastel muestran la proporción de alumnos en cada rango de calificación para cada parcial.
     - Permiten visualizar fácilmente qué porcentaje de alumnos está en rangos altos, medios o bajos.
-    - Sirven para comparar la distribución de calificaciones entre ambos parciales y detectar mejoras o retrocesos.
+    - Sirven para comparar la distribución de calificaciones entre parciales y detectar mejoras o retrocesos.
     """)
 
-    # Ejemplo conclusión simple basada en la proporción de aprobados (>= 60)
-    p1_aprobados = calificaciones_dict['P1'][calificaciones_dict['P1'] >= 60].count()
-    p2_aprobados = calificaciones_dict['P2'][calificaciones_dict['P2'] >= 60].count()
-    total_p1 = estadisticas_dict['P1']['total']
-    total_p2 = estadisticas_dict['P2']['total']
-
-    porc_aprobados_p1 = (p1_aprobados / total_p1)*100 if total_p1 > 0 else 0
-    porc_aprobados_p2 = (p2_aprobados / total_p2)*100 if total_p2 > 0 else 0
-
-    if porc_aprobados_p2 > porc_aprobados_p1:
-        st.success(f"✅ La proporción de alumnos aprobados aumentó de {porc_aprobados_p1:.1f}% en P1 a {porc_aprobados_p2:.1f}% en P2.")
-    elif porc_aprobados_p2 < porc_aprobados_p1:
-        st.warning(f"⚠️ La proporción de alumnos aprobados disminuyó de {porc_aprobados_p1:.1f}% en P1 a {porc_aprobados_p2:.1f}% en P2.")
-    else:
-        st.info(f"➖ La proporción de alumnos aprobados se mantuvo estable en {porc_aprobados_p1:.1f}%.")
+    # Ejemplo conclusión simple basada en la proporción de aprobados (>= 60),
+    # contada desde las calificaciones acumuladas del grupo o de la vista
+    porc_aprobados = consulta.aprobados_de(clave_seleccion)
+
+    for cambio in tendencias_grupo:
+        desde, hasta = cambio["desde"], cambio["hasta"]
+        antes, despues = porc_aprobados[desde], porc_aprobados[hasta]
+        if despues > antes:
+            st.success(f"✅ La proporción de alumnos aprobados aumentó de {antes:.1f}% en {desde} a {despues:.1f}% en {hasta}.")
+        elif despues < antes:
+            st.warning(f"⚠️ La proporción de alumnos aprobados disminuyó de {antes:.1f}% en {desde} a {despues:.1f}% en {hasta}.")
+        else:
+            st.info(f"➖ La proporción de alumnos aprobados se mantuvo estable en {antes:.1f}% entre {desde} y {hasta}.")
 
 # ----------- Boxplot ------------------
-st.markdown(f"## 📘 <b>Análisis de {asignatura_seleccionada}</b>", unsafe_allow_html=True)
-
-if not grupo_df[['P1', 'P2']].dropna(how='all').empty:
-    fig, ax = plt.subplots(figsize=(7.5, 5.5), facecolor='#121212')
-    fig.patch.set_facecolor('#121212')  # Fondo global oscuro
-
-    # --- BOXPLOT ---
-    sns.boxplot(
-        data=grupo_df[['P1', 'P2']],
-        palette=['#e63946', '#06d6a0'],  # Rojo coral y verde menta
-        width=0.4,
-        linewidth=2.2,
-        fliersize=0,
-        ax=ax
-    )
-
-    # --- STRIP PLOT para puntos individuales ---
-    sns.stripplot(
-        data=grupo_df[['P1', 'P2']],
-        jitter=0.25,
-        dodge=True,
-        size=6,
-        color='white',
-        alpha=0.5,
-        ax=ax
-    )
+st.markdown(f"## 📘 <b>Análisis de {titulo_seleccion}</b>", unsafe_allow_html=True)
 
-    # --- Ejes y fondo ---
-    ax.set_facecolor('#121212')
-    ax.tick_params(colors='white', labelsize=12)
-    ax.set_ylabel('Calificación', color='#f1f1f1', fontsize=13)
-    ax.set_xlabel('', color='white')
-
-    # --- Borde blanco ---
-    for spine in ax.spines.values():
-        spine.set_color('white')
-        spine.set_linewidth(1.3)
-
-    # --- Grid sutil en Y ---
-    ax.yaxis.grid(True, linestyle='--', linewidth=0.6, color='gray', alpha=0.3)
-    ax.set_axisbelow(True)
-
-    st.pyplot(fig)
+cajas_grupo = consulta.cajas_de(clave_seleccion)
+if cajas_grupo:
+    with medicion.etapa("grafica_boxplot"):
+        if motor_graficas == "vega":
+            st.vega_lite_chart(spec_boxplot(cajas_grupo), theme=None)
+        else:
+            png_boxplot = grafica_png(clave_grupo, None, "boxplot", lambda: figura_boxplot(cajas=cajas_grupo))
+            st.image(registro_figuras.registrar("boxplot", png_boxplot))
 else:
     st.warning("⚠️ No hay suficientes datos para mostrar el análisis boxplot.")
 
@@ -749,36 +466,30 @@ with st.expander("📦 Análisis del Diagrama de Caja (Boxplot) ⬇️"):
 
     ### 📈 Aplicación en el análisis académico
     - 📊 El boxplot permite observar la **distribución y variabilidad** de las calificaciones por parcial.
-    - 🔍 Comparar los boxplots de P1 y P2 permite identificar **cambios en el rendimiento**.
-    - ✅ Una **caja más compacta** o **menores bigotes en P2** sugiere una mejora en la **consistencia académica** del grupo.
+    - 🔍 Comparar los boxplots de cada parcial permite identificar **cambios en el rendimiento**.
+    - ✅ Una **caja más compacta** o **menores bigotes en el parcial más reciente** sugiere una mejora en la **consistencia académica** del grupo.
     """)
 
-    # Comparación de IQR
-    p1_q1 = estadisticas_dict['P1']['q1']
-    p1_q3 = estadisticas_dict['P1']['q3']
-    p2_q1 = estadisticas_dict['P2']['q1']
-    p2_q3 = estadisticas_dict['P2']['q3']
+    for cambio in tendencias_grupo:
+        desde, hasta = cambio["desde"], cambio["hasta"]
+        if len(tendencias_grupo) > 1:
+            st.markdown(f"**{desde} → {hasta}**")
 
-    iqr_p1 = p1_q3 - p1_q1
-    iqr_p2 = p2_q3 - p2_q1
-
-    if iqr_p2 < iqr_p1:
-        st.success("✅ La dispersión (IQR) disminuyó en P2, indicando mayor concentración de calificaciones.")
-    elif iqr_p2 > iqr_p1:
-        st.warning("⚠️ La dispersión (IQR) aumentó en P2, lo que indica más variabilidad en el grupo.")
-    else:
-        st.info("➖ La dispersión (IQR) se mantuvo estable entre ambos parciales.")
-
-    # Comparación de medianas
-    p1_mediana = estadisticas_dict['P1']['mediana']
-    p2_mediana = estadisticas_dict['P2']['mediana']
+        # Comparación de IQR
+        if cambio["iqr"] < 0:
+            st.success(f"✅ La dispersión (IQR) disminuyó en {hasta}, indicando mayor concentración de calificaciones.")
+        elif cambio["iqr"] > 0:
+            st.warning(f"⚠️ La dispersión (IQR) aumentó en {hasta}, lo que indica más variabilidad en el grupo.")
+        else:
+            st.info(f"➖ La dispersión (IQR) se mantuvo estable entre {desde} y {hasta}.")
 
-    if p2_mediana > p1_mediana:
-        st.success("✅ La mediana aumentó en P2, lo cual sugiere una mejora general en el rendimiento.")
-    elif p2_mediana < p1_mediana:
-        st.warning("⚠️ La mediana disminuyó en P2, lo que podría reflejar un menor rendimiento.")
-    else:
-        st.info("➖ La mediana se mantuvo igual entre ambos parciales.")
+        # Comparación de medianas
+        if cambio["mediana"] > 0:
+            st.success(f"✅ La mediana aumentó en {hasta}, lo cual sugiere una mejora general en el rendimiento.")
+        elif cambio["mediana"] < 0:
+            st.warning(f"⚠️ La mediana disminuyó en {hasta}, lo que podría reflejar un menor rendimiento.")
+        else:
+            st.info(f"➖ La mediana se mantuvo igual entre {desde} y {hasta}.")
 
 with st.expander("👨‍💻 Créditos del Proyecto — Equipo 603"):
     st.markdown("""
@@ -835,225 +546,49 @@ with st.expander("👨‍💻 Créditos del Proyecto — Equipo 603"):
     </div>
     """, unsafe_allow_html=True)
             
-# Función para quitar emojis (¡clave para evitar errores!)
-def quitar_emojis(texto):
-    emoji_pattern = re.compile("["
-        u"\U0001F600-\U0001F64F"  # emoticonos
-        u"\U0001F300-\U0001F5FF"  # símbolos y pictogramas
-        u"\U0001F680-\U0001F6FF"  # transporte y mapas
-        u"\U0001F1E0-\U0001F1FF"  # banderas
-        u"\U00002700-\U000027BF"
-        u"\U0001F900-\U0001F9FF"
-        u"\U0001FA70-\U0001FAFF"
-        "]+", flags=re.UNICODE)
-    return emoji_pattern.sub(r'', texto)
-
-#--------------Creación del PDF sin errores de emoji----------------
-def generar_pdf(calificaciones_dict, carrera, grupo, asignatura, semestre,
-                colores_pies=None, etiquetas_pies=None, porcentajes_pies=None):
-
-    pdf = FPDF(orientation='P', unit='mm', format='A4')
-    
-    def poner_fondo_negro():
-        pdf.set_fill_color(0, 0, 0)
-        pdf.rect(0, 0, 210, 297, 'F')
-
-    def quitar_emojis(texto):
-        return texto.encode('ascii', 'ignore').decode('ascii')
-
-    # Primera página - encabezado y estadísticas
-    pdf.add_page()
-    poner_fondo_negro()
-    pdf.set_text_color(0, 255, 213)
-    pdf.set_font("Arial", 'B', 14)
-    pdf.cell(0, 10, quitar_emojis("Reporte de Calificaciones"), ln=True, align='C')
-
-    pdf.set_text_color(255, 255, 255)
-    pdf.set_font("Arial", '', 12)
-    pdf.ln(5)
-    encabezado = f"Carrera: {carrera} | Asignatura: {asignatura} | Grupo: {grupo} | Semestre: {semestre}"
-    pdf.cell(0, 10, quitar_emojis(encabezado), ln=True)
-
-    for parcial, calificaciones in calificaciones_dict.items():
-        if calificaciones.empty:
-            continue
-        pdf.set_text_color(0, 255, 213)
-        pdf.set_font("Arial", 'B', 12)
-        pdf.ln(8)
-        pdf.cell(0, 10, quitar_emojis(f"Estadísticas de {parcial}"), ln=True)
-        pdf.set_text_color(255, 255, 255)
-        pdf.set_font("Arial", '', 11)
-
-        moda_resultado = stats.mode(calificaciones, nan_policy='omit', keepdims=True)
-        moda_valor = moda_resultado.mode[0] if len(moda_resultado.mode) > 0 else np.nan
-
-        pdf.cell(0, 8, f"Media: {calificaciones.mean():.2f}", ln=True)
-        pdf.cell(0, 8, f"Mediana: {calificaciones.median():.2f}", ln=True)
-        pdf.cell(0, 8, f"Moda: {moda_valor:.2f}", ln=True)
-        pdf.cell(0, 8, f"Varianza: {calificaciones.var():.2f}", ln=True)
-        pdf.cell(0, 8, f"Rango: {calificaciones.max() - calificaciones.min():.2f}", ln=True)
-
-    # Guardar gráficas como imágenes temporales
-    img_paths = []
-    for fig_num in plt.get_fignums():
-        fig = plt.figure(fig_num)
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        fig.savefig(temp_file.name, bbox_inches='tight')
-        img_paths.append(temp_file.name)
-
-    # Intentar poner las primeras 2 gráficas juntas en una sola página, verticalmente
-    if len(img_paths) >= 2:
-        pdf.add_page()
-        poner_fondo_negro()
-        pdf.set_text_color(255, 255, 255)
-        pdf.set_font("Arial", 'B', 14)
-        pdf.cell(0, 10, "Gráficas 1 y 2", ln=True, align='C')
-
-        max_width = 180  # casi el ancho total con margen
-        max_height = 120  # la mitad aprox. de la página menos márgenes
-
-        y_positions = [25, 25 + max_height + 10]  # arriba y abajo con separación de 10mm
-        x_position = 15  # margen lateral fijo
-
-        for i in range(2):
-            img_path = img_paths[i]
-            im = Image.open(img_path)
-            width_px, height_px = im.size
-            dpi = im.info.get('dpi', (72, 72))[0]
-
-            width_mm = (width_px / dpi) * 25.4
-            height_mm = (height_px / dpi) * 25.4
-
-            scale = min(max_width / width_mm, max_height / height_mm, 1)
-
-            final_width = width_mm * scale
-            final_height = height_mm * scale
-
-            pdf.image(img_path, x=x_position, y=y_positions[i], w=final_width, h=final_height)
-
-    # Ahora la gráfica 3 (boxplot) en página nueva
-    if len(img_paths) >= 3:
-        pdf.add_page()
-        poner_fondo_negro()
-        pdf.set_text_color(255, 255, 255)
-        pdf.set_font("Arial", 'B', 14)
-        pdf.cell(0, 10, "Gráfica 3 - Boxplot", ln=True, align='C')
-
-        img_path = img_paths[2]
-        im = Image.open(img_path)
-        width_px, height_px = im.size
-        dpi = im.info.get('dpi', (72, 72))[0]
-
-        width_mm = (width_px / dpi) * 25.4
-        height_mm = (height_px / dpi) * 25.4
-
-        # Escalar para que quepa casi toda la página con margen
-        max_width = 180
-        max_height = 250
-
-        scale = min(max_width / width_mm, max_height / height_mm, 1)
-
-        final_width = width_mm * scale
-        final_height = height_mm * scale
-
-        pdf.image(img_path, x=15, y=25, w=final_width, h=final_height)
-        
-        # Luego de las gráficas, pon leyendas si existen
-        if colores_pies and etiquetas_pies and porcentajes_pies:
-            pdf.set_xy(10, y_positions[1] + max_height + 5)
-            pdf.set_font("Arial", 'B', 12)
-            pdf.cell(0, 10, "Leyendas:", ln=True)
-            pdf.set_font("Arial", '', 11)
-            poner_fondo_negro()
-
-            y_leyenda = pdf.get_y()
-            ancho_cuadro = 8
-            alto_cuadro = 8
-
-            # Leyendas para las 2 gráficas
-            for i in range(2):
-                colores = list(colores_pies[i])
-                etiquetas = list(etiquetas_pies[i])
-                porcentajes = list(porcentajes_pies[i])
-
-                pdf.set_text_color(255, 255, 255)
-                pdf.set_font("Arial", 'B', 12)
-                pdf.cell(0, 10, f"Datos Grafica {i + 1}", ln=True)
-                pdf.set_font("Arial", '', 11)
-
-                for idx, (c, etiqueta, porcentaje) in enumerate(zip(colores, etiquetas, porcentajes)):
-                    x = 10
-                    y = pdf.get_y() + 2
-
-                    r, g, b = tuple(int(c.strip('#')[j:j+2], 16) for j in (0, 2, 4))
-                    pdf.set_fill_color(r, g, b)
-                    pdf.rect(x, y, ancho_cuadro, alto_cuadro, 'F')
-                    pdf.set_xy(x + ancho_cuadro + 2, y - 2)
-                    pdf.set_text_color(255, 255, 255)
-                    pdf.cell(60, 10, etiqueta, ln=0)
-                    pdf.cell(20, 10, f"{porcentaje:.1f}%", ln=1)
-
-                pdf.ln(5)
-    else:
-        # Si hay menos de 2 gráficas o no caben juntas, cada una en página individual
-        for i, img in enumerate(img_paths):
-            pdf.add_page()
-            poner_fondo_negro()
-            pdf.set_text_color(255, 255, 255)
-            pdf.set_font("Arial", 'B', 14)
-            pdf.cell(0, 10, quitar_emojis(f"Grafica {i + 1}"), ln=True, align='C')
-            pdf.image(img, x=10, y=25, w=190)
-
-    # Guardar y limpiar imágenes temporales
-    pdf_path = os.path.join(tempfile.gettempdir(), "reporte_calificaciones.pdf")
-    pdf.output(pdf_path)
-
-    for img in img_paths:
-        try:
-            os.remove(img)
-        except PermissionError:
-            pass
-
-    return pdf_path
-# ------------------ Extraer datos pastel para PDF -------------------
-colores1, etiquetas1, porcentajes1 = [], [], []
-colores2, etiquetas2, porcentajes2 = [], [], []
-
-for idx, parcial in enumerate(['P1', 'P2']):
-    calificaciones = calificaciones_dict[parcial]
-    if calificaciones.empty:
-        continue
-
-    ranges = pd.cut(calificaciones, bins=rango_bins, labels=rango_labels, right=False)
-    conteo = ranges.value_counts(sort=False)
-    valores = conteo.values
-    etiquetas = conteo.index.tolist()
-    colores = [rango_colores[label] for label in etiquetas]
-    total = valores.sum()
-    porcentajes = valores / total * 100
-
-    if parcial == 'P1':
-        colores1, etiquetas1, porcentajes1 = colores, etiquetas, porcentajes
-    else:
-        colores2, etiquetas2, porcentajes2 = colores, etiquetas, porcentajes
-
 # ------------ Botón que se encarga de generar y descargar el PDF -----------------
 if st.button("📥 Generar reporte PDF"):
-    pdf_file = generar_pdf(
-        calificaciones_dict=calificaciones_dict,
-        carrera=carrera_seleccionada,
-        grupo=grupo_seleccionado,
-        asignatura=asignatura_seleccionada,
-        semestre=semestre_seleccionado,
-        colores_pies=[colores1, colores2],         # ✅ Correcto
-        etiquetas_pies=[etiquetas1, etiquetas2],   # ✅ Correcto
-        porcentajes_pies=[porcentajes1, porcentajes2]  # ✅ Correcto
+    with medicion.etapa("pdf"):
+        from calificaciones.reporte import generar_pdf  # fpdf/PIL sólo al pedir el PDF
+
+        # El mismo grupo con la misma versión de datos da el mismo PDF. Con
+        # Vega no hay PNG en el registro: el PDF arma sus propias gráficas
+        if motor_graficas == "vega":
+            pdf_bytes = consulta.reporte_pdf(clave_seleccion)
+        else:
+            pdf_bytes = cache_resultados.obtener((version_datos, "pdf_pagina", vista_seleccionada, clave_seleccion), lambda: generar_pdf(
+                estadisticas_dict=estadisticas_dict,
+                carrera=carrera_seleccionada,
+                grupo=grupo_seleccionado,
+                asignatura=asignatura_seleccionada,
+                semestre=semestre_seleccionado,
+                registro_figuras=st.session_state.registro_figuras,
+                colores_pies=colores_pies,         # ✅ Uno por parcial, en orden
+                etiquetas_pies=etiquetas_pies,
+                porcentajes_pies=porcentajes_pies
+            ))
+
+    st.download_button(
+        label="📄 Descargar PDF",
+        data=pdf_bytes,
+        file_name="Reporte_Calificaciones.pdf",
+        mime="application/pdf"
     )
 
-    with open(pdf_file, "rb") as f:
-        st.download_button(
-            label="📄 Descargar PDF",
-            data=f,
-            file_name="Reporte_Calificaciones.pdf",
-            mime="application/pdf"
-        )
+# ------------ Panel oculto de rendimiento (agrega ?perf=1 a la URL) -----------------
+medicion.terminar()
+
+if st.query_params.get("perf") == "1":
+    with st.sidebar.expander("⏱️ perf", expanded=True):
+        resumen = cronometro.resumen()
+        memoria = memoria_planteles(ingesta["manifiesto"], [plantel_seleccionado])
+        st.caption(f"Tabla en memoria: {memoria['antes'] / 2**20:.2f} MB → "
+                   f"{memoria['despues'] / 2**20:.2f} MB")
+        st.caption(f"Últimos {len(cronometro)} reruns (todas las sesiones)")
+        st.dataframe(pd.DataFrame.from_dict(resumen, orient="index").round(2))
+        st.caption("Cachés compartidas")
+        st.dataframe(pd.DataFrame({"analisis": cache_analisis.estadisticas(),
+                                   "resultados": cache_resultados.estadisticas(),
+                                   "figuras": cache_figuras.estadisticas()}).T.round(2))
+        st.download_button("Exportar JSONL", cronometro.a_jsonl(),
+                           file_name="tiempos_reruns.jsonl", mime="application/jsonl")
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calificaciones.esquema import normalizar_esquema
+
+
+@pytest.fixture
+def calificaciones_df():
+    # Libro chico con el esquema del real: varios grupos por asignatura,
+    # calificaciones en décimas, algunas vacías y un grupo de un solo alumno
+    generador = np.random.default_rng(603)
+    filas = 600
+    df = pd.DataFrame({
+        "Semestre": generador.choice([2, 4], size=filas),
+        "Carrera": generador.choice(["Programación", "Contabilidad"], size=filas),
+        "Grupo": generador.choice(["A", "B", "C"], size=filas),
+        "Asignatura": generador.choice(["Inglés", "Química"], size=filas),
+        "P1": np.round(generador.uniform(5, 10, size=filas), 1),
+        "P2": np.round(generador.uniform(5, 10, size=filas), 1),
+    })
+    df.loc[generador.random(filas) < 0.05, "P2"] = np.nan
+    solo = pd.DataFrame({"Semestre": [6], "Carrera": ["Contabilidad"], "Grupo": ["Z"],
+                         "Asignatura": ["Inglés"], "P1": [7.5], "P2": [np.nan]})
+    return normalizar_esquema(pd.concat([df, solo], ignore_index=True))
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from calificaciones.acumuladores import Acumuladores
+from calificaciones.esquema import a_float64
+from calificaciones.estadisticas import MEDIDAS, calcular_cubo
+from calificaciones.filtros import NIVELES
+
+
+def _por_llaves(cubo):
+    # Mismo índice para comparar cubos con dimensiones categóricas o de texto
+    plano = cubo.reset_index()
+    llaves = [columna for columna in plano.columns if columna not in MEDIDAS]
+    plano[llaves] = plano[llaves].astype(str)
+    return plano.set_index(llaves).sort_index().astype(np.float64)
+
+
+def test_cubo_igual_a_calcular_cubo(calificaciones_df):
+    cubo = Acumuladores.desde_filas(calificaciones_df).cubo()
+    pd.testing.assert_frame_equal(_por_llaves(cubo), _por_llaves(calcular_cubo(calificaciones_df)),
+                                  check_exact=False, rtol=1e-12)
+
+
+def test_agregar_por_lotes(calificaciones_df):
+    # Lotes con grupos nuevos y ya vistos, y un cubo() a la mitad: el cubo
+    # actualizado sólo en los grupos tocados es igual al de todas las filas
+    acumuladores = Acumuladores()
+    lotes = np.array_split(np.arange(len(calificaciones_df)), 5)
+    for posiciones in lotes[:2]:
+        acumuladores.agregar(calificaciones_df.iloc[posiciones])
+    acumuladores.cubo()
+    for posiciones in lotes[2:]:
+        acumuladores.agregar(calificaciones_df.iloc[posiciones])
+
+    esperado = Acumuladores.desde_filas(calificaciones_df)
+    pd.testing.assert_frame_equal(acumuladores.cubo(), esperado.cubo(), check_exact=False, rtol=1e-12)
+    assert acumuladores.filas == len(calificaciones_df)
+    pd.testing.assert_series_equal(acumuladores.aprobados(6), esperado.aprobados(6))
+
+
+def test_copiar_no_comparte_lo_acumulado(calificaciones_df):
+    base = Acumuladores.desde_filas(calificaciones_df.iloc[:300])
+    antes = base.cubo()
+    base.copiar().agregar(calificaciones_df.iloc[300:]).cubo()
+    pd.testing.assert_frame_equal(base.cubo(), antes)
+
+
+def test_combinar_igual_a_agregar(calificaciones_df):
+    uno = Acumuladores.desde_filas(calificaciones_df.iloc[:250])
+    otro = Acumuladores.desde_filas(calificaciones_df.iloc[250:])
+    pd.testing.assert_frame_equal(_por_llaves(uno.combinar(otro).cubo()),
+                                  _por_llaves(calcular_cubo(calificaciones_df)), check_exact=False, rtol=1e-12)
+
+
+@pytest.mark.parametrize("niveles", [["Semestre", "Carrera"], ["Carrera"], []])
+def test_resumir_igual_a_groupby(calificaciones_df, niveles):
+    resumido = Acumuladores.desde_filas(calificaciones_df).resumir(niveles).cubo()
+
+    # Directo sobre las filas, sin pasar por estadisticas.py
+    largo = (calificaciones_df.melt(id_vars=NIVELES, value_vars=["P1", "P2"], var_name="parcial",
+                                    value_name="calificacion")
+             .dropna(subset=["calificacion"]))
+    # Las calificaciones se guardan en float32; float64 exacto como en formato_largo
+    largo["calificacion"] = a_float64(largo["calificacion"])
+    grupos = largo.groupby(niveles + ["parcial"], observed=True)["calificacion"]
+    esperado = grupos.agg(media="mean", varianza="var", min="min", max="max", total="count",
+                          mediana="median")
+    esperado["q1"] = grupos.quantile(0.25)
+    esperado["q3"] = grupos.quantile(0.75)
+
+    medidas = list(esperado.columns)
+    pd.testing.assert_frame_equal(_por_llaves(resumido)[medidas], _por_llaves(esperado), check_exact=False,
+                                  rtol=1e-12)
+    pd.testing.assert_frame_equal(_por_llaves(resumido),
+                                  _por_llaves(calcular_cubo(calificaciones_df, niveles=niveles)),
+                                  check_exact=False, rtol=1e-12)
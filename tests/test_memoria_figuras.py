@@ -0,0 +1,74 @@
+# Regresión de memoria: simula muchos reruns de la página renderizando las 4
+# gráficas y registrándolas, y verifica que el RSS se mantenga plano. Cada
+# rerun tarda ~1 s (4 figuras renderizadas): sólo corre con `-m slow`
+#
+#   python -m pytest -m slow tests/test_memoria_figuras.py
+import gc
+import os
+import resource
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from calificaciones.graficas import RegistroFiguras, figura_boxplot, figura_histograma, figura_pastel
+from calificaciones.rangos import distribucion_rangos
+
+RERUNS = 150
+CALENTAMIENTO = 10
+TOLERANCIA_MB = 50.0
+
+
+def rss_mb():
+    # RSS actual (Linux); si no hay /proc usamos el pico que reporta getrusage
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / 2**20 if sys.platform == "darwin" else pico / 1024
+
+
+def grupo_sintetico(generador, alumnos=40):
+    calificaciones = np.round(generador.uniform(5, 10, size=(alumnos, 2)), 1)
+    return pd.DataFrame(calificaciones, columns=["P1", "P2"])
+
+
+def simular_rerun(registro, grupo_df):
+    # Lo mismo que hace prueba2.py en cada rerun (sin la caché de PNG)
+    registro.limpiar()
+    calificaciones_dict = {parcial: grupo_df[parcial].dropna() for parcial in ["P1", "P2"]}
+    rangos = distribucion_rangos(calificaciones_dict)
+    registro.registrar_figura("histograma", figura_histograma(calificaciones_dict, rangos=rangos))
+    for parcial, rango in rangos.items():
+        registro.registrar_figura(f"pastel_{parcial}", figura_pastel(rango["conteo"], parcial))
+    registro.registrar_figura("boxplot", figura_boxplot(grupo_df))
+
+
+@pytest.mark.slow
+def test_memoria_estable_en_muchos_reruns():
+    generador = np.random.default_rng(603)
+    registro = RegistroFiguras()
+
+    for _ in range(CALENTAMIENTO):
+        simular_rerun(registro, grupo_sintetico(generador))
+    gc.collect()
+    inicial = rss_mb()
+
+    muestras = []
+    for i in range(RERUNS):
+        simular_rerun(registro, grupo_sintetico(generador))
+        if (i + 1) % (RERUNS // 10) == 0:
+            gc.collect()
+            muestras.append(rss_mb())
+
+    crecimiento = max(muestras) - inicial
+    assert not plt.get_fignums(), f"Quedaron {len(plt.get_fignums())} figuras abiertas en pyplot"
+    assert crecimiento <= TOLERANCIA_MB, f"El RSS creció {crecimiento:.1f} MB (tolerancia {TOLERANCIA_MB} MB)"
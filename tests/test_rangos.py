@@ -0,0 +1,24 @@
+import numpy as np
+from scipy.interpolate import make_interp_spline
+
+from calificaciones.rangos import EJE_TENDENCIA, curvas_tendencia, distribucion_rangos, rango_labels
+
+
+def test_curvas_tendencia_igual_a_make_interp_spline():
+    generador = np.random.default_rng(603)
+    conteos = generador.integers(0, 40, size=(6, len(rango_labels)))
+    x = np.arange(len(rango_labels))
+    esperado = [make_interp_spline(x, conteo, k=3)(EJE_TENDENCIA) for conteo in conteos]
+    np.testing.assert_allclose(curvas_tendencia(conteos), esperado, rtol=1e-10, atol=1e-10)
+    # Una sola curva también
+    np.testing.assert_allclose(curvas_tendencia(conteos[0]), esperado[0], rtol=1e-10, atol=1e-10)
+
+
+def test_distribucion_rangos_cuenta_todas(calificaciones_df):
+    calificaciones = {parcial: calificaciones_df[parcial].dropna() for parcial in ["P1", "P2"]}
+    rangos = distribucion_rangos(calificaciones)
+    for parcial, resumen in rangos.items():
+        assert resumen["conteo"].sum() == len(calificaciones[parcial])
+        np.testing.assert_allclose(resumen["tendencia"],
+                                   make_interp_spline(np.arange(len(rango_labels)), resumen["conteo"], k=3)(EJE_TENDENCIA),
+                                   rtol=1e-10, atol=1e-10)